@@ -0,0 +1,142 @@
+"""Пакетное создание произведений."""
+from django.db import DatabaseError, connections, transaction
+from rest_framework import serializers
+
+from api import slugs
+from api.serializers import TitlesCreateSerializer
+from api.signals import bump_versions
+from reviews import leaderboard
+from reviews.models import Title
+
+TitleGenre = Title.genre.through
+
+
+class TitleBulkItemSerializer(TitlesCreateSerializer):
+    """Проверка одного произведения без запросов к БД.
+
+    Слаги жанров и категории проверяются позже, сразу для всего пакета.
+    """
+
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+    category = serializers.SlugField()
+
+
+def insert_titles(titles, using):
+    """Вставка произведений пачками с заполнением их id.
+
+    Django 3.2 не возвращает id из bulk_create в SQLite. Вставка идёт
+    в транзакции под единственной блокировкой записи, поэтому строки
+    одного INSERT получают подряд идущие id, а последний из них
+    возвращает ``last_insert_rowid()``.
+    """
+    connection = connections[using]
+    if connection.features.can_return_rows_from_bulk_insert:
+        Title.objects.using(using).bulk_create(titles)
+        return
+    fields = [
+        field for field in Title._meta.concrete_fields
+        if not field.primary_key
+    ]
+    batch_size = connection.ops.bulk_batch_size(fields, titles)
+    for start in range(0, len(titles), batch_size):
+        batch = titles[start:start + batch_size]
+        Title.objects.using(using).bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+        for pk, title in enumerate(batch, last_id - len(batch) + 1):
+            title.pk = pk
+
+
+def save_chunk(items, using):
+    """Сохранение проверенных произведений одной транзакцией."""
+    titles = [
+        Title(
+            name=data['name'], year=data['year'],
+            description=data.get('description', ''),
+            category_id=data['category']
+        )
+        for data in items
+    ]
+    with transaction.atomic(using=using):
+        insert_titles(titles, using)
+        links = [
+            (title.pk, genre_id)
+            for title, data in zip(titles, items)
+            for genre_id in data['genre']
+        ]
+        TitleGenre.objects.using(using).bulk_create(
+            TitleGenre(title_id=title_id, genre_id=genre_id)
+            for title_id, genre_id in links
+        )
+        leaderboard.add_title_entries(titles, links)
+    return [title.pk for title in titles]
+
+
+def resolve_slugs(valid):
+    """Замена слагов жанров и категорий на id по кэшу справочников."""
+    categories = slugs.categories.get_objects()
+    genres = slugs.genres.get_objects()
+    resolved, errors = [], []
+    for index, data in valid:
+        item_errors = {}
+        if data['category'] not in categories:
+            item_errors['category'] = [
+                f'Категория {data["category"]} не найдена.'
+            ]
+        missing = [slug for slug in data['genre'] if slug not in genres]
+        if missing:
+            item_errors['genre'] = [
+                f'Жанры не найдены: {", ".join(missing)}.'
+            ]
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+            continue
+        data['category'] = categories[data['category']].pk
+        data['genre'] = list(dict.fromkeys(
+            genres[slug].pk for slug in data['genre']
+        ))
+        resolved.append((index, data))
+    return resolved, errors
+
+
+def bulk_create_titles(items, chunk_size, using='default'):
+    """Создание произведений пакетами по ``chunk_size`` штук.
+
+    Слаги жанров и категорий разрешаются по кэшу справочников без
+    запросов к БД. Ошибка в одном произведении не мешает сохранить остальные,
+    ошибка БД откатывает только свою пачку.
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        serializer = TitleBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+    resolved, slug_errors = resolve_slugs(valid)
+    errors.extend(slug_errors)
+
+    created = []
+    for start in range(0, len(resolved), chunk_size):
+        chunk = resolved[start:start + chunk_size]
+        try:
+            ids = save_chunk([data for _, data in chunk], using)
+        except DatabaseError as error:
+            errors.extend(
+                {'index': index, 'errors': {
+                    'non_field_errors': [f'Пачка не сохранена: {error}']
+                }}
+                for index, _ in chunk
+            )
+            continue
+        created.extend(
+            {'index': index, 'id': pk} for (index, _), pk in zip(chunk, ids)
+        )
+    if created:
+        bump_versions(Title)
+        bump_versions(TitleGenre)
+    errors.sort(key=lambda error: error['index'])
+    return created, errors
@@ -0,0 +1,46 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY_TEMPLATE = 'data-version:{label}'
+
+
+def get_version_key(model):
+    return VERSION_KEY_TEMPLATE.format(label=model._meta.label_lower)
+
+
+def get_versions(*models):
+    """Текущие версии данных моделей.
+
+    Версия меняется при каждой записи в таблицу модели, поэтому её
+    можно включать в ключ кэша вместо явной очистки записей. Версии
+    хранятся в общем кэше и видны всем процессам.
+    """
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    for key in missing:
+        cache.add(key, time.time_ns(), settings.DATA_VERSION_TIMEOUT)
+    if missing:
+        versions.update(cache.get_many(missing))
+    return tuple(versions.get(key) for key in keys)
+
+
+def bump_version(model):
+    """Смена версии данных модели после записи в её таблицу.
+
+    Новая версия не вычисляется из старой: одновременные записи из
+    разных процессов не могут получить одинаковую версию.
+    """
+    cache.set(
+        get_version_key(model), time.time_ns(),
+        settings.DATA_VERSION_TIMEOUT
+    )
+
+
+def get_cache_key(prefix, signature, *models):
+    """Ключ кэша, который меняется при записи в таблицы моделей."""
+    signature = repr((signature, get_versions(*models)))
+    return f'{prefix}:{hashlib.md5(signature.encode()).hexdigest()}'
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Кэш по умолчанию должен быть общим для всех процессов."""
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        'Кэш по умолчанию хранится в памяти процесса.',
+        hint=(
+            'Версии данных не видны другим процессам: списки, счётчики '
+            'и справочники остаются устаревшими до истечения кэша. '
+            'Укажите общий кэш в CACHES.'
+        ),
+        id='api.W001',
+    )]
+
+
+@register(Tags.caches, Tags.database)
+def check_replica_sticky_cache(app_configs, **kwargs):
+    """Привязка клиента к default после записи хранится в общем кэше."""
+    if (
+        not settings.DATABASE_REPLICAS
+        or settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+    ):
+        return []
+    return [Error(
+        'Реплики включены, а кэш по умолчанию хранится в памяти процесса.',
+        hint=(
+            'Привязку к основной БД после записи видит только процесс, '
+            'принявший запись, и клиент не видит своих изменений. '
+            'Укажите общий кэш в CACHES.'
+        ),
+        id='api.E002',
+    )]
+
+
+@register(Tags.database)
+def check_sharded_write_behind(app_configs, **kwargs):
+    """Очередь отложенной записи не работает с шардами отзывов."""
+    if not (settings.WRITE_BEHIND_ENABLED and settings.REVIEW_SHARDS):
+        return []
+    return [Error(
+        'Очередь отложенной записи включена вместе с шардами отзывов.',
+        hint=(
+            'Перенос очереди проверяет отзывы в default и не переносит '
+            'записи при включённых REVIEW_SHARDS. Отключите '
+            'WRITE_BEHIND_ENABLED или REVIEW_SHARDS.'
+        ),
+        id='api.E003',
+    )]
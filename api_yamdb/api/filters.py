@@ -1,15 +1,54 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
 
+from api import slugs
 from reviews.models import Title
+from reviews.search import search_titles
+
+TitleGenre = Title.genre.through
 
 
 class TitlesFilter(filters.FilterSet):
-    """Класс для фильтрации произведений."""
+    """Класс для фильтрации произведений.
+
+    Слаги жанра и категории заменяются на id по кэшу справочников, без
+    соединения с ними, чтобы работали индексы (category_id, name) и
+    (genre_id, title_id).
+    """
 
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
-    genre = filters.CharFilter(field_name='genre__slug')
-    category = filters.CharFilter(field_name='category__slug')
+    genre = filters.CharFilter(method='filter_genre')
+    category = filters.CharFilter(method='filter_category')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ['name', 'year', 'genre', 'category']
+        fields = ['name', 'year', 'genre', 'category', 'search']
+
+    def filter_genre(self, queryset, name, value):
+        genre_id = slugs.genres.get_id(value)
+        if genre_id is None:
+            return queryset.none()
+        return queryset.filter(pk__in=TitleGenre.objects.filter(
+            genre_id=genre_id
+        ).values('title_id'))
+
+    def filter_category(self, queryset, name, value):
+        category_id = slugs.categories.get_id(value)
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category_id=category_id)
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию."""
+        return search_titles(queryset, value)
+
+
+class TitlesOrderingFilter(OrderingFilter):
+    """Сортировка произведений с id для однозначного порядка страниц."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering:
+            return (*ordering, 'id')
+        return ordering
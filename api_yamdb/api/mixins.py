@@ -1,6 +1,21 @@
+import hashlib
+import json
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import filters, mixins, viewsets
+from rest_framework.response import Response
 
+from api.cache import get_cache_key
 from api.permissions import IsAdminOrReadOnly
+from api.serializers import DeletionTaskSerializer
+from api_yamdb.db import read_from_default
+from reviews import writebehind
+from reviews.deletion import schedule_deletion
 
 
 class BaseViewSet(mixins.DestroyModelMixin,
@@ -12,8 +27,110 @@ class BaseViewSet(mixins.DestroyModelMixin,
     permission_classes = (IsAdminOrReadOnly,)
 
 
-class CategoryGenreBaseViewSet(BaseViewSet):
+class CachedListMixin:
+    """Список из кэша с заголовками ETag и Cache-Control.
+
+    Ключ кэша зависит от параметров запроса и версий данных моделей
+    ``cache_models`` (по умолчанию модели вьюсета), поэтому любая
+    запись в их таблицы делает его устаревшим. ETag вычисляется по
+    содержимому ответа и хранится в кэше вместе с ним: совпадение
+    If-None-Match с ETag даёт ответ 304, а изменённый в другом процессе
+    или перестроенный после истечения кэша список получает новый ETag.
+    """
+
+    cache_models = ()
+    cache_timeout = settings.LOOKUP_LIST_CACHE_TIMEOUT
+    cache_max_age = settings.LOOKUP_LIST_CACHE_MAX_AGE
+
+    def get_cached_list(self, request, *args, **kwargs):
+        """Пара (ETag, данные списка) из кэша или из БД."""
+        key = get_cache_key(
+            f'list:{self.basename}',
+            (request.get_host(), sorted(request.query_params.lists())),
+            *(self.cache_models or (self.get_queryset().model,))
+        )
+        cached = cache.get(key)
+        if cached is None:
+            with read_from_default():
+                data = super().list(request, *args, **kwargs).data
+            content = json.dumps(data, cls=DjangoJSONEncoder).encode()
+            cached = quote_etag(hashlib.md5(content).hexdigest()), data
+            cache.set(key, cached, self.cache_timeout)
+        return cached
+
+    def list(self, request, *args, **kwargs):
+        etag, data = self.get_cached_list(request, *args, **kwargs)
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = Response(status=HTTPStatus.NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        patch_cache_control(
+            response, public=True, max_age=self.cache_max_age
+        )
+        return response
+
+
+class CategoryGenreBaseViewSet(CachedListMixin, BaseViewSet):
 
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+    cursor_ordering = ('name',)
+    replica_reads = True
+    query_budgets = {'list': 3, 'create': 4, 'destroy': 6}
+
+
+class DeferredDestroyMixin:
+    """Удаление в фоне с ответом 202 и задачей удаления.
+
+    Запись сразу помечается удалённой, а она и зависимые записи
+    удаляются командой ``process_deletions``.
+    """
+
+    def destroy(self, request, *args, **kwargs):
+        task = schedule_deletion(self.get_object())
+        return Response(
+            DeletionTaskSerializer(task).data, status=HTTPStatus.ACCEPTED
+        )
+
+
+class WriteBehindCreateMixin:
+    """Создание через очередь отложенной записи с ответом 202.
+
+    При включённой настройке WRITE_BEHIND_ENABLED проверенные данные
+    складываются в очередь ``reviews.writebehind``, а в ответе
+    возвращается id элемента очереди. Иначе запись создаётся сразу.
+    """
+
+    write_behind_kind = None
+
+    def get_write_behind_fields(self):
+        """Поля записи, которые берутся из URL, а не из запроса."""
+        return {}
+
+    def validate_write_behind(self):
+        """Проверки, которые при создании сразу выполняет БД.
+
+        Вызывается перед постановкой в очередь, чтобы ошибка вернулась
+        в ответе на запрос, а не при переносе очереди.
+        """
+
+    def create(self, request, *args, **kwargs):
+        if not settings.WRITE_BEHIND_ENABLED:
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.validate_write_behind()
+        entry_id = writebehind.enqueue(
+            self.write_behind_kind, request.user.pk, {
+                **serializer.validated_data,
+                **self.get_write_behind_fields(),
+                'author_id': request.user.pk,
+            }
+        )
+        return Response(
+            {'id': entry_id, 'status': writebehind.PENDING},
+            status=HTTPStatus.ACCEPTED
+        )
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+from api.cache import get_cache_key
+from api_yamdb.db import read_from_default
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация в порядке, заданном во вьюсете.
+
+    Порядок берётся из атрибута ``cursor_ordering`` вьюсета, размер
+    страницы задаётся тем же параметром ``limit``, что и в limit/offset.
+    """
+
+    page_size_query_param = 'limit'
+
+    def get_ordering(self, request, queryset, view):
+        return view.cursor_ordering
+
+
+class OffsetOrCursorPagination(LimitOffsetPagination):
+    """Пагинация limit/offset с курсорным режимом по запросу клиента.
+
+    Курсорный режим включается параметром ``pagination=cursor`` или
+    переданным параметром ``cursor`` и доступен вьюсетам, в которых
+    задан ``cursor_ordering``. В этом режиме ответ не содержит ``count``,
+    а страницы выбираются по ключу без OFFSET.
+
+    В режиме limit/offset общее количество объектов кэшируется по
+    сигнатуре запроса на ``count_cache_timeout`` секунд. Ключ кэша
+    включает версии данных задействованных таблиц, поэтому запись в них
+    делает закэшированное значение недействительным. В режиме
+    ``estimated`` точный подсчёт выполняется лишь до порога
+    ``count_estimate_threshold``, выше него возвращается оценка
+    и признак ``count_estimated``.
+    """
+
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = KeysetPagination
+    count_mode = settings.PAGINATION_COUNT_MODE
+    count_cache_timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+    count_estimate_threshold = settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+
+    def use_cursor(self, request, view):
+        if getattr(view, 'cursor_ordering', None) is None:
+            return False
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request, view):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        # Смещение нужно до подсчёта, чтобы порог точного подсчёта
+        # в режиме estimated не оказался меньше запрошенной страницы.
+        self.offset = self.get_offset(request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        if not self.count_estimated:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('count_estimated', True),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_count(self, queryset):
+        self.count_estimated = False
+        if not self.count_cache_timeout:
+            return self.count_queryset(queryset)
+        try:
+            key = self.get_count_cache_key(queryset)
+        except EmptyResultSet:
+            return 0
+        cached = cache.get(key)
+        if cached is None:
+            with read_from_default():
+                count = self.count_queryset(queryset)
+            cached = count, self.count_estimated
+            cache.set(key, cached, self.count_cache_timeout)
+        count, self.count_estimated = cached
+        return count
+
+    def get_count_cache_key(self, queryset):
+        """Ключ кэша из текста запроса и версий данных его таблиц."""
+        connection = connections[queryset.db]
+        sql, params = queryset.query.sql_with_params()
+        models = [
+            model for model in apps.get_models(include_auto_created=True)
+            if connection.ops.quote_name(model._meta.db_table) in sql
+        ]
+        signature = (
+            self.count_mode, self.get_count_threshold(), sql, params
+        )
+        return get_cache_key('count', signature, *models)
+
+    def get_count_threshold(self):
+        if self.count_mode != 'estimated':
+            return None
+        return max(self.count_estimate_threshold, self.offset + self.limit)
+
+    def count_queryset(self, queryset):
+        threshold = self.get_count_threshold()
+        if threshold is None:
+            return super().get_count(queryset)
+        count = super().get_count(queryset[:threshold + 1])
+        if count <= threshold:
+            return count
+        self.count_estimated = True
+        return max(count, self.estimate_count(queryset))
+
+    def estimate_count(self, queryset):
+        """Оценка количества строк по плану запроса.
+
+        Планировщик PostgreSQL возвращает ожидаемое число строк без
+        выполнения запроса. Для остальных СУБД оценка недоступна,
+        и в ответ попадает нижняя граница, полученная при подсчёте
+        до порога.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return 0
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        return int(plan[0]['Plan']['Plan Rows'])
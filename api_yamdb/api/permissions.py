@@ -16,7 +16,7 @@ class IsAuthorOrAdminOrModerator(permissions.IsAuthenticatedOrReadOnly):
         if not request.user.is_authenticated:
             return request.method in permissions.SAFE_METHODS
         return (
-            request.user == obj.author
+            request.user.pk == obj.author_id
             or request.user.is_moderator
             or request.user.is_admin
         )
@@ -0,0 +1,63 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """JSON-объекты по одному на строку."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(self.iter_lines(rows)).encode(self.charset)
+
+    def iter_lines(self, rows, fields=None):
+        for row in rows:
+            yield json.dumps(
+                row, cls=DjangoJSONEncoder, ensure_ascii=False
+            ) + '\n'
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """Таблица CSV с заголовком из названий полей."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return ''.join(self.iter_lines(rows, fields)).encode(self.charset)
+
+    def iter_lines(self, rows, fields):
+        writer = csv.writer(Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(
+                self.format_value(row[field]) for field in fields
+            )
+
+    @staticmethod
+    def format_value(value):
+        if isinstance(value, list):
+            return ','.join(map(str, value))
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
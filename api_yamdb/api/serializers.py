@@ -1,12 +1,31 @@
 from datetime import datetime
 
-from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import serializers
 from rest_framework.validators import ValidationError
 
-from reviews.models import Category, Comments, Genre, Review, Title
+from api import slugs
+from api.utils import get_histogram_counts
+from reviews.models import (Category, Comments, DeletionTask, Genre, Review,
+                            Title)
 
-User = get_user_model()
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Поиск записи справочника по слагу в кэше процесса."""
+
+    def __init__(self, slug_cache, **kwargs):
+        self.slug_cache = slug_cache
+        kwargs.setdefault('queryset', slug_cache.queryset)
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.slug_cache.get(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return obj
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -40,18 +59,35 @@ class TitleViewSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class TitleHistogramSerializer(TitleViewSerializer):
+    """Сериализатор произведений с распределением оценок."""
+
+    histogram = serializers.SerializerMethodField()
+
+    class Meta(TitleViewSerializer.Meta):
+        fields = TitleViewSerializer.Meta.fields + ('histogram',)
+
+    def get_histogram(self, obj):
+        try:
+            return get_histogram_counts(obj.histogram)
+        except ObjectDoesNotExist:
+            return get_histogram_counts()
+
+
+class TitleTopSerializer(TitleViewSerializer):
+    """Сериализатор для лучших произведений."""
+
+    weighted_rating = serializers.FloatField(read_only=True)
+
+    class Meta(TitleViewSerializer.Meta):
+        fields = TitleViewSerializer.Meta.fields + ('weighted_rating',)
+
+
 class TitlesCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создание произведений."""
 
-    genre = serializers.SlugRelatedField(
-        many=True,
-        queryset=Genre.objects.all(),
-        slug_field='slug'
-    )
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
-    )
+    genre = CachedSlugRelatedField(slugs.genres, many=True)
+    category = CachedSlugRelatedField(slugs.categories)
     year = serializers.IntegerField()
 
     class Meta:
@@ -76,8 +112,7 @@ class ReviewSerializer(serializers.ModelSerializer):
     """Сериализатор для отзывов."""
 
     author = serializers.SlugRelatedField(
-        default=serializers.CurrentUserDefault(),
-        queryset=User.objects.all(),
+        read_only=True,
         slug_field='username'
     )
 
@@ -85,29 +120,77 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        """Проверка на уникальность отзыва."""
-        if not self.instance:
-            title_id = self.context['view'].kwargs.get('title_id')
-            if Review.objects.filter(
-                title_id=title_id,
-                author=self.context['request'].user
-            ).exists():
-                raise serializers.ValidationError(
-                    'Вы уже оставили отзыв на это произведение.'
-                )
-        return data
-
 
 class CommentsSerializer(serializers.ModelSerializer):
     """Сериализатор для комментариев."""
 
     author = serializers.SlugRelatedField(
-        default=serializers.CurrentUserDefault(),
-        queryset=User.objects.all(),
+        read_only=True,
         slug_field='username'
     )
 
     class Meta():
         model = Comments
         fields = ['id', 'text', 'author', 'pub_date']
+
+
+class LatestReviewSerializer(ReviewSerializer):
+    """Сериализатор для последних отзывов с названием произведения."""
+
+    title_name = serializers.CharField(source='title.name', read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title', 'title_name')
+
+
+class LatestCommentSerializer(CommentsSerializer):
+    """Сериализатор для последних комментариев с произведением."""
+
+    title = serializers.IntegerField(source='review.title_id', read_only=True)
+    title_name = serializers.CharField(
+        source='review.title.name', read_only=True
+    )
+
+    class Meta(CommentsSerializer.Meta):
+        fields = CommentsSerializer.Meta.fields + [
+            'review', 'title', 'title_name'
+        ]
+
+
+class TitleSummarySerializer(serializers.ModelSerializer):
+    """Краткие сведения о произведении для ленты активности."""
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'rating')
+        model = Title
+
+
+class UserReviewSerializer(serializers.ModelSerializer):
+    """Сериализатор для отзывов пользователя."""
+
+    title = TitleSummarySerializer(read_only=True)
+
+    class Meta:
+        fields = ('id', 'text', 'score', 'pub_date', 'title')
+        model = Review
+
+
+class UserCommentSerializer(serializers.ModelSerializer):
+    """Сериализатор для комментариев пользователя."""
+
+    title = TitleSummarySerializer(source='review.title', read_only=True)
+
+    class Meta:
+        fields = ('id', 'text', 'pub_date', 'review', 'title')
+        model = Comments
+
+
+class DeletionTaskSerializer(serializers.ModelSerializer):
+    """Сериализатор для задач удаления."""
+
+    class Meta:
+        fields = (
+            'id', 'model', 'object_id', 'object_repr', 'status',
+            'deleted_count', 'created_at', 'finished_at'
+        )
+        model = DeletionTask
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from api.cache import bump_version
+from reviews.models import (Category, Comments, Genre, LeaderboardEntry,
+                            Review, Title)
+
+User = get_user_model()
+
+TitleGenre = Title.genre.through
+
+VERSIONED_MODELS = (Category, Genre, Title, Review, Comments, User)
+
+# Таблицы, которые меняются вместе с моделью без собственных сигналов:
+# каскадное удаление связей и записи таблицы лучших произведений.
+DEPENDENT_MODELS = {
+    Category: (LeaderboardEntry,),
+    Genre: (TitleGenre, LeaderboardEntry),
+    Title: (TitleGenre, LeaderboardEntry),
+    TitleGenre: (LeaderboardEntry,),
+}
+
+
+def bump_versions(model):
+    bump_version(model)
+    for dependent in DEPENDENT_MODELS.get(model, ()):
+        bump_version(dependent)
+
+
+def model_changed(sender, **kwargs):
+    """Смена версии данных модели после сохранения или удаления."""
+    bump_versions(sender)
+
+
+def title_genre_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_versions(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(model_changed, sender=model)
+    post_delete.connect(model_changed, sender=model)
+m2m_changed.connect(title_genre_changed, sender=TitleGenre)
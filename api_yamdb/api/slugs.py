@@ -0,0 +1,57 @@
+"""Кэш справочников категорий и жанров по слагу в памяти процесса."""
+import time
+
+from django.conf import settings
+
+from api.cache import get_versions
+from reviews.models import Category, Genre
+
+
+class SlugCache:
+    """Все записи справочника по слагу.
+
+    Справочник загружается целиком при первом обращении и заново после
+    смены версии данных модели, которую меняет любая запись в таблицу.
+    Версия хранится в общем кэше Django, поэтому запись в другом
+    процессе тоже сбрасывает справочник, а проверка не обращается к БД.
+    Если смена версии пропущена, справочник всё равно перечитывается
+    раз в SLUG_CACHE_TIMEOUT секунд. Справочник читается из default:
+    отстающая реплика сохранила бы под новой версией старые записи.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self.model = queryset.model
+        self._state = (None, 0, {})
+
+    def __deepcopy__(self, memo):
+        # DRF копирует аргументы полей для каждого экземпляра
+        # сериализатора, а кэш должен оставаться общим.
+        return self
+
+    def get_objects(self):
+        version, loaded_at, objects = self._state
+        current = get_versions(self.model)
+        now = time.monotonic()
+        if (
+            version != current
+            or now - loaded_at >= settings.SLUG_CACHE_TIMEOUT
+        ):
+            objects = {
+                obj.slug: obj for obj in self.queryset.using('default')
+            }
+            self._state = (current, now, objects)
+        return objects
+
+    def get(self, slug):
+        """Запись по слагу или None."""
+        return self.get_objects().get(slug)
+
+    def get_id(self, slug):
+        """Id записи по слагу или None."""
+        obj = self.get(slug)
+        return obj.pk if obj is not None else None
+
+
+categories = SlugCache(Category.objects.filter(is_deleted=False))
+genres = SlugCache(Genre.objects.all())
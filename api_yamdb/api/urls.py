@@ -1,8 +1,10 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from api.views import (CategoryViewSet, CommentsViewSet, GenreViewSet,
-                       ReviewViewSet, TitleViewSet)
+from api.views import (CategoryViewSet, CommentsViewSet, DeletionTaskViewSet,
+                       ExportView, GenreViewSet, LatestCommentsViewSet,
+                       LatestReviewViewSet, ReviewViewSet, TitleViewSet,
+                       WriteQueueViewSet)
 from users.views import UserView
 
 router_v1 = routers.DefaultRouter()
@@ -16,6 +18,16 @@ router_v1.register(
     ReviewViewSet,
     basename='reviews'
 )
+router_v1.register(
+    'reviews/latest',
+    LatestReviewViewSet,
+    basename='latest-reviews'
+)
+router_v1.register(
+    'comments/latest',
+    LatestCommentsViewSet,
+    basename='latest-comments'
+)
 router_v1.register(
     r'categories',
     CategoryViewSet,
@@ -31,6 +43,16 @@ router_v1.register(
     TitleViewSet,
     basename='titles'
 )
+router_v1.register(
+    'deletions',
+    DeletionTaskViewSet,
+    basename='deletions'
+)
+router_v1.register(
+    'write-queue',
+    WriteQueueViewSet,
+    basename='write-queue'
+)
 router_v1.register(
     'users',
     UserView,
@@ -41,6 +63,9 @@ router_v1.register(
 api_v1_patterns = [
     path('', include(router_v1.urls)),
     path('auth/', include('users.urls')),
+    path(
+        'export/<slug:resource>/', ExportView.as_view(), name='export'
+    ),
 ]
 
 urlpatterns = [
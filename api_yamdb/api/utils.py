@@ -1,11 +1,35 @@
+from http import HTTPStatus
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
+from django.db.models import Count, F
 from django.shortcuts import get_object_or_404
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
+from rest_framework.exceptions import APIException, ValidationError
+
+from reviews import shards
+from reviews.models import SCORES, Review, Title
+
+TitleGenre = Title.genre.through
+
 
-from reviews.models import Review, Title
+class ShardsNotSupported(APIException):
+    status_code = HTTPStatus.NOT_IMPLEMENTED
+    default_detail = 'Недоступно при хранении отзывов в шардах.'
+    default_code = 'shards_not_supported'
+
+
+def ensure_unsharded():
+    """Отказ в запросах, которые читают все отзывы без выбора шарда.
+
+    Ленты, история пользователя, выгрузка отзывов и перенос очереди
+    читают отзывы из default и при включённых REVIEW_SHARDS вернули бы
+    неполные данные.
+    """
+    if shards.is_enabled():
+        raise ShardsNotSupported()
 
 
 def send_confirmation_email(user):
@@ -23,11 +47,76 @@ def send_confirmation_email(user):
     return uid, token
 
 
+def parse_ids(value, max_size):
+    """Список id из строки вида ``1,5,9`` без повторов и в том же порядке."""
+    try:
+        ids = [int(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        raise ValidationError({'ids': 'Укажите id через запятую.'})
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > max_size:
+        raise ValidationError(
+            {'ids': f'Можно запросить не больше {max_size} id.'}
+        )
+    return ids
+
+
+def get_histogram_counts(histogram=None):
+    """Количество оценок от 1 до 10, нули при отсутствии отзывов."""
+    if histogram is None:
+        return {score: 0 for score in SCORES}
+    return histogram.counts
+
+
 def get_title(data):
     title_id = data.get('title_id')
-    return get_object_or_404(Title, pk=title_id)
+    return get_object_or_404(Title.objects.visible(), pk=title_id)
 
 
 def get_review(data):
-    review_id = data.get('review_id')
-    return get_object_or_404(Review, pk=review_id)
+    """Отзыв, принадлежащий произведению из того же URL.
+
+    В шарде нет таблицы произведений, поэтому произведение проверяется
+    отдельным запросом к default.
+    """
+    if shards.is_enabled():
+        return get_object_or_404(get_title(data).reviews, pk=data.get(
+            'review_id'
+        ))
+    return get_object_or_404(
+        Review, pk=data.get('review_id'), title_id=data.get('title_id'),
+        title__is_deleted=False, title__category__is_deleted=False
+    )
+
+
+def get_title_facets(titles):
+    """Количество произведений по жанрам, категориям и десятилетиям.
+
+    Каждый срез считается одним запросом с группировкой, общее
+    количество складывается из среза по категориям.
+    """
+    titles = titles.order_by()
+    categories = titles.values_list(
+        'category__slug', 'category__name'
+    ).annotate(count=Count('pk')).order_by('-count', 'category__slug')
+    genres = TitleGenre.objects.filter(
+        title__in=titles.values('pk')
+    ).values_list(
+        'genre__slug', 'genre__name'
+    ).annotate(count=Count('title_id')).order_by('-count', 'genre__slug')
+    decades = titles.values(
+        decade=F('year') / 10 * 10
+    ).annotate(count=Count('pk')).order_by('decade')
+    categories = [
+        {'slug': slug, 'name': name, 'count': count}
+        for slug, name, count in categories
+    ]
+    return {
+        'count': sum(category['count'] for category in categories),
+        'genre': [
+            {'slug': slug, 'name': name, 'count': count}
+            for slug, name, count in genres
+        ],
+        'category': categories,
+        'decade': list(decades),
+    }
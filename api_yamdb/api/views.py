@@ -1,22 +1,54 @@
-from api.utils import get_review, get_title
-from django.db import models
+from http import HTTPStatus
+
+from api.utils import (ensure_unsharded, get_histogram_counts, get_review,
+                       get_title, get_title_facets, parse_ids)
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.http import Http404, StreamingHttpResponse
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, viewsets
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from api.filters import TitlesFilter
-from api.mixins import BaseViewSet, CategoryGenreBaseViewSet
-from api.permissions import IsAuthorOrAdminOrModerator
+from api.bulk import bulk_create_titles
+from api.cache import get_cache_key
+from api.export import EXPORTS, SHARDED_EXPORTS
+from api.filters import TitlesFilter, TitlesOrderingFilter
+from api.mixins import (BaseViewSet, CachedListMixin,
+                        CategoryGenreBaseViewSet, DeferredDestroyMixin,
+                        WriteBehindCreateMixin)
+from api.pagination import KeysetPagination
+from api.parsers import NDJSONParser
+from api.permissions import IsAdmin, IsAuthorOrAdminOrModerator
+from api.renderers import CSVRenderer, NDJSONRenderer
 from api.serializers import (CategorySerializer, CommentsSerializer,
-                             GenreSerializer, ReviewSerializer,
-                             TitlesCreateSerializer, TitleViewSerializer)
-from reviews.models import Category, Genre, Title
+                             DeletionTaskSerializer, GenreSerializer,
+                             LatestCommentSerializer, LatestReviewSerializer,
+                             ReviewSerializer,
+                             TitleHistogramSerializer,
+                             TitlesCreateSerializer, TitleTopSerializer,
+                             TitleViewSerializer)
+from api_yamdb.db import read_from_default
+from reviews import shards, writebehind
+from reviews.models import (Category, Comments, DeletionTask, Genre,
+                            LeaderboardEntry, Review, ScoreHistogram, Title)
+
+User = get_user_model()
 
+DUPLICATE_REVIEW_MESSAGE = 'Вы уже оставили отзыв на это произведение.'
 
-class CategoryViewSet(CategoryGenreBaseViewSet):
+
+class CategoryViewSet(DeferredDestroyMixin, CategoryGenreBaseViewSet):
     """Вьюсет для категорий."""
 
-    queryset = Category.objects.all()
+    queryset = Category.objects.filter(is_deleted=False)
     serializer_class = CategorySerializer
 
 
@@ -28,63 +60,391 @@ class GenreViewSet(CategoryGenreBaseViewSet):
 
 
 class TitleViewSet(
+    DeferredDestroyMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     BaseViewSet
 ):
     """Вьюсет для произведений."""
 
-    filter_backends = (DjangoFilterBackend,)
+    cursor_ordering = ('name', 'id')
+    replica_reads = True
+    queryset = Title.objects.visible().select_related(
+        'category'
+    ).prefetch_related('genre')
+    filter_backends = (DjangoFilterBackend, TitlesOrderingFilter)
     filterset_class = TitlesFilter
+    ordering_fields = ('name', 'year', 'rating', 'reviews_count')
     http_method_names = ['get', 'post', 'delete', 'patch']
+    # Пакетная загрузка выполняет запросы на каждую запись.
+    query_budgets = {
+        'list': 4, 'retrieve': 3, 'create': 13, 'partial_update': 15,
+        'destroy': 7, 'top': 3, 'facets': 3, 'histograms': 1, 'bulk': None,
+    }
+
+    def includes_histogram(self):
+        """Запрошено ли распределение оценок параметром ``include``."""
+        include = self.request.query_params.get('include', '')
+        return 'histogram' in include.split(',')
+
+    def get_queryset(self):
+        titles = super().get_queryset()
+        if self.action in ['list', 'retrieve'] and self.includes_histogram():
+            titles = titles.select_related('histogram')
+        return titles
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
+            if self.includes_histogram():
+                return TitleHistogramSerializer
             return TitleViewSerializer
+        if self.action == 'top':
+            return TitleTopSerializer
         return TitlesCreateSerializer
 
-    def get_queryset(self):
-        titles = Title.objects.annotate(
-            rating=models.Avg('reviews__score')
+    def list(self, request, *args, **kwargs):
+        """Список произведений или произведения по списку ``ids``.
+
+        Для ``ids`` произведения выбираются одним запросом и
+        возвращаются без пагинации в запрошенном порядке, отсутствующие
+        id пропускаются.
+        """
+        if 'ids' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        ids = parse_ids(
+            request.query_params['ids'], settings.TITLES_BATCH_MAX_SIZE
         )
-        return titles
+        titles = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response(serializer.data)
+
+    @action(detail=False)
+    def top(self, request):
+        """Лучшие произведения по взвешенному рейтингу.
 
+        Записи выбираются из таблицы лучших произведений, поэтому
+        фильтр по категории или жанру не требует агрегации отзывов.
+        """
+        self.cursor_ordering = ('-weighted_rating', 'id')
+        category = request.query_params.get('category')
+        genre = request.query_params.get('genre')
+        entries = LeaderboardEntry.objects.select_related(
+            'title__category'
+        ).prefetch_related('title__genre').filter(
+            title__is_deleted=False, title__category__is_deleted=False
+        ).order_by(*self.cursor_ordering)
+        if genre:
+            entries = entries.filter(genre__slug=genre, category=None)
+            if category:
+                entries = entries.filter(title__category__slug=category)
+        elif category:
+            entries = entries.filter(genre=None, category__slug=category)
+        else:
+            entries = entries.filter(genre=None, category=None)
+        page = self.paginate_queryset(entries)
+        titles = []
+        for entry in page:
+            entry.title.weighted_rating = entry.weighted_rating
+            titles.append(entry.title)
+        serializer = self.get_serializer(titles, many=True)
+        return self.get_paginated_response(serializer.data)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(
+        detail=False, methods=['post'],
+        parser_classes=(JSONParser, NDJSONParser)
+    )
+    def bulk(self, request):
+        """Пакетное создание произведений.
+
+        Принимает JSON-массив или NDJSON. Произведения сохраняются
+        пачками по ``chunk_size`` штук, каждая пачка в своей транзакции.
+        В ответе id созданных произведений и ошибки по номерам в пакете.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError(
+                {'non_field_errors': ['Ожидается список произведений.']}
+            )
+        try:
+            chunk_size = int(request.query_params.get(
+                'chunk_size', settings.TITLES_BULK_CHUNK_SIZE
+            ))
+        except ValueError:
+            chunk_size = 0
+        if not 0 < chunk_size <= settings.TITLES_BULK_MAX_CHUNK_SIZE:
+            raise ValidationError({'chunk_size': (
+                'Укажите размер пачки от 1 до '
+                f'{settings.TITLES_BULK_MAX_CHUNK_SIZE}.'
+            )})
+        created, errors = bulk_create_titles(request.data, chunk_size)
+        return Response(
+            {'created': created, 'errors': errors},
+            status=HTTPStatus.CREATED if created else HTTPStatus.BAD_REQUEST
+        )
+
+    @action(detail=False)
+    def histograms(self, request):
+        """Распределения оценок нескольких произведений одним запросом."""
+        ids = parse_ids(
+            request.query_params.get('ids', ''),
+            settings.TITLES_BATCH_MAX_SIZE
+        )
+        histograms = ScoreHistogram.objects.in_bulk(ids)
+        return Response({
+            title_id: get_histogram_counts(histograms.get(title_id))
+            for title_id in ids
+        })
+
+    @action(detail=False)
+    def facets(self, request):
+        """Количество произведений по жанрам, категориям и десятилетиям.
+
+        Принимает те же параметры, что и список произведений. Результат
+        кэшируется до записи в произведения, их жанры или справочники.
+        """
+        key = get_cache_key(
+            'title-facets', sorted(request.query_params.lists()),
+            Title, Title.genre.through, Category, Genre
+        )
+        facets = cache.get(key)
+        if facets is None:
+            with read_from_default():
+                facets = get_title_facets(
+                    self.filter_queryset(Title.objects.visible())
+                )
+            cache.set(key, facets, settings.TITLE_FACETS_CACHE_TIMEOUT)
+        return Response(facets)
+
+
+class ReviewViewSet(WriteBehindCreateMixin, viewsets.ModelViewSet):
     """Вьюсет для отзывов."""
 
     serializer_class = ReviewSerializer
-    pagination_class = LimitOffsetPagination
+    write_behind_kind = 'review'
+    cursor_ordering = ('pub_date', 'id')
+    replica_reads = True
     http_method_names = ['get', 'post', 'delete', 'patch']
     permission_classes = (IsAuthorOrAdminOrModerator,)
+    query_budgets = {
+        'list': 4, 'retrieve': 2, 'create': 10, 'partial_update': 7,
+        'destroy': 9,
+    }
+
+    @cached_property
+    def title(self):
+        """Произведение из URL, загружается один раз за запрос."""
+        return get_title(self.kwargs)
 
     def get_queryset(self):
-        """Получение всех отзывов или конкретного отзыва."""
-        title = get_title(self.kwargs)
-        review = title.reviews.all()
-        return review
+        """Получение всех отзывов или конкретного отзыва.
+
+        Отзыв для детальных маршрутов выбирается одним запросом с
+        проверкой произведения из URL, без отдельной загрузки
+        произведения. В шардах произведение загружается из default, а
+        отзывы читаются из шарда этого произведения.
+        """
+        if self.detail and not shards.is_enabled():
+            return Review.objects.filter(
+                title_id=self.kwargs['title_id'],
+                title__is_deleted=False, title__category__is_deleted=False
+            ).select_related('author')
+        return shards.select_author(self.title.reviews.all())
+
+    def get_write_behind_fields(self):
+        return {'title_id': self.title.pk}
+
+    def has_review(self):
+        """Есть ли у автора отзыв на произведение в шарде произведения."""
+        return Review.objects.using(
+            shards.get_shard(self.title.pk)
+        ).filter(author=self.request.user, title_id=self.title.pk).exists()
+
+    def validate_write_behind(self):
+        """Повторный отзыв отклоняется до постановки в очередь.
+
+        Учитываются сохранённые отзывы и отзывы автора, ещё ждущие
+        переноса. Отзыв, поставленный в очередь одновременно, отклоняется
+        ограничением unique_review при переносе.
+        """
+        if self.has_review() or writebehind.is_queued(
+            self.write_behind_kind, self.request.user.pk,
+            title_id=self.title.pk
+        ):
+            raise ValidationError({'non_field_errors': [
+                DUPLICATE_REVIEW_MESSAGE
+            ]})
 
     def perform_create(self, serializer):
-        """Cоздание отзыва."""
-        title = get_title(self.kwargs)
-        serializer.save(author=self.request.user, title=title)
+        """Cоздание отзыва.
+
+        Повторный отзыв отклоняет ограничение unique_review в БД, без
+        отдельной проверки перед вставкой. Отзыв автора ищется только
+        после ошибки вставки, остальные ошибки БД не подменяются.
+        """
+        try:
+            serializer.save(author=self.request.user, title=self.title)
+        except IntegrityError:
+            if not self.has_review():
+                raise
+            raise ValidationError({'non_field_errors': [
+                DUPLICATE_REVIEW_MESSAGE
+            ]})
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(WriteBehindCreateMixin, viewsets.ModelViewSet):
     """Вьюсет для комментариев."""
 
     serializer_class = CommentsSerializer
-    pagination_class = LimitOffsetPagination
+    write_behind_kind = 'comment'
+    cursor_ordering = ('pub_date', 'id')
+    replica_reads = True
     http_method_names = ['get', 'post', 'delete', 'patch']
     permission_classes = (IsAuthorOrAdminOrModerator,)
+    query_budgets = {
+        'list': 4, 'retrieve': 2, 'create': 3, 'partial_update': 3,
+        'destroy': 4,
+    }
+
+    @cached_property
+    def review(self):
+        """Отзыв из URL, загружается один раз за запрос."""
+        return get_review(self.kwargs)
 
     def get_queryset(self):
-        """Получение всех комментариев или конкретного комментария."""
-        review = get_review(self.kwargs)
-        comment = review.comments.all()
-        return comment
+        """Получение всех комментариев или конкретного комментария.
+
+        Комментарий для детальных маршрутов выбирается одним запросом с
+        проверкой отзыва и произведения из URL, в шардах через отзыв.
+        """
+        if self.detail and not shards.is_enabled():
+            return Comments.objects.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id'],
+                review__title__is_deleted=False,
+                review__title__category__is_deleted=False
+            ).select_related('author')
+        return shards.select_author(self.review.comments.all())
+
+    def get_write_behind_fields(self):
+        return {'review_id': self.review.pk}
 
     def perform_create(self, serializer):
         """Создание комментариев."""
-        review = get_review(self.kwargs)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
+
+
+class LatestFeedViewSet(
+    CachedListMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """Базовый вьюсет ленты последних записей по всем произведениям.
+
+    Страницы выбираются по ключу (pub_date, id) по индексу pub_date
+    и кэшируются до следующей записи в таблицы ленты. При включённых
+    шардах лента недоступна.
+    """
+
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    replica_reads = True
+    query_budgets = {'list': 1}
+    cache_timeout = settings.LATEST_FEED_CACHE_TIMEOUT
+    cache_max_age = 0
+
+    def list(self, request, *args, **kwargs):
+        ensure_unsharded()
+        return super().list(request, *args, **kwargs)
+
+
+class LatestReviewViewSet(LatestFeedViewSet):
+    """Последние отзывы."""
+
+    queryset = Review.objects.filter(
+        title__is_deleted=False, title__category__is_deleted=False
+    ).select_related('author', 'title')
+    serializer_class = LatestReviewSerializer
+    cache_models = (Review, Title, Category, User)
+
+
+class LatestCommentsViewSet(LatestFeedViewSet):
+    """Последние комментарии."""
+
+    queryset = Comments.objects.filter(
+        review__title__is_deleted=False,
+        review__title__category__is_deleted=False
+    ).select_related('author', 'review__title')
+    serializer_class = LatestCommentSerializer
+    cache_models = (Comments, Review, Title, Category, User)
+
+
+class DeletionTaskViewSet(viewsets.ReadOnlyModelViewSet):
+    """Ход фонового удаления записей для администратора."""
+
+    queryset = DeletionTask.objects.all()
+    serializer_class = DeletionTaskSerializer
+    permission_classes = (IsAdmin,)
+    cursor_ordering = ('created_at', 'id')
+    query_budgets = {'list': 3, 'retrieve': 2}
+
+
+class WriteQueueViewSet(viewsets.ViewSet):
+    """Состояние и перенос очереди отложенной записи.
+
+    Список возвращает количество элементов по состояниям, перенос
+    доступен администратору. Элемент очереди может посмотреть его автор.
+    """
+
+    permission_classes = (IsAdmin,)
+    lookup_value_regex = r'\d+'
+    # Перенос сохраняет записи пачки по одной.
+    query_budgets = {'list': 1, 'retrieve': 1, 'drain': None}
+
+    def get_permissions(self):
+        if self.action == 'retrieve':
+            return (IsAuthenticated(),)
+        return super().get_permissions()
+
+    def list(self, request):
+        return Response(writebehind.get_stats())
+
+    def retrieve(self, request, pk):
+        entry = writebehind.get_entry(int(pk))
+        if entry is None or not (
+            request.user.is_admin or entry['user_id'] == request.user.pk
+        ):
+            raise Http404
+        return Response(entry)
+
+    @action(detail=False, methods=('post',))
+    def drain(self, request):
+        """Перенос одной пачки, остаток переносит следующий вызов."""
+        ensure_unsharded()
+        saved, failed = writebehind.drain(
+            settings.WRITE_BEHIND_BATCH_SIZE, max_batches=1
+        )
+        return Response({'saved': saved, 'failed': failed})
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка всех записей в NDJSON или CSV."""
+
+    permission_classes = (IsAdmin,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+    query_budgets = {'get': 1}
+
+    def get(self, request, resource):
+        if resource not in EXPORTS:
+            raise Http404
+        if resource in SHARDED_EXPORTS:
+            ensure_unsharded()
+        fields, iter_rows = EXPORTS[resource]
+        renderer = request.accepted_renderer
+        rows = iter_rows(settings.EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(
+            renderer.iter_lines(rows, fields),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{renderer.format}"'
+        )
+        return response
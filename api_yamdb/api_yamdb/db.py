@@ -0,0 +1,52 @@
+"""Настройка соединений с БД и маршрутизация чтения по репликам."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Применение SQLITE_PRAGMAS к новому соединению SQLite.
+
+    Команды выполняются через соединение sqlite3 напрямую и не
+    попадают в журнал запросов Django.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+
+
+replica_alias = ContextVar('replica_alias', default=None)
+
+
+@contextmanager
+def read_from_default():
+    """Чтение из default внутри блока, даже если запросу выбрана реплика.
+
+    Так заполняются кэши с версией данных в ключе: после записи версия
+    уже новая, а отстающая реплика сохранила бы под ней старые данные
+    до истечения кэша.
+    """
+    token = replica_alias.set(None)
+    try:
+        yield
+    finally:
+        replica_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Чтение из реплики, выбранной для текущего запроса, запись в default.
+
+    Реплику выбирает ``ReplicaRoutingMiddleware``. Вне запроса и для
+    запросов, которым реплика не назначена, чтение идёт в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        return replica_alias.get() or 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from api_yamdb import querylog
+from api_yamdb.db import replica_alias
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger(__name__)
+
+
+def get_sticky_key(request):
+    """Ключ кэша клиента: по токену, а для анонимов по адресу."""
+    client = (
+        request.headers.get('Authorization')
+        or request.META.get('REMOTE_ADDR', '')
+    )
+    return f'replica:sticky:{hashlib.sha256(client.encode()).hexdigest()}'
+
+
+class ReplicaRoutingMiddleware:
+    """Выбор реплики для чтения с привязкой клиента к default после записи.
+
+    GET-запросы к вьюсетам с ``replica_reads = True`` читают из случайной
+    реплики DATABASE_REPLICAS. После запроса на запись клиент на
+    REPLICA_STICKY_SECONDS читает из default и видит свои изменения,
+    даже если реплика ещё не обновлена. Привязка хранится в кэше по
+    умолчанию, который должен быть общим для всех процессов, иначе
+    следующий запрос клиента к другому процессу уйдёт в реплику
+    (проверка api.E002).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = replica_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+        ):
+            cache.set(
+                get_sticky_key(request), True,
+                settings.REPLICA_STICKY_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and getattr(view_class, 'replica_reads', False)
+            and not cache.get(get_sticky_key(request))
+        ):
+            replica_alias.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+class QueryBudgetExceeded(Exception):
+    """Запрос к API выполнил больше SQL-запросов, чем разрешено."""
+
+
+def get_query_budget(request, view_func):
+    """Имя действия представления и его бюджет SQL-запросов.
+
+    Бюджеты задаются в атрибуте ``query_budgets`` представления по
+    имени действия вьюсета или HTTP-методу для APIView. Действия без
+    бюджета получают QUERY_BUDGET_DEFAULT, значение None отключает
+    проверку.
+    """
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return None, None
+    method = request.method.lower()
+    action = (getattr(view_func, 'actions', None) or {}).get(method, method)
+    budget = getattr(view_class, 'query_budgets', {}).get(
+        action, settings.QUERY_BUDGET_DEFAULT
+    )
+    return f'{view_class.__name__}.{action}', budget
+
+
+class QueryBudgetMiddleware:
+    """Подсчёт SQL-запросов во всех БД и проверка бюджета действия.
+
+    При превышении бюджета в режиме QUERY_BUDGET_MODE = 'log' пишется
+    предупреждение, в режиме 'raise' выбрасывается QueryBudgetExceeded.
+    Запросы потоковых ответов после возврата из представления не
+    учитываются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_BUDGET_MODE:
+            return self.get_response(request)
+        request.query_count = 0
+
+        def count_query(execute, sql, params, many, context):
+            request.query_count += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        name, budget = getattr(request, 'query_budget', (None, None))
+        if budget is not None and request.query_count > budget:
+            message = (
+                f'{name}: {request.query_count} SQL-запросов при бюджете '
+                f'{budget}'
+            )
+            if settings.QUERY_BUDGET_MODE == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(request, view_func)
+
+
+def get_route(request):
+    """Метод и имя маршрута запроса, например ``GET titles-list``."""
+    match = request.resolver_match
+    return f'{request.method} {match.view_name if match else "-"}'
+
+
+class QueryLogMiddleware:
+    """Замер времени SQL-запросов для журнала ``api_yamdb.querylog``.
+
+    Включается настройкой QUERY_LOG_ENABLED. Время каждого запроса
+    сохраняется с его отпечатком и маршрутом после ответа, запросы
+    дольше QUERY_LOG_SLOW_MS пишутся в журнал медленных запросов сразу.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_LOG_ENABLED:
+            return self.get_response(request)
+        samples = []
+
+        def time_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = (time.perf_counter() - start) * 1000
+                samples.append((querylog.get_fingerprint(sql), duration))
+                if duration >= settings.QUERY_LOG_SLOW_MS:
+                    querylog.log_slow_query(
+                        get_route(request), sql, params, duration
+                    )
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(time_query))
+            response = self.get_response(request)
+        querylog.record(get_route(request), samples)
+        return response
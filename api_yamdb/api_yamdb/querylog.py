@@ -0,0 +1,178 @@
+"""Журнал SQL-запросов: отпечатки запросов, статистика и медленные запросы.
+
+Отпечаток получается из текста запроса заменой литералов и параметров
+на ``?`` и сворачиванием списков значений, поэтому запросы, которые
+отличаются только данными, попадают в одну группу. Замеры копятся в
+отдельном файле SQLite QUERY_LOG_PATH, команда ``top_queries`` строит
+по ним количество, суммарное время и перцентили по отпечаткам и
+маршрутам. Запросы дольше QUERY_LOG_SLOW_MS пишутся в журнал
+``api_yamdb.querylog`` вместе с местом вызова в коде проекта.
+"""
+import hashlib
+import logging
+import math
+import re
+import sqlite3
+import time
+import traceback
+from contextlib import closing
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 95, 99)
+PROJECT_DIR = str(settings.BASE_DIR)
+THIS_FILE = str(Path(__file__))
+
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%s|\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS query_fingerprint ('
+    'id TEXT PRIMARY KEY, '
+    'fingerprint TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS query_sample ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+    'fingerprint_id TEXT NOT NULL, '
+    'route TEXT NOT NULL, '
+    'duration REAL NOT NULL, '
+    'created_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS query_sample_created_at_idx '
+    'ON query_sample (created_at)',
+)
+GROUP_COLUMNS = {
+    'fingerprint': 'fingerprint_id',
+    'route': 'route',
+}
+
+
+def get_fingerprint(sql):
+    """Текст запроса без литералов, параметров и списков значений."""
+    for pattern, replacement in FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def get_fingerprint_id(fingerprint):
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+
+def get_origin():
+    """Последний вызов из кода проекта в текущем стеке."""
+    for frame in reversed(traceback.extract_stack()):
+        if (
+            frame.filename.startswith(PROJECT_DIR)
+            and frame.filename != THIS_FILE
+            and 'site-packages' not in frame.filename
+        ):
+            return f'{frame.filename}:{frame.lineno} в {frame.name}'
+    return None
+
+
+def connect():
+    """Соединение с файлом замеров в режиме автофиксации."""
+    connection = sqlite3.connect(
+        settings.QUERY_LOG_PATH, timeout=30, isolation_level=None
+    )
+    connection.execute('PRAGMA journal_mode=WAL')
+    for statement in SCHEMA:
+        connection.execute(statement)
+    return connection
+
+
+def record(route, samples):
+    """Сохранение замеров запроса к API: пар (отпечаток, время в мс)."""
+    if not samples:
+        return
+    now = time.time()
+    fingerprints = {
+        fingerprint: get_fingerprint_id(fingerprint)
+        for fingerprint, _ in samples
+    }
+    with closing(connect()) as log:
+        log.execute('BEGIN')
+        log.executemany(
+            'INSERT OR IGNORE INTO query_fingerprint (id, fingerprint) '
+            'VALUES (?, ?)',
+            [(key, fingerprint) for fingerprint, key in fingerprints.items()]
+        )
+        log.executemany(
+            'INSERT INTO query_sample '
+            '(fingerprint_id, route, duration, created_at) '
+            'VALUES (?, ?, ?, ?)',
+            [
+                (fingerprints[fingerprint], route, duration, now)
+                for fingerprint, duration in samples
+            ]
+        )
+        log.execute(
+            'DELETE FROM query_sample WHERE created_at < ?',
+            (now - settings.QUERY_LOG_RETENTION,)
+        )
+        log.execute('COMMIT')
+
+
+def log_slow_query(route, sql, params, duration):
+    logger.warning(
+        '%s: %.1f мс\n%s\nПараметры: %r\nВызов: %s',
+        route, duration, sql, params, get_origin()
+    )
+
+
+def get_percentile(durations, percentile):
+    """Перцентиль по ближайшему рангу отсортированного списка."""
+    rank = max(1, math.ceil(len(durations) * percentile / 100))
+    return durations[rank - 1]
+
+
+def get_top(group='fingerprint', order='total', limit=10, route=None,
+            since=None):
+    """Самые затратные отпечатки запросов или маршруты.
+
+    Для каждой группы возвращаются количество замеров, суммарное и
+    среднее время и перцентили из PERCENTILES, группы сортируются по
+    полю ``order`` по убыванию.
+    """
+    column = GROUP_COLUMNS[group]
+    conditions, params = ['created_at >= ?'], [since or 0]
+    if route is not None:
+        conditions.append('route = ?')
+        params.append(route)
+    with closing(connect()) as log:
+        rows = log.execute(
+            f'SELECT {column}, duration FROM query_sample '
+            f'WHERE {" AND ".join(conditions)} ORDER BY {column}, duration',
+            params
+        ).fetchall()
+        fingerprints = dict(log.execute(
+            'SELECT id, fingerprint FROM query_fingerprint'
+        ).fetchall())
+    durations = {}
+    for key, duration in rows:
+        durations.setdefault(key, []).append(duration)
+    stats = []
+    for key, values in durations.items():
+        item = {
+            group: fingerprints.get(key) if group == 'fingerprint' else key,
+            'count': len(values),
+            'total': sum(values),
+            'mean': sum(values) / len(values),
+        }
+        for percentile in PERCENTILES:
+            item[f'p{percentile}'] = get_percentile(values, percentile)
+        stats.append(item)
+    stats.sort(key=lambda item: item[order], reverse=True)
+    return stats[:limit]
+
+
+def reset():
+    with closing(connect()) as log:
+        log.execute('DELETE FROM query_sample')
+        log.execute('DELETE FROM query_fingerprint')
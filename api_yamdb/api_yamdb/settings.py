@@ -32,6 +32,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.QueryLogMiddleware',
+    'api_yamdb.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -39,6 +41,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api_yamdb.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -69,7 +72,93 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+    'shard_0': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_shard_0.sqlite3',
+    },
+    'shard_1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_shard_1.sqlite3',
+    },
+}
+DATABASE_ROUTERS = [
+    'reviews.shards.ShardRouter',
+    'api_yamdb.db.ReplicaRouter',
+]
+# Псевдонимы реплик для GET-запросов к каталогу. Пустой список
+# отправляет все запросы в default. Реплики SQLite обновляются командой
+# sync_replicas.
+DATABASE_REPLICAS = []
+# Сколько секунд после записи чтения клиента идут в default.
+REPLICA_STICKY_SECONDS = 5
+# Базы, в которых создаются только таблицы отзывов и комментариев.
+REVIEW_SHARD_DATABASES = ['shard_0', 'shard_1']
+# Базы, по которым отзывы и комментарии распределяются по title_id.
+# Пустой список хранит их в default. После изменения списка записи
+# переносятся командой reshard_reviews. Ленты последних записей,
+# история пользователя и выгрузка отзывов и комментариев при включённых
+# шардах отвечают 501, импорт из csv и перенос очереди отказывают, а
+# очередь отложенной записи вместе с шардами не проходит проверку
+# api.E003. Запросы к отзывам без выбора шарда вызывают ShardRoutingError.
+REVIEW_SHARDS = []
+# Сколько id отзывов или комментариев процесс резервирует за раз.
+REVIEW_SHARD_ID_BLOCK_SIZE = 100
+# Количество отзывов, переносимых между шардами за одну транзакцию.
+RESHARD_CHUNK_SIZE = 500
+
+# Проверка числа SQL-запросов по бюджетам query_budgets представлений:
+# 'log' пишет предупреждение, 'raise' выбрасывает исключение, None
+# отключает подсчёт. Исключение возникает уже после выполнения
+# представления, поэтому 'raise' включается только в тестах.
+QUERY_BUDGET_MODE = 'log'
+# Бюджет действий, для которых он не задан в представлении.
+QUERY_BUDGET_DEFAULT = 10
+
+# Журнал SQL-запросов: замеры по отпечаткам запросов и маршрутам для
+# команды top_queries и журнал запросов дольше QUERY_LOG_SLOW_MS (мс).
+QUERY_LOG_ENABLED = False
+QUERY_LOG_PATH = BASE_DIR / 'query_log.sqlite3'
+QUERY_LOG_SLOW_MS = 100
+# Время хранения замеров, в секундах.
+QUERY_LOG_RETENTION = 86400
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'slow_queries.log',
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'api_yamdb.querylog': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+        },
+    },
+}
+
+# Параметры SQLite, задаваемые каждому новому соединению. WAL позволяет
+# читать во время записи, а busy_timeout (мс) заставляет писателей ждать
+# блокировку вместо ошибки "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -65536,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
 }
 
 
@@ -100,10 +189,61 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.OffsetOrCursorPagination',
     'PAGE_SIZE': 10
 }
 
+# Количество объектов в ответах с пагинацией limit/offset:
+# 'exact' - точный подсчёт, 'estimated' - подсчёт до порога и оценка выше.
+PAGINATION_COUNT_MODE = 'exact'
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10000
+
+TITLE_FACETS_CACHE_TIMEOUT = 300
+# Время хранения списков категорий и жанров на сервере и в браузере.
+LOOKUP_LIST_CACHE_TIMEOUT = 300
+LOOKUP_LIST_CACHE_MAX_AGE = 60
+# Наибольшее время жизни справочников по слагу в памяти процесса.
+SLUG_CACHE_TIMEOUT = 60
+# Время хранения страниц ленты последних отзывов и комментариев.
+LATEST_FEED_CACHE_TIMEOUT = 300
+# Наибольшее количество произведений в одном пакетном запросе.
+TITLES_BATCH_MAX_SIZE = 200
+# Размер пачки при пакетном создании произведений.
+TITLES_BULK_CHUNK_SIZE = 500
+TITLES_BULK_MAX_CHUNK_SIZE = 5000
+# Количество записей, удаляемых за одну транзакцию при фоновом удалении.
+DELETION_CHUNK_SIZE = 500
+# Через сколько секунд задача удаления, обработчик которой не отмечался,
+# снова берётся в работу.
+DELETION_CLAIM_TIMEOUT = 300
+# Число строк, читаемых из БД за раз при выгрузке.
+EXPORT_CHUNK_SIZE = 2000
+# Отложенная запись отзывов и комментариев через локальную очередь.
+WRITE_BEHIND_ENABLED = False
+WRITE_BEHIND_QUEUE_PATH = BASE_DIR / 'write_queue.sqlite3'
+WRITE_BEHIND_BATCH_SIZE = 200
+# Через сколько секунд элементы, захваченные прервавшимся переносом,
+# снова берутся в работу.
+WRITE_BEHIND_CLAIM_TIMEOUT = 300
+# Время хранения перенесённых элементов очереди, в секундах.
+WRITE_BEHIND_RETENTION = 86400
+
+# Версии данных, кэши списков и привязка клиентов к основной БД должны
+# быть видны всем процессам, поэтому кэш хранится в общем каталоге. При
+# работе на нескольких серверах нужен общий сервер кэша, например
+# django.core.cache.backends.memcached.PyMemcacheCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+# Время хранения версий данных моделей. Новая версия после истечения
+# только сбрасывает зависящие от неё кэши.
+DATA_VERSION_TIMEOUT = 86400
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=30),
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -1,7 +1,8 @@
 from django.contrib import admin
 
 from reviews.constants import MAX_CATEGORIES_DISPLAY
-from reviews.models import Category, Genre, Title, Comments, Review
+from reviews.models import (Category, Comments, DeletionTask, Genre, Review,
+                            Title)
 
 
 @admin.register(Category)
@@ -42,3 +43,16 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = (
         'text', 'author', 'score', 'pub_date', 'title'
     )
+
+
+@admin.register(DeletionTask)
+class DeletionTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'model', 'object_repr', 'status', 'deleted_count',
+        'created_at', 'finished_at'
+    )
+    list_filter = ('status', 'model')
+    readonly_fields = (
+        'model', 'object_id', 'object_repr', 'status', 'deleted_count',
+        'created_at', 'finished_at'
+    )
@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
     verbose_name = 'Отзывы'
+
+    def ready(self):
+        from api_yamdb.db import apply_sqlite_pragmas
+        from reviews.signals import restore_search_index
+        connection_created.connect(apply_sqlite_pragmas)
+        post_migrate.connect(restore_search_index, sender=self)
@@ -4,3 +4,7 @@ MAX_NUMBERS_OF_CATEGORIES = 3
 MAX_CATEGORIES_DISPLAY = 3
 MAX_REVIEW_SCORE = 10
 MIN_REVIEW_SCOR = 1
+# Байесовский рейтинг: оценка произведения смещается к PRIOR_SCORE
+# так, словно у него есть ещё PRIOR_REVIEWS отзывов с такой оценкой.
+LEADERBOARD_PRIOR_REVIEWS = 5
+LEADERBOARD_PRIOR_SCORE = 5.5
@@ -0,0 +1,156 @@
+"""Удаление категорий, произведений и пользователей по частям.
+
+Запись помечается удалённой и скрывается из API сразу, а зависимые
+записи удаляются пачками снизу вверх: комментарии, отзывы,
+произведения и в конце сама запись. Отзывы удаляются через ORM, поэтому
+рейтинги и распределения оценок пересчитываются сигналами после каждой
+пачки, а каскадное удаление каждой пачки остаётся ограниченным. Отзывы
+и комментарии в шардах удаляются в каждом шарде отдельно.
+
+Перед выполнением обработчик захватывает задачу и отмечается в ней
+после каждой пачки, поэтому параллельные обработчики не выполняют одну
+задачу дважды. Задача прервавшегося обработчика снова берётся в работу
+через DELETION_CLAIM_TIMEOUT секунд.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from reviews import shards
+from reviews.models import Category, Comments, DeletionTask, Review, Title
+
+User = get_user_model()
+
+
+def get_title_stages(titles):
+    if not shards.is_enabled():
+        return (
+            Comments.objects.filter(review__title__in=titles),
+            Review.objects.filter(title__in=titles),
+            titles,
+        )
+    stages = ()
+    title_ids = titles.values_list('pk', flat=True)
+    for alias, ids in shards.group_by_shard(title_ids).items():
+        stages += (
+            Comments.objects.using(alias).filter(review__title_id__in=ids),
+            Review.objects.using(alias).filter(title_id__in=ids),
+        )
+    return stages + (titles,)
+
+
+def get_category_stages(category_id):
+    return get_title_stages(
+        Title.objects.filter(category_id=category_id)
+    ) + (Category.objects.filter(pk=category_id),)
+
+
+def get_user_stages(user_id):
+    stages = ()
+    for alias in shards.get_shards():
+        stages += (
+            Comments.objects.using(alias).filter(author_id=user_id),
+            Comments.objects.using(alias).filter(review__author_id=user_id),
+            Review.objects.using(alias).filter(author_id=user_id),
+        )
+    return stages + (User.objects.filter(pk=user_id),)
+
+
+STAGES = {
+    Category._meta.label_lower: get_category_stages,
+    Title._meta.label_lower: lambda pk: get_title_stages(
+        Title.objects.filter(pk=pk)
+    ),
+    User._meta.label_lower: get_user_stages,
+}
+
+
+def schedule_deletion(instance):
+    """Пометка записи удалённой и постановка задачи на удаление."""
+    with transaction.atomic():
+        instance.is_deleted = True
+        update_fields = ['is_deleted']
+        if isinstance(instance, User):
+            instance.is_active = False
+            update_fields.append('is_active')
+        instance.save(update_fields=update_fields)
+        return DeletionTask.objects.create(
+            model=instance._meta.label_lower,
+            object_id=instance.pk,
+            object_repr=str(instance)[:200]
+        )
+
+
+class ClaimLost(Exception):
+    """Задачу перехватил другой обработчик."""
+
+
+def claim_task(task):
+    """Захват ожидающей или брошенной задачи, False если она уже занята."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.DELETION_CLAIM_TIMEOUT)
+    claimed = DeletionTask.objects.filter(pk=task.pk).filter(
+        Q(status=DeletionTask.PENDING)
+        | Q(status=DeletionTask.RUNNING, claimed_at__lt=stale)
+    ).update(status=DeletionTask.RUNNING, claimed_at=now)
+    if claimed:
+        task.status, task.claimed_at = DeletionTask.RUNNING, now
+    return bool(claimed)
+
+
+def update_claimed(task, **fields):
+    """Изменение захваченной задачи с отметкой обработчика.
+
+    Если задачу перехватил другой обработчик, вызывает ClaimLost, и
+    транзакция пачки откатывается.
+    """
+    now = timezone.now()
+    updated = DeletionTask.objects.filter(
+        pk=task.pk, status=DeletionTask.RUNNING, claimed_at=task.claimed_at
+    ).update(claimed_at=now, **fields)
+    if not updated:
+        raise ClaimLost(f'Задача {task.pk} захвачена другим обработчиком.')
+    task.claimed_at = now
+
+
+def process_chunk(task, chunk_size):
+    """Удаление одной пачки записей захваченной задачи.
+
+    Возвращает количество удалённых записей, 0 означает завершение
+    задачи.
+    """
+    for queryset in STAGES[task.model](task.object_id):
+        pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if pks:
+            with transaction.atomic(), transaction.atomic(using=queryset.db):
+                deleted, _ = queryset.model.objects.using(
+                    queryset.db
+                ).filter(pk__in=pks).delete()
+                update_claimed(
+                    task, deleted_count=F('deleted_count') + deleted
+                )
+            return deleted
+    update_claimed(
+        task, status=DeletionTask.DONE, finished_at=timezone.now()
+    )
+    return 0
+
+
+def process_deletions(chunk_size):
+    """Выполнение всех свободных задач, возвращает число завершённых."""
+    tasks = DeletionTask.objects.exclude(status=DeletionTask.DONE)
+    count = 0
+    for task in tasks:
+        if not claim_task(task):
+            continue
+        try:
+            while process_chunk(task, chunk_size):
+                pass
+        except ClaimLost:
+            continue
+        count += 1
+    return count
@@ -0,0 +1,68 @@
+from django.db.models import Count, F, Q
+
+from reviews import shards
+from reviews.models import SCORES, Review, ScoreHistogram
+
+REBUILD_BATCH_SIZE = 5000
+
+
+def iter_histograms(reviews):
+    """Распределения оценок по отзывам одним запросом с группировкой."""
+    counters = {
+        ScoreHistogram.field_name(score): Count('pk', filter=Q(score=score))
+        for score in SCORES
+    }
+    rows = reviews.order_by().values('title_id').annotate(**counters)
+    for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+        yield ScoreHistogram(**row)
+
+
+def update_histogram(title_id, added=None, removed=None):
+    """Изменение счётчиков оценок произведения.
+
+    Если у произведения ещё нет распределения, при добавлении оценки оно
+    считается по его отзывам без текущего изменения, создаётся, если
+    его не успел создать параллельный запрос, и изменение применяется
+    повторным UPDATE. При удалении оценки отсутствующее распределение
+    не создаётся: это может быть каскадное удаление самого произведения.
+    """
+    if added == removed:
+        return
+    deltas = {}
+    for score, delta in ((added, 1), (removed, -1)):
+        if score is not None:
+            deltas[ScoreHistogram.field_name(score)] = delta
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    histograms = ScoreHistogram.objects.filter(title_id=title_id)
+    if histograms.update(**changes) or added is None:
+        return
+    histogram = next(
+        iter_histograms(Review.objects.using(
+            shards.get_shard(title_id)
+        ).filter(title_id=title_id)),
+        ScoreHistogram(title_id=title_id)
+    )
+    for field, delta in deltas.items():
+        setattr(histogram, field, max(getattr(histogram, field) - delta, 0))
+    ScoreHistogram.objects.bulk_create([histogram], ignore_conflicts=True)
+    histograms.update(**changes)
+
+
+def rebuild_histograms():
+    """Полное перестроение распределений оценок."""
+    ScoreHistogram.objects.all().delete()
+    created = 0
+    batch = []
+    histograms = (
+        histogram
+        for alias in shards.get_shards()
+        for histogram in iter_histograms(Review.objects.using(alias))
+    )
+    for histogram in histograms:
+        batch.append(histogram)
+        if len(batch) == REBUILD_BATCH_SIZE:
+            ScoreHistogram.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    ScoreHistogram.objects.bulk_create(batch)
+    return created + len(batch)
@@ -0,0 +1,140 @@
+from django.db.models import ExpressionWrapper, F, FloatField, Subquery, Value
+
+from reviews.constants import (LEADERBOARD_PRIOR_REVIEWS,
+                               LEADERBOARD_PRIOR_SCORE)
+from reviews.models import LeaderboardEntry, Title
+
+TitleGenre = Title.genre.through
+
+REBUILD_BATCH_SIZE = 5000
+
+
+def weighted_rating(score_sum, reviews_count):
+    """Байесовский рейтинг по сумме оценок и числу отзывов."""
+    return (
+        (score_sum + LEADERBOARD_PRIOR_REVIEWS * LEADERBOARD_PRIOR_SCORE)
+        / (reviews_count + LEADERBOARD_PRIOR_REVIEWS)
+    )
+
+
+def weighted_rating_expression():
+    """Байесовский рейтинг произведения как выражение для запроса."""
+    return ExpressionWrapper(
+        (
+            F('score_sum') + Value(float(
+                LEADERBOARD_PRIOR_REVIEWS * LEADERBOARD_PRIOR_SCORE
+            ))
+        ) / (F('reviews_count') + LEADERBOARD_PRIOR_REVIEWS),
+        output_field=FloatField()
+    )
+
+
+def add_title_entries(titles, genre_links=()):
+    """Записи новых произведений: общая, в категории и в жанрах.
+
+    ``genre_links`` - пары (id произведения, id жанра) для произведений,
+    созданных сразу с жанрами.
+    """
+    entries = []
+    ratings = {}
+    for title in titles:
+        rating = weighted_rating(title.score_sum, title.reviews_count)
+        ratings[title.pk] = rating
+        entries.append(LeaderboardEntry(title=title, weighted_rating=rating))
+        entries.append(LeaderboardEntry(
+            title=title, category_id=title.category_id,
+            weighted_rating=rating
+        ))
+    entries.extend(
+        LeaderboardEntry(
+            title_id=title_id, genre_id=genre_id,
+            weighted_rating=ratings[title_id]
+        )
+        for title_id, genre_id in genre_links
+    )
+    LeaderboardEntry.objects.bulk_create(entries)
+
+
+def move_title_entries(title):
+    """Перенос записи произведения в его текущую категорию."""
+    LeaderboardEntry.objects.filter(
+        title=title, category__isnull=False
+    ).exclude(category_id=title.category_id).update(
+        category_id=title.category_id
+    )
+
+
+def add_genre_entries(title_ids, genre_ids):
+    """Записи в жанрах для добавленных связей произведений и жанров."""
+    titles = Title.objects.filter(pk__in=title_ids).values_list(
+        'pk', 'score_sum', 'reviews_count'
+    )
+    LeaderboardEntry.objects.bulk_create(
+        LeaderboardEntry(
+            title_id=title_id, genre_id=genre_id,
+            weighted_rating=weighted_rating(score_sum, reviews_count)
+        )
+        for title_id, score_sum, reviews_count in titles
+        for genre_id in genre_ids
+    )
+
+
+def remove_genre_entries(title_ids, genre_ids=None):
+    """Удаление записей в жанрах для удалённых связей."""
+    entries = LeaderboardEntry.objects.filter(
+        title_id__in=title_ids, genre__isnull=False
+    )
+    if genre_ids is not None:
+        entries = entries.filter(genre_id__in=genre_ids)
+    entries.delete()
+
+
+def refresh_title_rating(title_id):
+    """Обновление взвешенного рейтинга во всех записях произведения."""
+    LeaderboardEntry.objects.filter(title_id=title_id).update(
+        weighted_rating=Subquery(
+            Title.objects.filter(pk=title_id).annotate(
+                weighted_rating=weighted_rating_expression()
+            ).values('weighted_rating')
+        )
+    )
+
+
+def iter_rebuild_entries():
+    titles = Title.objects.order_by().values_list(
+        'pk', 'category_id', 'score_sum', 'reviews_count'
+    )
+    for title_id, category_id, score_sum, reviews_count in titles.iterator(
+        chunk_size=REBUILD_BATCH_SIZE
+    ):
+        rating = weighted_rating(score_sum, reviews_count)
+        yield LeaderboardEntry(title_id=title_id, weighted_rating=rating)
+        yield LeaderboardEntry(
+            title_id=title_id, category_id=category_id,
+            weighted_rating=rating
+        )
+    links = TitleGenre.objects.order_by().values_list(
+        'title_id', 'genre_id', 'title__score_sum', 'title__reviews_count'
+    )
+    for title_id, genre_id, score_sum, reviews_count in links.iterator(
+        chunk_size=REBUILD_BATCH_SIZE
+    ):
+        yield LeaderboardEntry(
+            title_id=title_id, genre_id=genre_id,
+            weighted_rating=weighted_rating(score_sum, reviews_count)
+        )
+
+
+def rebuild_leaderboard():
+    """Полное перестроение таблицы лучших произведений."""
+    LeaderboardEntry.objects.all().delete()
+    created = 0
+    batch = []
+    for entry in iter_rebuild_entries():
+        batch.append(entry)
+        if len(batch) == REBUILD_BATCH_SIZE:
+            LeaderboardEntry.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    LeaderboardEntry.objects.bulk_create(batch)
+    return created + len(batch)
@@ -1,8 +1,11 @@
 import csv
 import os
 
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
 
+from api.signals import bump_versions
+from reviews import shards
 from reviews.models import Category, Genre, Title, Review, Comments, User
 
 
@@ -11,6 +14,12 @@ class Command(BaseCommand):
             'Перед импортом данных необходимо удалить БД.')
 
     def handle(self, *args, **options):
+        if shards.is_enabled():
+            raise CommandError(
+                'Импорт из csv сохраняет отзывы в default, отключите '
+                'REVIEW_SHARDS и перенесите отзывы командой reshard_reviews '
+                'после импорта.'
+            )
         self.stdout.write('Добавление базы данных!')
         relative_path = "static/data"
         absolute_path = os.path.abspath(relative_path)  # Путь к папке с файлам
@@ -40,4 +49,11 @@ class Command(BaseCommand):
                         row[new_name] = row.pop(old_name)
                     list_to_add_in_db.append(models(**row))
                 models.objects.bulk_create(list_to_add_in_db)
+                bump_versions(models)
+        # bulk_create не отправляет сигналы, поэтому версии данных,
+        # рейтинги, таблица лучших и распределения оценок обновляются
+        # отдельно.
+        call_command('rebuild_ratings', stdout=self.stdout)
+        call_command('rebuild_leaderboard', stdout=self.stdout)
+        call_command('rebuild_histograms', stdout=self.stdout)
         self.stdout.write('База данных добавлена!')
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews import shards
+from reviews.writebehind import drain
+
+
+class Command(BaseCommand):
+    help = 'Перенос отложенных отзывов и комментариев из очереди в БД.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.WRITE_BEHIND_BATCH_SIZE,
+            help='Количество записей, сохраняемых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        if shards.is_enabled():
+            raise CommandError(
+                'Очередь отложенной записи не переносится при включённых '
+                'шардах REVIEW_SHARDS.'
+            )
+        self.stdout.write('Перенос очереди отложенной записи!')
+        saved, failed = drain(options['batch_size'])
+        self.stdout.write(f'Сохранено: {saved}, с ошибкой: {failed}.')
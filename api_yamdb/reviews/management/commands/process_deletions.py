@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.deletion import process_deletions
+
+
+class Command(BaseCommand):
+    help = 'Удаление помеченных записей и зависимых от них записей пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.DELETION_CHUNK_SIZE,
+            help='Количество записей, удаляемых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Удаление помеченных записей!')
+        count = process_deletions(options['chunk_size'])
+        self.stdout.write(f'Завершено задач удаления: {count}.')
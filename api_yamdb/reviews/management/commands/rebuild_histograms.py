@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.histograms import rebuild_histograms
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт распределений оценок всех произведений по отзывам.'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Пересчёт распределений оценок!')
+        with transaction.atomic():
+            created = rebuild_histograms()
+        self.stdout.write(f'Пересчитано произведений: {created}.')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.leaderboard import rebuild_leaderboard
+
+
+class Command(BaseCommand):
+    help = ('Полное перестроение таблицы лучших произведений '
+            'по сохранённым рейтингам.')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Перестроение таблицы лучших произведений!')
+        with transaction.atomic():
+            created = rebuild_leaderboard()
+        self.stdout.write(f'Создано записей: {created}.')
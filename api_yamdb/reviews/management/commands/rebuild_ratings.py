@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews import shards
+from reviews.models import Review, Title
+
+REBUILD_BATCH_SIZE = 5000
+
+
+def rebuild_from_default():
+    """Пересчёт одним UPDATE с подзапросами к таблице отзывов."""
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    return Title.objects.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+        rating=Subquery(reviews.annotate(avg=Avg('score')).values('avg')),
+    )
+
+
+def rebuild_from_shards():
+    """Пересчёт по суммам оценок, собранным в каждом шарде.
+
+    Шарды не содержат таблицы произведений, поэтому оценки
+    группируются в шарде, а произведения обновляются в default
+    пачками.
+    """
+    totals = {}
+    for alias in shards.get_shards():
+        rows = Review.objects.using(alias).order_by().values(
+            'title_id'
+        ).annotate(score_sum=Sum('score'), reviews_count=Count('pk'))
+        for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            score_sum, reviews_count = totals.get(row['title_id'], (0, 0))
+            totals[row['title_id']] = (
+                score_sum + row['score_sum'],
+                reviews_count + row['reviews_count'],
+            )
+    updated = Title.objects.update(score_sum=0, reviews_count=0, rating=None)
+    existing = set(Title.objects.filter(
+        pk__in=totals
+    ).values_list('pk', flat=True))
+    Title.objects.bulk_update(
+        [
+            Title(
+                pk=title_id, score_sum=score_sum,
+                reviews_count=reviews_count,
+                rating=score_sum / reviews_count,
+            )
+            for title_id, (score_sum, reviews_count) in totals.items()
+            if title_id in existing
+        ],
+        ['score_sum', 'reviews_count', 'rating'],
+        batch_size=REBUILD_BATCH_SIZE
+    )
+    return updated
+
+
+class Command(BaseCommand):
+    help = ('Пересчёт суммы оценок, числа отзывов и рейтинга '
+            'всех произведений по таблице отзывов.')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Пересчёт рейтингов произведений!')
+        with transaction.atomic():
+            if shards.is_enabled():
+                updated = rebuild_from_shards()
+            else:
+                updated = rebuild_from_default()
+        self.stdout.write(f'Пересчитано произведений: {updated}.')
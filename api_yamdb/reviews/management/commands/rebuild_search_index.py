@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = ('Перестроение полнотекстового индекса по названию '
+            'и описанию произведений.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='БД, в которой перестраивается индекс.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Перестроение поискового индекса!')
+        rebuild_search_index(connections[options['database']])
+        self.stdout.write('Поисковый индекс перестроен!')
@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from reviews import shards
+from reviews.models import Comments, Review
+
+DELETE_BATCH_SIZE = 500
+
+
+def copy_rows(queryset, target):
+    """Копирование записей в target, возвращает их id.
+
+    Записи, которые уже есть в target после прерванного запуска,
+    пропускаются. Если в target есть другая запись с тем же id,
+    копирование останавливается ошибкой, и транзакция target
+    откатывается.
+    """
+    model = queryset.model
+    objects = list(queryset)
+    model.objects.using(target).bulk_create(objects, ignore_conflicts=True)
+    fields = [field.attname for field in model._meta.concrete_fields]
+    copied = {
+        row[0]: row[1:] for row in model.objects.using(target).filter(
+            pk__in=[obj.pk for obj in objects]
+        ).values_list('pk', *fields)
+    }
+    conflicts = [
+        obj.pk for obj in objects
+        if copied.get(obj.pk) != tuple(getattr(obj, name) for name in fields)
+    ]
+    if conflicts:
+        raise CommandError(
+            f'В базе {target} уже есть другие записи {model._meta.label} '
+            f'с id {conflicts}. Перенос остановлен, записи в '
+            f'{queryset.db} не удалены.'
+        )
+    return [obj.pk for obj in objects]
+
+
+def delete_rows(model, using, pks):
+    """Удаление строк по id без сигналов, рейтинги не меняются."""
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), DELETE_BATCH_SIZE):
+            batch = pks[start:start + DELETE_BATCH_SIZE]
+            cursor.execute(
+                f'DELETE FROM {table} WHERE {column} IN '
+                f'({", ".join(["%s"] * len(batch))})', batch
+            )
+
+
+def move_reviews(source, target, review_ids):
+    """Копирование отзывов с комментариями в шард и удаление из источника.
+
+    Записи копируются с теми же id без сигналов, поэтому рейтинги не
+    меняются. Из источника удаляются только записи, которые есть в
+    шарде с теми же данными.
+    """
+    with transaction.atomic(using=target):
+        review_ids = copy_rows(
+            Review.objects.using(source).filter(pk__in=review_ids), target
+        )
+        comment_ids = copy_rows(
+            Comments.objects.using(source).filter(review_id__in=review_ids),
+            target
+        )
+    with transaction.atomic(using=source):
+        delete_rows(Comments, source, comment_ids)
+        delete_rows(Review, source, review_ids)
+
+
+class Command(BaseCommand):
+    help = ('Перенос отзывов и комментариев в шарды их произведений '
+            'после изменения REVIEW_SHARDS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.RESHARD_CHUNK_SIZE,
+            help='Количество отзывов, переносимых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Перенос отзывов по шардам!')
+        sources = dict.fromkeys(
+            ['default', *settings.REVIEW_SHARD_DATABASES]
+        )
+        moved = sum(
+            self.reshard(source, options['chunk_size'])
+            for source in sources
+        )
+        self.stdout.write(f'Перенесено отзывов: {moved}.')
+
+    def reshard(self, source, chunk_size):
+        """Перенос отзывов базы, которые принадлежат другим шардам."""
+        moved = 0
+        last_pk = 0
+        while True:
+            rows = list(Review.objects.using(source).filter(
+                pk__gt=last_pk
+            ).order_by('pk').values_list('pk', 'title_id')[:chunk_size])
+            if not rows:
+                return moved
+            last_pk = rows[-1][0]
+            targets = {}
+            for pk, title_id in rows:
+                target = shards.get_shard(title_id)
+                if target != source:
+                    targets.setdefault(target, []).append(pk)
+            for target, review_ids in targets.items():
+                move_reviews(source, target, review_ids)
+                moved += len(review_ids)
@@ -0,0 +1,29 @@
+import sqlite3
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = 'Копирование основной БД SQLite в файлы реплик через backup API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', action='append', dest='databases',
+            help='Псевдоним реплики, по умолчанию все DATABASE_REPLICAS.'
+        )
+
+    def handle(self, *args, **options):
+        source = connections['default']
+        if source.vendor != 'sqlite':
+            raise CommandError('Реплики поддерживаются только для SQLite.')
+        source.ensure_connection()
+        for alias in options['databases'] or settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            with closing(sqlite3.connect(
+                connections[alias].settings_dict['NAME']
+            )) as target:
+                source.connection.backup(target)
+            self.stdout.write(f'Реплика {alias} обновлена.')
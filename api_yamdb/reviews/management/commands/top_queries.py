@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api_yamdb import querylog
+
+
+class Command(BaseCommand):
+    help = 'Самые затратные SQL-запросы и маршруты по журналу запросов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--group', choices=querylog.GROUP_COLUMNS, default='fingerprint',
+            help='Группировка замеров: по отпечатку запроса или маршруту.'
+        )
+        parser.add_argument(
+            '--order', default='total',
+            choices=['total', 'count', 'mean'] + [
+                f'p{percentile}' for percentile in querylog.PERCENTILES
+            ],
+            help='Поле, по которому сортируются группы.'
+        )
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument(
+            '--route', help='Только запросы маршрута, например '
+            '"GET titles-list".'
+        )
+        parser.add_argument(
+            '--minutes', type=int,
+            help='Только замеры за последние N минут.'
+        )
+        parser.add_argument(
+            '--reset', action='store_true', help='Удалить все замеры.'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            querylog.reset()
+            self.stdout.write('Замеры удалены.')
+            return
+        since = options['minutes'] and time.time() - options['minutes'] * 60
+        stats = querylog.get_top(
+            options['group'], options['order'], options['limit'],
+            options['route'], since
+        )
+        if not stats:
+            self.stdout.write('Замеров нет.')
+        for item in stats:
+            percentiles = ', '.join(
+                f'p{percentile} {item[f"p{percentile}"]:.1f}'
+                for percentile in querylog.PERCENTILES
+            )
+            self.stdout.write(
+                f'{item["total"]:.1f} мс, {item["count"]} раз, '
+                f'среднее {item["mean"]:.1f}, {percentiles}'
+            )
+            self.stdout.write(f'    {item[options["group"]]}')
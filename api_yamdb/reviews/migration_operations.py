@@ -0,0 +1,40 @@
+"""Операции миграций, меняющие схему только в шардах или только вне их.
+
+Базы из REVIEW_SHARD_DATABASES не содержат таблиц произведений и
+пользователей, поэтому отзывы и комментарии в них хранятся без внешних
+ключей, а в остальных базах ограничения остаются.
+"""
+from django.conf import settings
+from django.db import migrations
+
+
+class ShardAlterField(migrations.AlterField):
+    """AlterField, который меняет схему только в базах шардов."""
+
+    in_shards = True
+
+    def allows_database(self, schema_editor):
+        return (
+            schema_editor.connection.alias
+            in settings.REVIEW_SHARD_DATABASES
+        ) == self.in_shards
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if self.allows_database(schema_editor):
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if self.allows_database(schema_editor):
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+
+class NonShardAlterField(ShardAlterField):
+    """AlterField, который меняет схему во всех базах, кроме шардов."""
+
+    in_shards = False
@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 19:00
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_title_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')), 0
+        ),
+        reviews_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')), 0
+        ),
+        rating=Subquery(reviews.annotate(avg=Avg('score')).values('avg')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
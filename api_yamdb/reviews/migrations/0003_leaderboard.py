@@ -0,0 +1,59 @@
+# Generated by Django 3.2 on 2026-10-18 19:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from reviews.constants import (LEADERBOARD_PRIOR_REVIEWS,
+                               LEADERBOARD_PRIOR_SCORE)
+
+
+def fill_leaderboard(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    LeaderboardEntry = apps.get_model('reviews', 'LeaderboardEntry')
+    entries = []
+    for title in Title.objects.prefetch_related('genre'):
+        rating = (
+            (title.score_sum
+             + LEADERBOARD_PRIOR_REVIEWS * LEADERBOARD_PRIOR_SCORE)
+            / (title.reviews_count + LEADERBOARD_PRIOR_REVIEWS)
+        )
+        entries.append(LeaderboardEntry(title=title, weighted_rating=rating))
+        entries.append(LeaderboardEntry(
+            title=title, category_id=title.category_id,
+            weighted_rating=rating
+        ))
+        entries.extend(
+            LeaderboardEntry(title=title, genre=genre, weighted_rating=rating)
+            for genre in title.genre.all()
+        )
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weighted_rating', models.FloatField(verbose_name='Взвешенный рейтинг')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Запись рейтинга',
+                'verbose_name_plural': 'Рейтинг произведений',
+                'default_related_name': 'leaderboard_entries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['genre', 'category', '-weighted_rating'], name='leaderboard_scope_idx'),
+        ),
+        migrations.RunPython(fill_leaderboard, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 19:10
+
+from django.db import migrations
+
+from reviews.search import drop_search_index, rebuild_search_index
+
+
+def create_index(apps, schema_editor):
+    rebuild_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_leaderboard'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
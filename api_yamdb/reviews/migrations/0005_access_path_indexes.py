@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', 'pub_date'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'name'], name='title_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['reviews_count'], name='title_reviews_count_idx'),
+        ),
+        # Промежуточная таблица жанров создаётся автоматически, поэтому
+        # индекс для выборки произведений по жанру задаётся через SQL.
+        migrations.RunSQL(
+            'CREATE INDEX title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX title_genre_genre_title_idx',
+        ),
+    ]
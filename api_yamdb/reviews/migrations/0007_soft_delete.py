@@ -0,0 +1,45 @@
+# Generated by Django 3.2 on 2026-10-18 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_score_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Модель')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id записи')),
+                ('object_repr', models.CharField(max_length=200, verbose_name='Запись')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('done', 'Завершено')], default='pending', max_length=10, verbose_name='Состояние')),
+                ('deleted_count', models.PositiveIntegerField(default=0, verbose_name='Удалено записей')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+            ],
+            options={
+                'verbose_name': 'Удаление',
+                'verbose_name_plural': 'Удаления',
+                'ordering': ('created_at', 'id'),
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Удалена'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Удалено'),
+        ),
+        migrations.AddIndex(
+            model_name='deletiontask',
+            index=models.Index(fields=['status', 'created_at'], name='deletion_status_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['author', 'pub_date'], name='comment_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['author', 'pub_date'], name='review_author_pub_date_idx'),
+        ),
+    ]
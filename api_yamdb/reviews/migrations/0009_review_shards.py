@@ -0,0 +1,44 @@
+# Generated by Django 3.2 on 2026-10-18 19:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from reviews.migration_operations import ShardAlterField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reviews', '0008_author_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShardSequence',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Модель')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Последний выданный id')),
+            ],
+            options={
+                'verbose_name': 'Счётчик id шардов',
+                'verbose_name_plural': 'Счётчики id шардов',
+            },
+        ),
+        ShardAlterField(
+            model_name='comments',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        ShardAlterField(
+            model_name='review',
+            name='author',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        ShardAlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reviews.title', verbose_name='Произведение'),
+        ),
+    ]
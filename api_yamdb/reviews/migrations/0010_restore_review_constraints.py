@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from reviews.migration_operations import NonShardAlterField
+
+
+# Внешние ключи отзывов и комментариев снимаются только в базах шардов,
+# а в базах, где 0009_review_shards уже удалила их, восстанавливаются.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reviews', '0009_review_shards'),
+    ]
+
+    operations = [
+        NonShardAlterField(
+            model_name='comments',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        NonShardAlterField(
+            model_name='review',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to=settings.AUTH_USER_MODEL, verbose_name='Автор'),
+        ),
+        NonShardAlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reviews.title', verbose_name='Произведение'),
+        ),
+    ]
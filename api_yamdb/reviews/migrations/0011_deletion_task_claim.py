@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-18 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_restore_review_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletiontask',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Обработчик отмечался'),
+        ),
+        migrations.AlterField(
+            model_name='deletiontask',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ожидает'), ('running', 'Выполняется'), ('done', 'Завершено')], default='pending', max_length=10, verbose_name='Состояние'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, router, transaction
 
 from reviews.constants import (NAME_MAX_LENGTH, SYMBOL_LIMIT,
                                MAX_REVIEW_SCORE, MIN_REVIEW_SCOR)
@@ -10,9 +10,15 @@ from reviews.validators import validate_year
 
 User = get_user_model()
 
+SCORES = range(MIN_REVIEW_SCOR, MAX_REVIEW_SCORE + 1)
+
 
 class Category(GenreAndCategoryAbstractModel):
 
+    is_deleted = models.BooleanField(
+        'Удалена', default=False, editable=False
+    )
+
     class Meta(GenreAndCategoryAbstractModel.Meta):
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
@@ -25,6 +31,13 @@ class Genre(GenreAndCategoryAbstractModel):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def visible(self):
+        """Произведения, не помеченные на удаление вместе с категорией."""
+        return self.filter(is_deleted=False, category__is_deleted=False)
+
+
 class Title(models.Model):
 
     name = models.CharField(
@@ -41,16 +54,55 @@ class Title(models.Model):
         Category, on_delete=models.CASCADE,
         verbose_name='Категория'
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0, editable=False
+    )
+    rating = models.FloatField(
+        'Рейтинг', null=True, blank=True, editable=False
+    )
+    is_deleted = models.BooleanField(
+        'Удалено', default=False, editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(
+                fields=['category', 'name'], name='title_category_name_idx'
+            ),
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(fields=['rating'], name='title_rating_idx'),
+            models.Index(
+                fields=['reviews_count'], name='title_reviews_count_idx'
+            ),
+        )
 
     def __str__(self):
         return self.name[:SYMBOL_LIMIT]
 
 
+class ShardedQuerySet(models.QuerySet):
+
+    def create(self, **kwargs):
+        """Создание с выбором БД роутером по самому объекту.
+
+        Обычный create выбирает БД до создания объекта и не знает шард
+        произведения, а save() передаёт объект роутеру.
+        """
+        obj = self.model(**kwargs)
+        self._for_write = True
+        obj.save(force_insert=True, using=self._db)
+        return obj
+
+
 class Review(AuthorPubDateAbstractModel):
 
     score = models.PositiveSmallIntegerField(
@@ -69,9 +121,10 @@ class Review(AuthorPubDateAbstractModel):
         on_delete=models.CASCADE,
         verbose_name='Произведение',
         related_name='reviews'
-
     )
 
+    objects = ShardedQuerySet.as_manager()
+
     class Meta(AuthorPubDateAbstractModel.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -80,6 +133,31 @@ class Review(AuthorPubDateAbstractModel):
             fields=['author', 'title'], name='unique_review'
         ),
         )
+        indexes = (
+            models.Index(
+                fields=['title', 'pub_date'], name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='review_author_pub_date_idx'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Оценка на момент загрузки нужна, чтобы пересчитать рейтинг
+        # произведения при изменении отзыва без лишнего запроса.
+        instance._loaded_score = instance.__dict__.get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохранение отзыва вместе с пересчётом рейтинга произведения."""
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self
+        )
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
 
 
 class Comments(AuthorPubDateAbstractModel):
@@ -91,7 +169,160 @@ class Comments(AuthorPubDateAbstractModel):
         related_name='comments'
     )
 
+    objects = ShardedQuerySet.as_manager()
+
     class Meta(AuthorPubDateAbstractModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=['review', 'pub_date'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', 'pub_date'],
+                name='comment_author_pub_date_idx'
+            ),
+        )
+
+
+class LeaderboardEntry(models.Model):
+    """Запись таблицы лучших произведений.
+
+    У каждого произведения есть общая запись (без категории и жанра),
+    запись в своей категории и по записи на каждый жанр.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+        related_name='leaderboard_entries'
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE,
+        null=True, blank=True, verbose_name='Категория'
+    )
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE,
+        null=True, blank=True, verbose_name='Жанр'
+    )
+    weighted_rating = models.FloatField('Взвешенный рейтинг')
+
+    class Meta:
+        verbose_name = 'Запись рейтинга'
+        verbose_name_plural = 'Рейтинг произведений'
+        default_related_name = 'leaderboard_entries'
+        indexes = (models.Index(
+            fields=['genre', 'category', '-weighted_rating'],
+            name='leaderboard_scope_idx'
+        ),
+        )
+
+    def __str__(self):
+        return f'{self.title} ({self.weighted_rating:.2f})'
+
+
+def score_counter(score):
+    return models.PositiveIntegerField(f'Оценок {score}', default=0)
+
+
+class ScoreHistogram(models.Model):
+    """Распределение оценок отзывов на произведение."""
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='Произведение',
+        related_name='histogram'
+    )
+    score_1 = score_counter(1)
+    score_2 = score_counter(2)
+    score_3 = score_counter(3)
+    score_4 = score_counter(4)
+    score_5 = score_counter(5)
+    score_6 = score_counter(6)
+    score_7 = score_counter(7)
+    score_8 = score_counter(8)
+    score_9 = score_counter(9)
+    score_10 = score_counter(10)
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return str(self.title)
+
+    @staticmethod
+    def field_name(score):
+        return f'score_{score}'
+
+    @property
+    def counts(self):
+        return {
+            score: getattr(self, self.field_name(score))
+            for score in SCORES
+        }
+
+
+class DeletionTask(models.Model):
+    """Удаление записи со всеми зависимыми записями по частям.
+
+    Запись помечается удалённой сразу, а зависимые записи удаляются
+    фоновой командой ``process_deletions`` пачками ограниченного размера.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершено'),
+    )
+
+    model = models.CharField('Модель', max_length=100)
+    object_id = models.PositiveIntegerField('Id записи')
+    object_repr = models.CharField('Запись', max_length=200)
+    status = models.CharField(
+        'Состояние', max_length=10, choices=STATUS_CHOICES, default=PENDING
+    )
+    deleted_count = models.PositiveIntegerField('Удалено записей', default=0)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    claimed_at = models.DateTimeField(
+        'Обработчик отмечался', null=True, blank=True
+    )
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Удаление'
+        verbose_name_plural = 'Удаления'
+        ordering = ('created_at', 'id')
+        indexes = (models.Index(
+            fields=['status', 'created_at'], name='deletion_status_idx'
+        ),
+        )
+
+    def __str__(self):
+        return f'{self.model} {self.object_repr}'
+
+
+class ShardSequence(models.Model):
+    """Счётчик id отзывов или комментариев, общий для всех шардов.
+
+    Id выдаются из default блоками, поэтому записи не пересекаются
+    между шардами и переносятся между ними без изменения id.
+    """
+
+    name = models.CharField('Модель', max_length=100, primary_key=True)
+    value = models.BigIntegerField('Последний выданный id', default=0)
+
+    class Meta:
+        verbose_name = 'Счётчик id шардов'
+        verbose_name_plural = 'Счётчики id шардов'
+
+    def __str__(self):
+        return f'{self.name} {self.value}'
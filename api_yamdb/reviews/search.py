@@ -0,0 +1,123 @@
+"""Полнотекстовый поиск по названию и описанию произведений.
+
+В SQLite индекс хранится во внешней таблице FTS5, которую синхронизируют
+триггеры на таблице произведений. В PostgreSQL используется GIN-индекс
+по выражению ``to_tsvector``, который СУБД обновляет сама.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from reviews.models import Title
+
+TITLE_TABLE = Title._meta.db_table
+FTS_TABLE = f'{TITLE_TABLE}_fts'
+PG_INDEX = f'{TITLE_TABLE}_search_idx'
+PG_CONFIG = 'russian'
+PG_VECTOR = (
+    f"to_tsvector('{PG_CONFIG}', "
+    f"coalesce({TITLE_TABLE}.name, '') || ' ' "
+    f"|| coalesce({TITLE_TABLE}.description, ''))"
+)
+PG_QUERY = f"plainto_tsquery('{PG_CONFIG}', %s)"
+# Вес совпадения в названии относительно совпадения в описании.
+SQLITE_NAME_WEIGHT = 10.0
+
+SQLITE_SCHEMA = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='{TITLE_TABLE}', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+
+
+def create_search_index(connection):
+    """Создание поискового индекса, если его ещё нет.
+
+    Пересоздание таблицы произведений при миграциях в SQLite удаляет
+    триггеры, поэтому функция вызывается и после каждой миграции.
+    """
+    if TITLE_TABLE not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for statement in SQLITE_SCHEMA:
+                cursor.execute(statement)
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {PG_INDEX} '
+                f'ON {TITLE_TABLE} USING gin (({PG_VECTOR}))'
+            )
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for suffix in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {PG_INDEX}')
+
+
+def rebuild_search_index(connection):
+    """Заполнение поискового индекса по текущим произведениям."""
+    create_search_index(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(f'REINDEX INDEX {PG_INDEX}')
+
+
+def search_titles(queryset, query):
+    """Произведения, подходящие под запрос, по убыванию релевантности."""
+    words = re.findall(r'\w+', query)
+    if not words:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # Каждое слово ищется как префикс, все слова обязательны.
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE}, %s, 1.0)'},
+            select_params=[SQLITE_NAME_WEIGHT],
+        ).order_by('search_rank', 'name')
+    if vendor == 'postgresql':
+        query = ' '.join(words)
+        return queryset.extra(
+            where=[f'{PG_VECTOR} @@ {PG_QUERY}'],
+            params=[query],
+            select={'search_rank': f'ts_rank({PG_VECTOR}, {PG_QUERY})'},
+            select_params=[query],
+        ).order_by('-search_rank', 'name')
+    condition = Q()
+    for word in words:
+        condition &= Q(name__icontains=word) | Q(description__icontains=word)
+    return queryset.filter(condition)
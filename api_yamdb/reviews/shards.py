@@ -0,0 +1,148 @@
+"""Распределение отзывов и комментариев по базам данных по title_id.
+
+Шарды перечислены в настройке REVIEW_SHARDS, отзыв хранится в шарде
+``REVIEW_SHARDS[title_id % len(REVIEW_SHARDS)]`` вместе со своими
+комментариями. Пустой список хранит их в default. Базы из
+REVIEW_SHARD_DATABASES содержат только таблицы отзывов и комментариев,
+поэтому запросы к шардам не соединяются с произведениями и
+пользователями, а авторы загружаются отдельным запросом.
+"""
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+
+from reviews.models import Comments, Review, ShardSequence, Title
+
+SHARDED_MODELS = ('review', 'comments')
+
+id_blocks = {}
+id_blocks_lock = threading.Lock()
+
+
+def is_enabled():
+    return bool(settings.REVIEW_SHARDS)
+
+
+def get_shards():
+    """Все базы, в которых хранятся отзывы."""
+    return list(settings.REVIEW_SHARDS) or ['default']
+
+
+def get_shard(title_id):
+    shards = get_shards()
+    return shards[title_id % len(shards)]
+
+
+def group_by_shard(title_ids):
+    """Id произведений, сгруппированные по шардам их отзывов."""
+    groups = {}
+    for title_id in title_ids:
+        groups.setdefault(get_shard(title_id), []).append(title_id)
+    return groups
+
+
+def get_instance_shard(instance):
+    """Шард отзывов по произведению, отзыву или комментарию."""
+    if isinstance(instance, Title):
+        return get_shard(instance.pk)
+    if isinstance(instance, Review):
+        return get_shard(instance.title_id)
+    if isinstance(instance, Comments):
+        # Новый комментарий получает _state.db при присвоении автора,
+        # поэтому шард сначала определяется по загруженному отзыву.
+        review = Comments._meta.get_field('review').get_cached_value(
+            instance, None
+        )
+        if review is not None:
+            return get_shard(review.title_id)
+        return instance._state.db
+    return None
+
+
+def select_author(queryset):
+    """Автор записей: JOIN в default, отдельный запрос в шарде."""
+    if queryset.db in settings.REVIEW_SHARD_DATABASES:
+        return queryset.prefetch_related('author')
+    return queryset.select_related('author')
+
+
+def get_max_id(model):
+    return max(
+        model.objects.using(alias).aggregate(max_id=Max('pk'))['max_id'] or 0
+        for alias in {'default', *get_shards()}
+    )
+
+
+def reserve_ids(model, count):
+    """Резервирование ``count`` id в default, возвращает последний id.
+
+    Счётчик не опускается ниже наибольшего id во всех базах: пока шарды
+    были выключены, default мог выдать id из уже пройденного счётчиком
+    диапазона или выше него.
+    """
+    name = model._meta.label_lower
+    max_id = get_max_id(model)
+    with transaction.atomic(using='default'):
+        sequence = ShardSequence.objects.filter(name=name)
+        if not sequence.update(value=Greatest(F('value'), max_id) + count):
+            ShardSequence.objects.create(name=name, value=max_id + count)
+        return sequence.values_list('value', flat=True).get()
+
+
+def allocate_id(model):
+    """Следующий id из блока процесса, новый блок берётся из default."""
+    name = model._meta.label_lower
+    with id_blocks_lock:
+        block = id_blocks.get(name)
+        if block is None or block[0] > block[1]:
+            last = reserve_ids(model, settings.REVIEW_SHARD_ID_BLOCK_SIZE)
+            block = id_blocks[name] = [
+                last - settings.REVIEW_SHARD_ID_BLOCK_SIZE + 1, last
+            ]
+        block[0] += 1
+        return block[0] - 1
+
+
+class ShardRoutingError(Exception):
+    """Запрос к отзывам или комментариям, для которого неизвестен шард."""
+
+
+class ShardRouter:
+    """Чтение и запись отзывов и комментариев в шард их произведения.
+
+    Шард определяется по объекту из подсказки ``instance``: им
+    пользуются сохранение и удаление объектов и связанные менеджеры
+    ``title.reviews`` и ``review.comments``. Запрос без подсказки
+    прочитал бы из default пустые или неполные данные, поэтому он
+    вызывает ShardRoutingError, и база указывается через ``using()``.
+    Для остальных моделей решает следующий роутер.
+    """
+
+    def get_db(self, model, hints):
+        if (
+            not is_enabled()
+            or model._meta.app_label != 'reviews'
+            or model._meta.model_name not in SHARDED_MODELS
+        ):
+            return None
+        instance = hints.get('instance')
+        if instance is not None:
+            return get_instance_shard(instance) or 'default'
+        raise ShardRoutingError(
+            f'Для запроса к {model._meta.label} не указан шард: при '
+            'включённых REVIEW_SHARDS базу нужно выбрать через using().'
+        )
+
+    def db_for_read(self, model, **hints):
+        return self.get_db(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self.get_db(model, hints)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db not in settings.REVIEW_SHARD_DATABASES:
+            return None
+        return app_label == 'reviews' and model_name in SHARDED_MODELS
@@ -0,0 +1,112 @@
+from django.db import connections, router
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from reviews import histograms, leaderboard, shards
+from reviews.models import Comments, Review, Title
+from reviews.search import create_search_index
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """Изменение суммы оценок, числа отзывов и рейтинга произведения."""
+    score_sum = F('score_sum') + score_delta
+    reviews_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=(
+            Cast(score_sum, FloatField())
+            / NullIf(reviews_count, 0, output_field=FloatField())
+        ),
+    )
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_save, sender=Comments)
+def assign_shard_id(sender, instance, **kwargs):
+    """Id новой записи из общего счётчика, если включены шарды."""
+    if instance.pk is None and shards.is_enabled():
+        instance.pk = shards.allocate_id(sender)
+
+
+@receiver(pre_save, sender=Review)
+def review_pre_save(sender, instance, using, **kwargs):
+    """Получение прежней оценки, если отзыв загружен не из БД."""
+    if (
+        instance._state.adding
+        or getattr(instance, '_loaded_score', None) is not None
+    ):
+        return
+    instance._loaded_score = Review.objects.using(using).filter(
+        pk=instance.pk
+    ).values_list('score', flat=True).first()
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Учёт нового или изменённого отзыва в рейтинге произведения."""
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+        histograms.update_histogram(instance.title_id, added=instance.score)
+    elif instance._loaded_score != instance.score:
+        update_title_rating(
+            instance.title_id, instance.score - instance._loaded_score, 0
+        )
+        histograms.update_histogram(
+            instance.title_id,
+            added=instance.score, removed=instance._loaded_score
+        )
+    else:
+        return
+    instance._loaded_score = instance.score
+    leaderboard.refresh_title_rating(instance.title_id)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключение удалённого отзыва из рейтинга произведения."""
+    update_title_rating(instance.title_id, -instance.score, -1)
+    histograms.update_histogram(instance.title_id, removed=instance.score)
+    leaderboard.refresh_title_rating(instance.title_id)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, **kwargs):
+    """Записи произведения в таблице лучших произведений."""
+    if created:
+        leaderboard.add_title_entries([instance])
+    else:
+        leaderboard.move_title_entries(instance)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_changed(sender, instance, action, reverse, pk_set,
+                        **kwargs):
+    """Записи произведений в жанрах при изменении их связей."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if action == 'pre_clear':
+        # После очистки связи уже не узнать, поэтому записи в жанрах
+        # удаляются до неё.
+        if reverse:
+            pk_set = instance.title_set.values_list('pk', flat=True)
+            leaderboard.remove_genre_entries(pk_set, [instance.pk])
+        else:
+            leaderboard.remove_genre_entries([instance.pk])
+        return
+    title_ids, genre_ids = (
+        (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    )
+    if action == 'post_add':
+        leaderboard.add_genre_entries(title_ids, genre_ids)
+    else:
+        leaderboard.remove_genre_entries(title_ids, genre_ids)
+
+
+def restore_search_index(sender, using, **kwargs):
+    """Восстановление поискового индекса после миграций."""
+    if router.allow_migrate_model(using, Title):
+        create_search_index(connections[using])
@@ -0,0 +1,261 @@
+"""Очередь отложенной записи отзывов и комментариев.
+
+При всплесках нагрузки проверенные запросы на создание складываются в
+отдельный файл SQLite и не ждут блокировки записи основной БД. Команда
+``drain_write_queue`` переносит их в основную БД пачками, по одной
+транзакции на пачку. Пачка сначала захватывается: её элементы
+переводятся в состояние processing в транзакции BEGIN IMMEDIATE, поэтому
+одновременные переносы не берут одни и те же элементы. Отметка о
+переносе ставится в очереди после фиксации пачки. Элементы, захваченные
+прервавшимся переносом, снова берутся в работу через
+WRITE_BEHIND_CLAIM_TIMEOUT секунд и при сбое после фиксации могут быть
+перенесены повторно.
+
+Каждый поток держит одно соединение с файлом очереди, поэтому запросы
+на создание не открывают файл и не проверяют схему заново.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+
+from reviews.models import Comments, Review, Title
+
+User = get_user_model()
+
+PENDING = 'pending'
+PROCESSING = 'processing'
+DONE = 'done'
+FAILED = 'failed'
+
+MODELS = {
+    'review': Review,
+    'comment': Comments,
+}
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS write_queue ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+    'kind TEXT NOT NULL, '
+    'user_id INTEGER NOT NULL, '
+    'payload TEXT NOT NULL, '
+    f"status TEXT NOT NULL DEFAULT '{PENDING}', "
+    'object_id INTEGER, '
+    'error TEXT, '
+    'created_at REAL NOT NULL, '
+    'processed_at REAL)',
+    'CREATE INDEX IF NOT EXISTS write_queue_status_idx '
+    'ON write_queue (status, id)',
+)
+ENTRY_FIELDS = (
+    'id', 'kind', 'user_id', 'status', 'object_id', 'error', 'created_at',
+    'processed_at'
+)
+
+local = threading.local()
+
+
+def connect():
+    """Соединение потока с файлом очереди в режиме автофиксации.
+
+    Соединение открывается и схема создаётся один раз на поток, процесс
+    и путь к файлу очереди.
+    """
+    key = (os.getpid(), str(settings.WRITE_BEHIND_QUEUE_PATH))
+    if getattr(local, 'key', None) == key:
+        return local.connection
+    if getattr(local, 'key', (None,))[0] == os.getpid():
+        local.connection.close()
+    connection = sqlite3.connect(key[1], timeout=30, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    for statement in SCHEMA:
+        connection.execute(statement)
+    local.key, local.connection = key, connection
+    return connection
+
+
+@contextmanager
+def queue_transaction(queue, mode=''):
+    """Транзакция в файле очереди, откатывается при любой ошибке.
+
+    Соединение потока используется повторно, поэтому незавершённая
+    транзакция не должна оставлять блокировку записи.
+    """
+    queue.execute(f'BEGIN {mode}')
+    try:
+        yield queue
+        queue.execute('COMMIT')
+    except BaseException:
+        if queue.in_transaction:
+            queue.execute('ROLLBACK')
+        raise
+
+
+def enqueue(kind, user_id, fields):
+    """Постановка записи в очередь, возвращает id элемента очереди."""
+    cursor = connect().execute(
+        'INSERT INTO write_queue (kind, user_id, payload, created_at) '
+        'VALUES (?, ?, ?, ?)',
+        (kind, user_id, json.dumps(fields), time.time())
+    )
+    return cursor.lastrowid
+
+
+def is_queued(kind, user_id, **fields):
+    """Есть ли в очереди неперенесённая запись пользователя с полями."""
+    conditions = ''.join(
+        f" AND json_extract(payload, '$.{name}') = ?" for name in fields
+    )
+    return connect().execute(
+        'SELECT 1 FROM write_queue '
+        'WHERE kind = ? AND user_id = ? AND status IN (?, ?)'
+        f'{conditions} LIMIT 1',
+        (kind, user_id, PENDING, PROCESSING, *fields.values())
+    ).fetchone() is not None
+
+
+def get_entry(entry_id):
+    """Состояние элемента очереди или None."""
+    row = connect().execute(
+        f'SELECT {", ".join(ENTRY_FIELDS)} FROM write_queue '
+        'WHERE id = ?', (entry_id,)
+    ).fetchone()
+    return dict(zip(ENTRY_FIELDS, row)) if row else None
+
+
+def get_stats():
+    """Количество элементов очереди по состояниям."""
+    counts = dict(connect().execute(
+        'SELECT status, COUNT(*) FROM write_queue GROUP BY status'
+    ).fetchall())
+    return {status: counts.get(status, 0) for status in (
+        PENDING, PROCESSING, FAILED, DONE
+    )}
+
+
+def get_parent_error(fields, parents):
+    """Ошибка, если произведение, отзыв или автор уже удалены."""
+    titles, reviews, authors = parents
+    if fields['author_id'] not in authors:
+        return 'Автор удалён.'
+    if 'title_id' in fields and fields['title_id'] not in titles:
+        return 'Произведение не найдено.'
+    if 'review_id' in fields and fields['review_id'] not in reviews:
+        return 'Отзыв не найден.'
+    return None
+
+
+def get_parents(items):
+    """Существующие произведения, отзывы и авторы пачки тремя запросами."""
+    title_ids = {fields.get('title_id') for _, _, fields in items}
+    review_ids = {fields.get('review_id') for _, _, fields in items}
+    author_ids = {fields['author_id'] for _, _, fields in items}
+    return (
+        set(Title.objects.visible().filter(
+            pk__in=title_ids
+        ).values_list('pk', flat=True)),
+        set(Review.objects.filter(
+            pk__in=review_ids, title__is_deleted=False,
+            title__category__is_deleted=False
+        ).values_list('pk', flat=True)),
+        set(User.objects.filter(
+            pk__in=author_ids, is_deleted=False
+        ).values_list('pk', flat=True)),
+    )
+
+
+def save_batch(rows):
+    """Сохранение пачки в основную БД одной транзакцией.
+
+    Каждая запись сохраняется в своей точке сохранения, поэтому ошибка
+    одной записи, например повторный отзыв, не отменяет остальные.
+    Отзывы сохраняются через ORM, и сигналы пересчитывают рейтинги.
+    """
+    items = [
+        (entry_id, kind, json.loads(payload))
+        for entry_id, kind, payload in rows
+    ]
+    results = []
+    with transaction.atomic():
+        parents = get_parents(items)
+        for entry_id, kind, fields in items:
+            error = get_parent_error(fields, parents)
+            if error is not None:
+                results.append((FAILED, None, error, entry_id))
+                continue
+            obj = MODELS[kind](**fields)
+            try:
+                with transaction.atomic():
+                    obj.save()
+            except DatabaseError as error:
+                results.append((FAILED, None, str(error), entry_id))
+            else:
+                results.append((DONE, obj.pk, None, entry_id))
+    return results
+
+
+def claim_batch(queue, batch_size):
+    """Захват пачки ожидающих элементов, возвращает (строки, метка).
+
+    Для захваченных элементов processed_at хранит время захвата, оно же
+    служит меткой, по которой перенос отмечает только свои элементы.
+    """
+    claimed_at = time.time()
+    with queue_transaction(queue, 'IMMEDIATE'):
+        rows = queue.execute(
+            'SELECT id, kind, payload FROM write_queue '
+            'WHERE status = ? OR (status = ? AND processed_at < ?) '
+            'ORDER BY id LIMIT ?',
+            (
+                PENDING, PROCESSING,
+                claimed_at - settings.WRITE_BEHIND_CLAIM_TIMEOUT, batch_size
+            )
+        ).fetchall()
+        queue.executemany(
+            'UPDATE write_queue SET status = ?, processed_at = ? '
+            'WHERE id = ?',
+            [(PROCESSING, claimed_at, entry_id) for entry_id, _, _ in rows]
+        )
+    return rows, claimed_at
+
+
+def drain(batch_size, max_batches=None):
+    """Перенос ожидающих записей, возвращает (перенесено, ошибок).
+
+    Без ``max_batches`` переносится вся очередь.
+    """
+    done = failed = batches = 0
+    queue = connect()
+    while max_batches is None or batches < max_batches:
+        rows, claimed_at = claim_batch(queue, batch_size)
+        if not rows:
+            break
+        batches += 1
+        results = save_batch(rows)
+        now = time.time()
+        with queue_transaction(queue):
+            queue.executemany(
+                'UPDATE write_queue SET status = ?, object_id = ?, '
+                'error = ?, processed_at = ? '
+                'WHERE id = ? AND status = ? AND processed_at = ?',
+                [
+                    (
+                        status, object_id, error, now, entry_id,
+                        PROCESSING, claimed_at
+                    )
+                    for status, object_id, error, entry_id in results
+                ]
+            )
+        failed += sum(status == FAILED for status, *_ in results)
+        done += len(results)
+    queue.execute(
+        'DELETE FROM write_queue WHERE status = ? AND processed_at < ?',
+        (DONE, time.time() - settings.WRITE_BEHIND_RETENTION)
+    )
+    return done - failed, failed
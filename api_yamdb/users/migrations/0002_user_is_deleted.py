@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dbuser',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Удалён'),
+        ),
+    ]
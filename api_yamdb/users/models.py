@@ -52,6 +52,9 @@ class DBUser(AbstractUser):
         choices=ROLE_CHOICES,
         default=USER,
     )
+    is_deleted = models.BooleanField(
+        'Удалён', default=False, editable=False
+    )
 
     @property
     def is_admin(self):
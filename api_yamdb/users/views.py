@@ -9,24 +9,34 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from api.mixins import DeferredDestroyMixin
+from api.pagination import KeysetPagination
 from api.permissions import IsAdmin
-from api.utils import send_confirmation_email
+from api.serializers import UserCommentSerializer, UserReviewSerializer
+from api.utils import ensure_unsharded, send_confirmation_email
+from reviews.models import Comments, Review
 from users.serializers import (CreateUserSerializer, CurrentUserSerializer,
                                SignUpSerializer, TokenSerializer)
 
 User = get_user_model()
 
 
-class UserView(viewsets.ModelViewSet):
+class UserView(DeferredDestroyMixin, viewsets.ModelViewSet):
     """Создание и редактирование пользователя администратором."""
 
-    queryset = User.objects.all()
+    queryset = User.objects.filter(is_deleted=False)
     serializer_class = CreateUserSerializer
     permission_classes = (IsAdmin,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'head', 'delete', 'patch']
     lookup_field = 'username'
+    cursor_ordering = ('username',)
+    query_budgets = {
+        'list': 3, 'create': 4, 'retrieve': 2, 'partial_update': 3,
+        'destroy': 5, 'me': 2, 'me_reviews': 2, 'me_comments': 2,
+        'reviews': 3, 'comments': 3,
+    }
 
     @action(
         detail=False,
@@ -47,12 +57,77 @@ class UserView(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data)
 
+    def get_activity(self, queryset, serializer_class):
+        """Страница отзывов или комментариев пользователя.
+
+        Записи выбираются по индексу (author, pub_date) новыми первыми
+        с курсорной пагинацией и кратким описанием произведения. При
+        включённых шардах история недоступна.
+        """
+        ensure_unsharded()
+        self.cursor_ordering = ('-pub_date', '-id')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def get_reviews(self, user):
+        return self.get_activity(
+            Review.objects.filter(
+                author=user,
+                title__is_deleted=False, title__category__is_deleted=False
+            ).select_related('title'),
+            UserReviewSerializer
+        )
+
+    def get_comments(self, user):
+        return self.get_activity(
+            Comments.objects.filter(
+                author=user,
+                review__title__is_deleted=False,
+                review__title__category__is_deleted=False
+            ).select_related('review__title'),
+            UserCommentSerializer
+        )
+
+    @action(detail=True, permission_classes=(IsAuthenticated,))
+    def reviews(self, request, username=None):
+        """Отзывы пользователя.
+
+        История доступна только авторизованным пользователям, чтобы
+        анонимные запросы не позволяли перебором узнать, какие имена
+        пользователей заняты.
+        """
+        return self.get_reviews(self.get_object())
+
+    @action(detail=True, permission_classes=(IsAuthenticated,))
+    def comments(self, request, username=None):
+        """Комментарии пользователя."""
+        return self.get_comments(self.get_object())
+
+    @action(
+        detail=False, url_path='me/reviews',
+        permission_classes=(IsAuthenticated,)
+    )
+    def me_reviews(self, request):
+        """Отзывы текущего пользователя."""
+        return self.get_reviews(request.user)
+
+    @action(
+        detail=False, url_path='me/comments',
+        permission_classes=(IsAuthenticated,)
+    )
+    def me_comments(self, request):
+        """Комментарии текущего пользователя."""
+        return self.get_comments(request.user)
+
 
 class SignUpView(views.APIView):
     """Самостоятельная регистрация нового пользователя."""
 
     serializer_class = SignUpSerializer
     permission_classes = (AllowAny,)
+    query_budgets = {'post': 5}
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -72,6 +147,7 @@ class TokenView(views.APIView):
 
     serializer_class = TokenSerializer
     permission_classes = (AllowAny,)
+    query_budgets = {'post': 1}
 
     def post(self, request, *args, **kwargs):
         serializer = self.serializer_class(data=request.data)
@@ -0,0 +1,113 @@
+"""Сравнение подсчёта количества объектов в пагинации.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_pagination --titles 50000 --reviews 5000
+"""
+import argparse
+
+from benchmarks.utils import measure, print_table, setup_django, test_database
+
+
+def populate(titles_count, reviews_count):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Genre, Review, Title
+
+    User = get_user_model()
+    categories = Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(5)
+    )
+    categories = list(Category.objects.order_by('id'))
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(10)
+    )
+    genres = list(Genre.objects.order_by('id'))
+    Title.objects.bulk_create(
+        (
+            Title(name=f'Произведение {idx}', year=1900 + idx % 120,
+                  category=categories[idx % len(categories)])
+            for idx in range(titles_count)
+        ),
+        batch_size=5000
+    )
+    Title.genre.through.objects.bulk_create(
+        (
+            Title.genre.through(
+                title_id=title_id, genre_id=genres[title_id % len(genres)].id
+            )
+            for title_id in Title.objects.values_list('id', flat=True)
+        ),
+        batch_size=5000
+    )
+    User.objects.bulk_create(
+        (
+            User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            for idx in range(reviews_count)
+        ),
+        batch_size=5000
+    )
+    title = Title.objects.order_by('id').first()
+    Review.objects.bulk_create(
+        (
+            Review(title=title, author_id=author_id, text='Отзыв', score=5)
+            for author_id in User.objects.values_list('id', flat=True)
+        ),
+        batch_size=5000
+    )
+    return title
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=50000)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from rest_framework.pagination import LimitOffsetPagination
+    from rest_framework.test import APIClient
+
+    from api.pagination import OffsetOrCursorPagination
+    from api.views import ReviewViewSet, TitleViewSet
+
+    class EstimatedCountPagination(OffsetOrCursorPagination):
+        count_mode = 'estimated'
+        count_estimate_threshold = 1000
+
+    class UncachedCountPagination(OffsetOrCursorPagination):
+        count_cache_timeout = 0
+
+    paginators = (
+        ('LimitOffsetPagination', LimitOffsetPagination),
+        ('exact, no cache', UncachedCountPagination),
+        ('exact, cached', OffsetOrCursorPagination),
+        ('estimated', EstimatedCountPagination),
+    )
+
+    with test_database():
+        title = populate(args.titles, args.reviews)
+        client = APIClient()
+        urls = (
+            '/api/v1/titles/?limit=10',
+            '/api/v1/titles/?limit=10&offset=40000',
+            '/api/v1/titles/?limit=10&genre=genre-3',
+            '/api/v1/titles/?limit=10&category=category-1&year=1950',
+            f'/api/v1/titles/{title.id}/reviews/?limit=10',
+        )
+        rows = []
+        for url in urls:
+            for name, pagination_class in paginators:
+                TitleViewSet.pagination_class = pagination_class
+                ReviewViewSet.pagination_class = pagination_class
+                cache.clear()
+                median, p95 = measure(lambda: client.get(url), args.repeat)
+                rows.append((url, name, f'{median:.2f}', f'{p95:.2f}'))
+        print_table(('url', 'pagination', 'median, ms', 'p95, ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
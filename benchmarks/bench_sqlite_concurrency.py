@@ -0,0 +1,172 @@
+"""Пропускная способность SQLite при одновременных чтении и записи.
+
+Несколько потоков создают отзывы, остальные читают список и карточки
+произведений. Замер выполняется без параметров SQLite, с настройкой
+SQLITE_PRAGMAS и с отзывами в шардах REVIEW_SHARD_DATABASES, каждый раз
+на новых файловых БД.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_sqlite_concurrency --writers 4 --readers 8
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.utils import print_table, setup_django, test_database
+
+
+def populate(titles_count, writers_count):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Title
+
+    User = get_user_model()
+    category = Category.objects.create(name='Категория', slug='category')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(titles_count)
+    )
+    User.objects.bulk_create(
+        User(username=f'writer{idx}', email=f'writer{idx}@yamdb.fake')
+        for idx in range(writers_count)
+    )
+    return (
+        list(Title.objects.values_list('id', flat=True)),
+        list(User.objects.order_by('id')),
+    )
+
+
+def run_writer(user, title_ids, deadline, stats):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.force_authenticate(user)
+    for title_id in title_ids:
+        if time.perf_counter() > deadline:
+            break
+        stats.call(lambda: client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            {'text': 'Отзыв', 'score': 5}
+        ).status_code == 201)
+
+
+def run_reader(title_ids, deadline, stats):
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    idx = 0
+    while time.perf_counter() < deadline:
+        title_id = title_ids[idx % len(title_ids)]
+        url = (
+            '/api/v1/titles/?limit=10' if idx % 2
+            else f'/api/v1/titles/{title_id}/'
+        )
+        stats.call(lambda: client.get(url).status_code == 200)
+        idx += 1
+
+
+class Stats:
+    """Время успешных запросов и число ошибок одной группы потоков."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []
+        self.errors = 0
+
+    def call(self, func):
+        start = time.perf_counter()
+        try:
+            ok = func()
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            if ok:
+                self.samples.append(elapsed)
+            else:
+                self.errors += 1
+
+    def row(self, profile, role, duration):
+        samples = sorted(self.samples) or [0]
+        return (
+            profile, role, len(self.samples), self.errors,
+            f'{len(self.samples) / duration:.1f}',
+            f'{statistics.median(samples):.2f}',
+            f'{samples[min(len(samples) - 1, int(len(samples) * 0.95))]:.2f}',
+        )
+
+
+def run_profile(args, path, shards=()):
+    from django.db import connections
+
+    def in_thread(target, *target_args):
+        def run():
+            try:
+                target(*target_args)
+            finally:
+                connections.close_all()
+        return threading.Thread(target=run)
+
+    shard_names = {
+        alias: path.with_name(f'{path.stem}_{alias}.sqlite3')
+        for alias in shards
+    }
+    with test_database(path, **shard_names):
+        title_ids, users = populate(args.titles, args.writers)
+        writers, readers = Stats(), Stats()
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            in_thread(run_writer, user, title_ids, deadline, writers)
+            for user in users
+        ] + [
+            in_thread(run_reader, title_ids, deadline, readers)
+            for _ in range(args.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return writers, readers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    pragmas = settings.SQLITE_PRAGMAS
+    shards = settings.REVIEW_SHARD_DATABASES
+    profiles = (
+        ('default', {}, ()),
+        ('tuned', pragmas, ()),
+        ('sharded', pragmas, shards),
+    )
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for profile, profile_pragmas, profile_shards in profiles:
+            settings.SQLITE_PRAGMAS = profile_pragmas
+            settings.REVIEW_SHARDS = list(profile_shards)
+            writers, readers = run_profile(
+                args, Path(tmp_dir) / f'{profile}.sqlite3', profile_shards
+            )
+            rows.append(writers.row(profile, 'writers', args.duration))
+            rows.append(readers.row(profile, 'readers', args.duration))
+    print_table(
+        ('profile', 'role', 'ok', 'errors', 'req/s', 'median, ms',
+         'p95, ms'),
+        rows
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def setup_django():
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database(name=None, **names):
+    """Временные тестовые БД с применёнными миграциями.
+
+    По умолчанию SQLite создаёт БД в памяти, ``name`` задаёт файл для
+    default, а ``names`` создаёт БД других псевдонимов в файлах.
+    """
+    from django.db import connections
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    names = {'default': name, **names}
+    setup_test_environment()
+    old_names = {}
+    for alias, test_name in names.items():
+        connection = connections[alias]
+        if test_name is not None:
+            connection.settings_dict['TEST']['NAME'] = str(test_name)
+        old_names[alias] = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+    try:
+        yield
+    finally:
+        for alias, old_name in old_names.items():
+            connections[alias].creation.destroy_test_db(
+                old_name, verbosity=0
+            )
+        teardown_test_environment()
+
+
+def measure(func, repeat):
+    """Медиана и 95-й перцентиль времени вызова в миллисекундах."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return (
+        statistics.median(samples),
+        samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    )
+
+
+def print_table(header, rows):
+    widths = [
+        max(len(str(row[idx])) for row in [header, *rows])
+        for idx in range(len(header))
+    ]
+    for row in [header, *rows]:
+        print('  '.join(
+            str(value).ljust(width) for value, width in zip(row, widths)
+        ))
@@ -1,6 +1,9 @@
 import os
+import shutil
 import sys
+import tempfile
 
+from django.conf import settings
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,4 +35,15 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_cache',
+    'tests.fixtures.fixture_query_budget',
 ]
+
+
+def pytest_configure(config):
+    # Кэш тестов хранится во временном каталоге, а не в каталоге проекта.
+    settings.CACHES['default']['LOCATION'] = tempfile.mkdtemp()
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(settings.CACHES['default']['LOCATION'], ignore_errors=True)
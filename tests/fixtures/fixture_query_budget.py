@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def query_budget_raise(settings):
+    settings.QUERY_BUDGET_MODE = 'raise'
@@ -1,6 +1,7 @@
 from http import HTTPStatus
 
 import pytest
+from django.core.management import call_command
 
 from tests.utils import (
     check_pagination, invalid_data_for_user_patch_and_creation
@@ -418,10 +419,11 @@ class Test01UserAPI:
                                                django_user_model):
         users_cnt = django_user_model.objects.count()
         response = admin_client.delete(f'{self.USERS_URL}{user.username}/')
-        assert response.status_code == HTTPStatus.NO_CONTENT, (
+        assert response.status_code == HTTPStatus.ACCEPTED, (
             f'Проверьте, что DELETE-запрос администратора к `{self.USERS_URL}'
-            '{username}/` возвращает ответ со статусом 204.'
+            '{username}/` возвращает ответ со статусом 202.'
         )
+        call_command('process_deletions')
         assert django_user_model.objects.count() == (users_cnt - 1), (
             f'Проверьте, что DELETE-запрос администратора к `{self.USERS_URL}'
             '{username}/` удаляет пользователя.'
@@ -461,11 +463,12 @@ class Test01UserAPI:
         response = user_superuser_client.delete(
             f'{self.USERS_URL}{user.username}/'
         )
-        assert response.status_code == HTTPStatus.NO_CONTENT, (
+        assert response.status_code == HTTPStatus.ACCEPTED, (
             'Проверьте, что DELETE-запрос суперпользователя к '
             f'`{self.USERS_URL}'
-            '{username}/` возвращает ответ со статусом 204.'
+            '{username}/` возвращает ответ со статусом 202.'
         )
+        call_command('process_deletions')
         assert django_user_model.objects.count() == (users_cnt - 1), (
             'Проверьте, что DELETE-запрос суперпользователя к '
             f'`{self.USERS_URL}'
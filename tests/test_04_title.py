@@ -262,10 +262,10 @@ class Test04TitleAPI:
         response = admin_client.delete(
             self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id']),
         )
-        assert response.status_code == HTTPStatus.NO_CONTENT, (
+        assert response.status_code == HTTPStatus.ACCEPTED, (
             'Проверьте, что DELETE-запрос администратора к '
             f'`{self.TITLES_DETAIL_URL_TEMPLATE}` возвращает ответ со '
-            'статусом 204.'
+            'статусом 202.'
         )
         response = admin_client.get(self.TITLES_URL)
         test_data = response.json()['results']
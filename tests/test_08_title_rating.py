@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def check_title_stats(self, title_id, score_sum, reviews_count):
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count) == (
+            score_sum, reviews_count
+        ), (
+            'Проверьте, что сумма оценок и количество отзывов произведения '
+            'обновляются при изменении отзывов.'
+        )
+        expected_rating = score_sum / reviews_count if reviews_count else None
+        assert title.rating == expected_rating, (
+            'Проверьте, что рейтинг произведения равен средней оценке его '
+            'отзывов, а при отсутствии отзывов равен `None`.'
+        )
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user, user_client, moderator,
+                                              moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        self.check_title_stats(title_id, 10, 2)
+
+        create_single_review(moderator_client, title_id, 'Отлично', 10)
+        self.check_title_stats(title_id, 20, 3)
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 2}
+        )
+        assert response.status_code == HTTPStatus.OK
+        self.check_title_stats(title_id, 17, 3)
+
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json().get('rating') == 5, (
+            'Проверьте, что поле `rating` в ответе на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` берётся из сохранённого '
+            'рейтинга произведения.'
+        )
+
+        response = admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        self.check_title_stats(title_id, 12, 2)
+
+    def test_02_rating_follows_user_deletion(self, admin_client, admin,
+                                             user, user_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+        }
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+
+        user.delete()
+        self.check_title_stats(title_id, 5, 1)
+
+        admin.delete()
+        self.check_title_stats(title_id, 0, 0)
+
+    def test_03_rebuild_ratings_command(self, admin_client, admin, user,
+                                        user_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+        }
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        Title.objects.update(score_sum=0, reviews_count=0, rating=None)
+        Review.objects.filter(author=user).update(score=9)
+
+        call_command('rebuild_ratings')
+        self.check_title_stats(title_id, 14, 2)
+        self.check_title_stats(titles[1]['id'], 0, 0)
@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+TITLES_COUNT = 1000
+
+
+@pytest.fixture
+def many_titles():
+    category = Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(3)
+    )
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx:04}', year=2000, category=category)
+        for idx in range(TITLES_COUNT)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title_id, genre_id=genre.id)
+        for title_id in Title.objects.values_list('id', flat=True)
+        for genre in genres[:2]
+    )
+    return Title.objects.order_by('id').first()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.mark.parametrize('limit', (10, 100, 1000))
+    def test_01_title_list_queries(self, client, many_titles,
+                                   django_assert_num_queries, limit):
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL, {'limit': limit})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert len(data['results']) == limit, (
+            f'Проверьте, что эндпоинт `{self.TITLES_URL}` возвращает '
+            'количество произведений, указанное в параметре `limit`.'
+        )
+        assert all(len(title['genre']) == 2 for title in data['results'])
+        assert all(
+            title['category'] == {'name': 'Фильм', 'slug': 'films'}
+            for title in data['results']
+        )
+
+    def test_02_title_detail_queries(self, client, many_titles,
+                                     django_assert_num_queries):
+        url = self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=many_titles.id)
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['genre']) == 2
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def walk_cursor_pages(self, client, url, params):
+        response = client.get(url, params)
+        results = []
+        while True:
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                f'Проверьте, что в курсорном режиме ответ `{url}` '
+                'не содержит ключ `count`.'
+            )
+            results.extend(data['results'])
+            if not data['next']:
+                return results
+            response = client.get(data['next'])
+
+    def test_01_titles_cursor(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx % 7}', year=2000,
+                  category=category)
+            for idx in range(25)
+        )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        results = self.walk_cursor_pages(
+            client, self.TITLES_URL, {'pagination': 'cursor', 'limit': 4}
+        )
+        assert [title['id'] for title in results] == expected, (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения в порядке (name, id) без повторов.'
+        )
+
+        response = client.get(self.TITLES_URL, {'limit': 4, 'offset': 20})
+        data = response.json()
+        assert data['count'] == 25 and len(data['results']) == 4, (
+            f'Проверьте, что пагинация limit/offset `{self.TITLES_URL}` '
+            'продолжает работать без параметра `pagination`.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        results = self.walk_cursor_pages(
+            client, url, {'pagination': 'cursor', 'limit': 2}
+        )
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reviews
+        ], (
+            f'Проверьте, что курсорная пагинация `{url}` возвращает '
+            'отзывы в порядке публикации.'
+        )
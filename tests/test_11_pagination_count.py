@@ -0,0 +1,119 @@
+import multiprocessing
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from api.cache import bump_version
+from api.pagination import OffsetOrCursorPagination
+from reviews.models import Category, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11PaginationCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_count_is_cached(self, client, admin_client,
+                                django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == len(titles)
+
+        with django_assert_num_queries(2):
+            response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == len(titles), (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'берёт количество произведений из кэша.'
+        )
+
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == len(titles) + 1, (
+            'Проверьте, что закэшированное количество объектов '
+            'сбрасывается после записи в таблицу.'
+        )
+
+        response = client.get(
+            self.TITLES_URL, {'category': categories[0]['slug']}
+        )
+        assert response.json()['count'] == 2, (
+            'Проверьте, что количество объектов кэшируется отдельно '
+            'для каждого набора фильтров.'
+        )
+
+    def test_02_estimated_count(self, client, monkeypatch):
+        monkeypatch.setattr(
+            OffsetOrCursorPagination, 'count_mode', 'estimated'
+        )
+        monkeypatch.setattr(
+            OffsetOrCursorPagination, 'count_estimate_threshold', 5
+        )
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx in range(8)
+        )
+
+        data = client.get(self.TITLES_URL, {'limit': 2}).json()
+        assert data['count_estimated'] is True, (
+            'Проверьте, что в режиме `estimated` ответ выше порога '
+            'содержит признак `count_estimated`.'
+        )
+        assert data['count'] >= 6 and len(data['results']) == 2
+
+        data = client.get(self.TITLES_URL, {'limit': 2, 'offset': 6}).json()
+        assert len(data['results']) == 2, (
+            'Проверьте, что в режиме `estimated` страницы за порогом '
+            'точного подсчёта не пустые.'
+        )
+
+        data = client.get(
+            self.TITLES_URL, {'name': 'Произведение 1'}
+        ).json()
+        assert data['count'] == 1 and 'count_estimated' not in data, (
+            'Проверьте, что в режиме `estimated` ниже порога '
+            'возвращается точное количество объектов.'
+        )
+
+    def test_03_versions_shared_between_processes(self, client,
+                                                  admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert client.get(self.TITLES_URL).json()['count'] == len(titles)
+        # Запись без сигналов и смена версии в другом процессе, как при
+        # работе нескольких воркеров или команд управления.
+        category = Category.objects.first()
+        Title.objects.bulk_create(
+            [Title(name='Чужой', year=1979, category=category)]
+        )
+        process = multiprocessing.get_context('fork').Process(
+            target=bump_version, args=(Title,)
+        )
+        process.start()
+        process.join()
+        assert client.get(self.TITLES_URL).json()['count'] == (
+            len(titles) + 1
+        ), (
+            'Проверьте, что версии данных хранятся в кэше, общем для '
+            'всех процессов.'
+        )
+
+    def test_04_process_local_cache_warning(self, settings, capsys):
+        call_command('check')
+        assert 'api.W001' not in capsys.readouterr().err
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        call_command('check')
+        assert 'api.W001' in capsys.readouterr().err, (
+            'Проверьте, что кэш в памяти процесса даёт предупреждение '
+            'при проверке проекта.'
+        )
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.leaderboard import weighted_rating
+from reviews.models import LeaderboardEntry
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitleTop:
+
+    TOP_URL = '/api/v1/titles/top/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get_top(self, client, **params):
+        response = client.get(self.TOP_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TOP_URL}` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [
+            (title['id'], title['weighted_rating'])
+            for title in response.json()['results']
+        ]
+
+    def test_01_top_titles(self, client, admin_client, user_client,
+                           moderator_client):
+        titles, categories, genres = create_titles(admin_client)
+        first_id, second_id = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, first_id, 'Плохо', 2)
+        create_single_review(user_client, second_id, 'Отлично', 10)
+        create_single_review(moderator_client, second_id, 'Хорошо', 8)
+
+        assert self.get_top(client) == [
+            (second_id, weighted_rating(18, 2)),
+            (first_id, weighted_rating(2, 1)),
+        ], (
+            f'Проверьте, что `{self.TOP_URL}` возвращает произведения '
+            'в порядке убывания взвешенного рейтинга.'
+        )
+        assert self.get_top(client, category=categories[0]['slug']) == [
+            (first_id, weighted_rating(2, 1)),
+        ]
+        assert self.get_top(client, genre=genres[2]['slug']) == [
+            (second_id, weighted_rating(18, 2)),
+        ]
+        assert self.get_top(
+            client, genre=genres[0]['slug'], category=categories[1]['slug']
+        ) == []
+
+        response = admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=first_id),
+            data={'genre': [genres[2]['slug']],
+                  'category': categories[1]['slug']},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_top(client, genre=genres[2]['slug']) == [
+            (second_id, weighted_rating(18, 2)),
+            (first_id, weighted_rating(2, 1)),
+        ], (
+            'Проверьте, что таблица лучших произведений обновляется при '
+            'изменении жанров произведения.'
+        )
+        assert self.get_top(client, genre=genres[0]['slug']) == []
+        assert self.get_top(client, category=categories[0]['slug']) == []
+
+    def test_02_rebuild_leaderboard(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 7)
+        fields = ('title_id', 'category_id', 'genre_id', 'weighted_rating')
+        expected = set(LeaderboardEntry.objects.values_list(*fields))
+
+        LeaderboardEntry.objects.all().delete()
+        call_command('rebuild_leaderboard')
+        assert set(
+            LeaderboardEntry.objects.values_list(*fields)
+        ) == expected, (
+            'Проверьте, что команда `rebuild_leaderboard` восстанавливает '
+            'таблицу лучших произведений.'
+        )
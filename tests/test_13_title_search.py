@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.search import FTS_TABLE
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranking(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Назад в будущее',
+            'year': 1985,
+            'genre': [genres[1]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Терминатор тут ни при чём.'
+        }
+        admin_client.post(self.TITLES_URL, data=data)
+
+        assert self.search(client, 'терминатор') == [
+            'Терминатор', 'Назад в будущее'
+        ], (
+            'Проверьте, что поиск учитывает описание и ставит совпадения '
+            'в названии выше совпадений в описании.'
+        )
+        assert self.search(client, 'креп') == ['Крепкий орешек'], (
+            'Проверьте, что поиск находит слова по началу.'
+        )
+        assert self.search(client, 'back') == ['Терминатор']
+        assert self.search(client, 'терминатор back') == ['Терминатор']
+        assert self.search(client, '"*') == []
+
+        response = admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Die Hard'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.search(client, 'die') == ['Die Hard'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        assert self.search(client, 'крепкий') == []
+
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert self.search(client, 'терминатор') == ['Назад в будущее']
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Индекс FTS5 есть в SQLite.'
+    )
+    def test_02_rebuild_search_index(self, client, admin_client):
+        create_titles(admin_client)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')"
+            )
+            cursor.execute(
+                f"SELECT count(*) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH 'терминатор'"
+            )
+            assert cursor.fetchone() == (0,)
+
+        call_command('rebuild_search_index')
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что команда `rebuild_search_index` заполняет '
+            'поисковый индекс по существующим произведениям.'
+        )
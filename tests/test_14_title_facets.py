@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleFacets:
+
+    FACETS_URL = '/api/v1/titles/facets/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_facets(self, client, admin_client,
+                       django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        with django_assert_max_num_queries(3):
+            response = client.get(self.FACETS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.FACETS_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert response.json() == {
+            'count': 2,
+            'genre': [
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 1},
+                {'slug': 'drama', 'name': 'Драма', 'count': 1},
+                {'slug': 'horror', 'name': 'Ужасы', 'count': 1},
+            ],
+            'category': [
+                {'slug': 'books', 'name': 'Книги', 'count': 1},
+                {'slug': 'films', 'name': 'Фильм', 'count': 1},
+            ],
+            'decade': [{'decade': 1980, 'count': 2}],
+        }, (
+            f'Проверьте, что `{self.FACETS_URL}` возвращает количество '
+            'произведений по жанрам, категориям и десятилетиям.'
+        )
+
+        with django_assert_max_num_queries(0):
+            client.get(self.FACETS_URL)
+
+        response = client.get(
+            self.FACETS_URL, {'genre': 'horror', 'year': 1984}
+        )
+        data = response.json()
+        assert data['count'] == 1
+        assert [genre['slug'] for genre in data['genre']] == [
+            'comedy', 'horror'
+        ], (
+            f'Проверьте, что `{self.FACETS_URL}` учитывает фильтры списка '
+            'произведений.'
+        )
+
+        response = admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'genre': [genres[2]['slug'], genres[0]['slug']],
+                  'year': 1990},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = client.get(self.FACETS_URL).json()
+        assert data['genre'][0] == {
+            'slug': 'horror', 'name': 'Ужасы', 'count': 2
+        }, (
+            'Проверьте, что кэш срезов сбрасывается при изменении жанров '
+            'произведения.'
+        )
+        assert data['decade'] == [
+            {'decade': 1980, 'count': 1}, {'decade': 1990, 'count': 1}
+        ]
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Category, Genre, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleOrdering:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметрами '
+            f'{params} возвращает ответ со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_title_ordering(self, client, admin_client, user_client,
+                               moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Плохо', 3)
+        create_single_review(user_client, titles[1]['id'], 'Хорошо', 8)
+        create_single_review(moderator_client, titles[1]['id'], 'Так', 6)
+        first, second = titles[0]['name'], titles[1]['name']
+
+        assert self.get_names(client) == [second, first]
+        assert self.get_names(client, ordering='year') == [first, second]
+        assert self.get_names(client, ordering='-year') == [second, first]
+        assert self.get_names(client, ordering='-rating') == [second, first]
+        assert self.get_names(client, ordering='reviews_count') == [
+            first, second
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}` поддерживает сортировку '
+            'по году, рейтингу и количеству отзывов.'
+        )
+        assert self.get_names(client, ordering='description') == [
+            second, first
+        ], 'Сортировка по полям вне списка должна игнорироваться.'
+
+    def test_02_slug_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        assert self.get_names(client, genre=genres[0]['slug']) == [
+            titles[0]['name']
+        ]
+        assert self.get_names(client, category=categories[1]['slug']) == [
+            titles[1]['name']
+        ]
+        assert self.get_names(client, genre='unknown') == []
+        assert self.get_names(client, category='unknown') == []
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='План запроса SQLite.'
+    )
+    def test_03_filters_use_indexes(self):
+        from api.filters import TitlesFilter
+
+        Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.create(name='Ужасы', slug='horror')
+        for params, index in (
+            ({'category': 'films'}, 'title_category_name_idx'),
+            ({'genre': 'horror'}, 'title_genre_genre_title_idx'),
+        ):
+            queryset = TitlesFilter(params, Title.objects.all()).qs
+            sql, sql_params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', sql_params)
+                plan = ' '.join(str(row) for row in cursor.fetchall())
+            assert index in plan, (
+                f'Проверьте, что фильтр {params} использует индекс {index}.'
+            )
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews import histograms
+from reviews.models import ScoreHistogram
+from tests.utils import create_reviews, create_single_review
+
+
+def histogram(**counts):
+    return {
+        str(score): counts.get(f's{score}', 0) for score in range(1, 11)
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ScoreHistogram:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    HISTOGRAMS_URL = '/api/v1/titles/histograms/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_histogram(self, client, title_id):
+        response = client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            {'include': 'histogram'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('histogram')
+
+    def test_01_histogram_follows_reviews(self, client, admin_client, admin,
+                                          user, user_client,
+                                          moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        create_single_review(moderator_client, title_id, 'Хорошо', 8)
+        assert self.get_histogram(client, title_id) == histogram(s5=2, s8=1), (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLES_DETAIL_URL_TEMPLATE}` с параметром '
+            '`include=histogram` возвращает распределение оценок.'
+        )
+        assert 'histogram' not in client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 1}
+        )
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert self.get_histogram(client, title_id) == histogram(s1=1, s8=1), (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзывов.'
+        )
+        assert self.get_histogram(client, titles[1]['id']) == histogram()
+
+    def test_02_histograms_bulk(self, client, admin_client, admin, user,
+                                user_client, django_assert_num_queries):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        ids = f'{titles[1]["id"]},{titles[0]["id"]},999'
+        with django_assert_num_queries(1):
+            response = client.get(self.HISTOGRAMS_URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            str(titles[1]['id']): histogram(),
+            str(titles[0]['id']): histogram(s5=2),
+            '999': histogram(),
+        }, (
+            f'Проверьте, что `{self.HISTOGRAMS_URL}` возвращает '
+            'распределения оценок для всех запрошенных произведений.'
+        )
+
+        response = client.get(self.HISTOGRAMS_URL, {'ids': '1,a'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.get(
+            self.HISTOGRAMS_URL,
+            {'ids': ','.join(str(idx) for idx in range(1, 300))}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_rebuild_histograms(self, client, admin_client, admin, user,
+                                   user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        ScoreHistogram.objects.all().delete()
+
+        call_command('rebuild_histograms')
+        assert self.get_histogram(client, titles[0]['id']) == histogram(
+            s5=2
+        ), (
+            'Проверьте, что команда `rebuild_histograms` восстанавливает '
+            'распределения оценок.'
+        )
+
+    def test_04_histogram_created_concurrently(self, client, admin_client,
+                                               admin, user, user_client,
+                                               moderator_client,
+                                               monkeypatch, settings):
+        settings.QUERY_BUDGET_MODE = 'log'
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        ScoreHistogram.objects.all().delete()
+        iter_histograms = histograms.iter_histograms
+
+        def create_concurrently(reviews):
+            ScoreHistogram.objects.create(title_id=title_id, score_5=2)
+            return iter_histograms(reviews)
+
+        monkeypatch.setattr(
+            histograms, 'iter_histograms', create_concurrently
+        )
+        response = create_single_review(
+            moderator_client, title_id, 'Хорошо', 8
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_histogram(client, title_id) == histogram(
+            s5=2, s8=1
+        ), (
+            'Проверьте, что распределение, созданное параллельным '
+            'запросом, не приводит к ошибке и получает новую оценку.'
+        )
@@ -0,0 +1,139 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import LeaderboardEntry, Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_items(self, count):
+        return [
+            {
+                'name': f'Произведение {number}',
+                'year': 1900 + number,
+                'genre': ['horror', 'comedy'] if number % 2 else ['drama'],
+                'category': 'films' if number % 2 else 'books',
+            }
+            for number in range(count)
+        ]
+
+    def test_01_bulk_create(self, client, admin_client,
+                            django_assert_max_num_queries):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = self.get_items(7)
+        with django_assert_max_num_queries(20):
+            response = admin_client.post(
+                f'{self.BULK_URL}?chunk_size=3', data=items, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректными данными возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert data['errors'] == []
+        assert [item['index'] for item in data['created']] == list(range(7))
+
+        for item, created in zip(items, data['created']):
+            title = Title.objects.get(pk=created['id'])
+            assert title.name == item['name']
+            assert title.category.slug == item['category']
+            assert sorted(
+                title.genre.values_list('slug', flat=True)
+            ) == sorted(item['genre']), (
+                f'Проверьте, что `{self.BULK_URL}` сохраняет жанры '
+                'произведений.'
+            )
+        assert LeaderboardEntry.objects.count() == 7 + 7 + 3 * 2 + 4, (
+            f'Проверьте, что `{self.BULK_URL}` добавляет произведения в '
+            'рейтинг.'
+        )
+
+        response = client.get(self.TITLES_URL, {'search': 'Произведение'})
+        assert response.json()['count'] == 7, (
+            f'Проверьте, что произведения из `{self.BULK_URL}` доступны для '
+            'поиска.'
+        )
+
+    def test_02_bulk_ndjson(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        body = '\n'.join(json.dumps(item) for item in self.get_items(3))
+        response = admin_client.post(
+            self.BULK_URL, data=body + '\n',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что `{self.BULK_URL}` принимает NDJSON.'
+        )
+        assert len(response.json()['created']) == 3
+        assert Title.objects.count() == 3
+
+        response = admin_client.post(
+            self.BULK_URL, data='{"name": \n',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_bulk_errors(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = self.get_items(4)
+        items[1]['year'] = 3000
+        items[2]['genre'] = ['horror', 'unknown']
+        items[3]['category'] = 'unknown'
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert [item['index'] for item in data['created']] == [0], (
+            f'Проверьте, что `{self.BULK_URL}` сохраняет корректные '
+            'произведения пакета.'
+        )
+        assert [error['index'] for error in data['errors']] == [1, 2, 3], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает ошибки по номерам '
+            'произведений в пакете.'
+        )
+        assert 'year' in data['errors'][0]['errors']
+        assert 'genre' in data['errors'][1]['errors']
+        assert 'category' in data['errors'][2]['errors']
+        assert Title.objects.count() == 1
+
+        response = admin_client.post(
+            self.BULK_URL, data=items[1:], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            self.BULK_URL, data={'name': 'Одно'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        for chunk_size in ('0', 'abc', '100000'):
+            response = admin_client.post(
+                f'{self.BULK_URL}?chunk_size={chunk_size}',
+                data=items[:1], format='json'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.BULK_URL}` проверяет размер пачки.'
+            )
+
+    def test_04_bulk_permissions(self, client, user_client, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        items = self.get_items(1)
+        response = client.post(
+            self.BULK_URL, data=json.dumps(items),
+            content_type='application/json'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{self.BULK_URL}` доступен только '
+            'администратору.'
+        )
+        assert not Title.objects.exists()
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{resource}/'
+
+    def get_export(self, client, resource, export_format):
+        url = self.EXPORT_URL_TEMPLATE.format(resource=resource)
+        response = client.get(url, {'format': export_format})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос администратора к `{url}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert response.streaming, (
+            f'Проверьте, что `{url}` отдаёт выгрузку потоком.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_titles(self, admin_client, user_client,
+                              django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        user_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            data={'text': 'Отлично', 'score': 9}
+        )
+        with django_assert_max_num_queries(4):
+            content = self.get_export(admin_client, 'titles', 'ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert rows == [
+            {
+                'id': titles[0]['id'], 'name': 'Терминатор', 'year': 1984,
+                'description': 'I`ll be back', 'category': 'films',
+                'genre': ['comedy', 'horror'], 'rating': 9.0,
+                'reviews_count': 1,
+            },
+            {
+                'id': titles[1]['id'], 'name': 'Крепкий орешек',
+                'year': 1988, 'description': 'Yippie ki yay...',
+                'category': 'books', 'genre': ['drama'], 'rating': None,
+                'reviews_count': 0,
+            },
+        ], (
+            'Проверьте, что выгрузка произведений в NDJSON содержит '
+            'рейтинг, жанры и категорию.'
+        )
+
+        content = self.get_export(admin_client, 'titles', 'csv')
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [row['genre'] for row in rows] == ['comedy,horror', 'drama']
+        assert rows[0]['category'] == 'films', (
+            'Проверьте, что выгрузка произведений в CSV содержит '
+            'заголовок и жанры через запятую.'
+        )
+
+    def test_02_export_reviews_comments(self, admin_client, admin,
+                                        user_client, user):
+        authors_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, authors_map)
+        content = self.get_export(admin_client, 'reviews', 'ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [
+            (row['id'], row['title_id'], row['author'], row['score'])
+            for row in rows
+        ] == [
+            (review['id'], titles[0]['id'], review['author'], 5)
+            for review in reviews
+        ], 'Проверьте, что выгрузка отзывов содержит все отзывы.'
+        assert rows[0]['pub_date'], 'Проверьте поля выгрузки отзывов.'
+
+        content = self.get_export(admin_client, 'comments', 'csv')
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [
+            (int(row['id']), int(row['review_id']), row['author'])
+            for row in rows
+        ] == [
+            (comment['id'], reviews[0]['id'], comment['author'])
+            for comment in comments
+        ], 'Проверьте, что выгрузка комментариев содержит все комментарии.'
+        assert {row['title_id'] for row in rows} == {str(titles[0]['id'])}
+
+    def test_03_export_permissions(self, client, user_client,
+                                   moderator_client, admin_client):
+        url = self.EXPORT_URL_TEMPLATE.format(resource='titles')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        for user_client_ in (user_client, moderator_client):
+            assert user_client_.get(url).status_code == (
+                HTTPStatus.FORBIDDEN
+            ), f'Проверьте, что `{url}` доступен только администратору.'
+        url = self.EXPORT_URL_TEMPLATE.format(resource='users')
+        assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleMultiGet:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_multi_get(self, client, admin_client, user_client,
+                          django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        first_id, second_id = titles[0]['id'], titles[1]['id']
+        create_single_review(user_client, second_id, 'Отлично', 10)
+        ids = f'{second_id},{first_id},{second_id},999'
+        with django_assert_max_num_queries(2):
+            response = client.get(self.TITLES_URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`ids` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [second_id, first_id], (
+            f'Проверьте, что `{self.TITLES_URL}?ids=` возвращает '
+            'произведения в запрошенном порядке без повторов и '
+            'несуществующих id.'
+        )
+        assert data[0]['rating'] == 10
+        assert data[0]['category'] == categories[1]
+        assert sorted(genre['slug'] for genre in data[1]['genre']) == [
+            'comedy', 'horror'
+        ]
+
+        response = client.get(
+            self.TITLES_URL, {'ids': f'{first_id},{second_id}',
+                              'category': 'books'}
+        )
+        assert [title['id'] for title in response.json()] == [second_id], (
+            f'Проверьте, что `{self.TITLES_URL}?ids=` учитывает фильтры.'
+        )
+
+    def test_02_multi_get_validation(self, client):
+        response = client.get(self.TITLES_URL, {'ids': '1,a'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        ids = ','.join(
+            str(pk) for pk in range(1, settings.TITLES_BATCH_MAX_SIZE + 2)
+        )
+        response = client.get(self.TITLES_URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.TITLES_URL}?ids=` ограничивает '
+            'количество запрашиваемых произведений.'
+        )
@@ -0,0 +1,109 @@
+import multiprocessing
+from http import HTTPStatus
+
+import pytest
+
+from api import slugs
+from api.cache import bump_version
+from reviews.models import Genre
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SlugCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_serializer_without_queries(self, admin_client,
+                                           django_assert_num_queries):
+        from api.serializers import TitlesCreateSerializer
+
+        create_titles(admin_client)
+        data = {
+            'name': 'Чужой', 'year': 1979,
+            'genre': ['horror', 'drama'], 'category': 'films'
+        }
+        TitlesCreateSerializer(data=data).is_valid()
+        with django_assert_num_queries(0):
+            serializer = TitlesCreateSerializer(data=data)
+            assert serializer.is_valid(), serializer.errors
+        assert [
+            genre.slug for genre in serializer.validated_data['genre']
+        ] == ['horror', 'drama']
+        assert serializer.validated_data['category'].slug == 'films', (
+            'Проверьте, что слаги жанров и категорий разрешаются по кэшу '
+            'без запросов к БД.'
+        )
+
+        with django_assert_num_queries(0):
+            serializer = TitlesCreateSerializer(
+                data={**data, 'genre': ['horror', 'unknown']}
+            )
+            assert not serializer.is_valid()
+        assert 'genre' in serializer.errors
+
+    def test_02_filter_without_queries(self, client, admin_client,
+                                       django_assert_num_queries,
+                                       django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL, {'genre': 'horror', 'category': 'films'})
+        with django_assert_max_num_queries(3):
+            response = client.get(
+                self.TITLES_URL, {'genre': 'horror', 'category': 'films'}
+            )
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ]
+        with django_assert_num_queries(0):
+            response = client.get(self.TITLES_URL, {'genre': 'unknown'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что фильтр по неизвестному слагу не обращается к БД.'
+        )
+
+    def test_03_invalidation(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL, {'genre': 'horror'})
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/',
+            data={'genre': ['western']}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый жанр доступен сразу после создания.'
+        )
+        response = client.get(self.TITLES_URL, {'genre': 'western'})
+        assert response.json()['count'] == 1
+
+        admin_client.delete('/api/v1/categories/films/')
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой', 'year': 1979,
+            'genre': ['horror'], 'category': 'films'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что удалённая категория исключается из кэша.'
+        )
+
+    def test_04_write_in_other_process(self, admin_client, settings):
+        create_titles(admin_client)
+        assert slugs.genres.get('western') is None
+        # Запись без сигналов: версию меняет другой процесс.
+        Genre.objects.bulk_create([Genre(name='Вестерн', slug='western')])
+        process = multiprocessing.get_context('fork').Process(
+            target=bump_version, args=(Genre,)
+        )
+        process.start()
+        process.join()
+        assert slugs.genres.get('western') is not None, (
+            'Проверьте, что справочник перечитывается после записи в '
+            'другом процессе.'
+        )
+
+        Genre.objects.bulk_create([Genre(name='Нуар', slug='noir')])
+        assert slugs.genres.get('noir') is None
+        settings.SLUG_CACHE_TIMEOUT = 0
+        assert slugs.genres.get('noir') is not None, (
+            'Проверьте, что справочник перечитывается по истечении '
+            'SLUG_CACHE_TIMEOUT даже без смены версии.'
+        )
@@ -0,0 +1,104 @@
+import multiprocessing
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.cache import bump_version
+from reviews.models import Genre
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21LookupCache:
+
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_cached_list(self, client, admin_client,
+                            django_assert_num_queries):
+        create_genre(admin_client)
+        response = client.get(self.GENRES_URL, {'search': 'а'})
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ `{self.GENRES_URL}` содержит ETag.'
+        )
+        assert 'max-age' in response['Cache-Control']
+
+        with django_assert_num_queries(0):
+            cached = client.get(self.GENRES_URL, {'search': 'а'})
+        assert cached.json() == response.json(), (
+            f'Проверьте, что повторный запрос к `{self.GENRES_URL}` '
+            'отдаётся из кэша без запросов к БД.'
+        )
+        assert cached['ETag'] == etag
+
+        other = client.get(self.GENRES_URL)
+        assert other['ETag'] != etag
+        assert other.json()['count'] == 3
+
+        with django_assert_num_queries(0):
+            response = client.get(
+                self.GENRES_URL, {'search': 'а'}, HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что `{self.GENRES_URL}` отвечает 304 при '
+            'совпадении If-None-Match.'
+        )
+        assert response['ETag'] == etag
+
+    def test_02_invalidation(self, client, admin_client):
+        create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        etag = response['ETag']
+        assert response.json()['count'] == 2
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что запись в категории обновляет ETag '
+            f'`{self.CATEGORIES_URL}`.'
+        )
+        assert response.json()['count'] == 3
+        etag = response['ETag']
+
+        admin_client.delete(f'{self.CATEGORIES_URL}music/')
+        response = client.get(self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 2, (
+            f'Проверьте, что удаление категории сбрасывает кэш '
+            f'`{self.CATEGORIES_URL}`.'
+        )
+
+    def test_03_etag_follows_content(self, client, admin_client):
+        create_genre(admin_client)
+        etag = client.get(self.GENRES_URL)['ETag']
+        # Запись без сигналов: версию меняет другой процесс.
+        Genre.objects.bulk_create([Genre(name='Вестерн', slug='western')])
+        process = multiprocessing.get_context('fork').Process(
+            target=bump_version, args=(Genre,)
+        )
+        process.start()
+        process.join()
+        response = client.get(self.GENRES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что запись в другом процессе меняет ETag '
+            f'`{self.GENRES_URL}`.'
+        )
+        assert response.json()['count'] == 4
+        etag = response['ETag']
+
+        Genre.objects.bulk_create([Genre(name='Нуар', slug='noir')])
+        cache.clear()
+        response = client.get(self.GENRES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка, перестроенного после истечения '
+            'кэша, зависит от его содержимого.'
+        )
+        assert response.json()['count'] == 5
+        assert client.get(
+            self.GENRES_URL, HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,158 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comments, DeletionTask, Review, Title
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22DeferredDeletion:
+
+    TITLES_URL = '/api/v1/titles/'
+    DELETIONS_URL = '/api/v1/deletions/'
+
+    def test_01_category_deletion(self, client, admin_client, user_client,
+                                  moderator_client):
+        titles, categories, genres = create_titles(admin_client)
+        first_id, second_id = titles[0]['id'], titles[1]['id']
+        for author_client, score in ((user_client, 4), (moderator_client, 8)):
+            review = create_single_review(
+                author_client, first_id, 'Отзыв', score
+            ).json()
+            create_single_comment(
+                author_client, first_id, review['id'], 'Комментарий'
+            )
+        create_single_review(user_client, second_id, 'Отзыв', 6)
+
+        response = admin_client.delete('/api/v1/categories/films/')
+        assert response.status_code == HTTPStatus.ACCEPTED, (
+            'Проверьте, что удаление категории возвращает ответ со '
+            'статусом 202.'
+        )
+        task = response.json()
+        assert task['status'] == DeletionTask.PENDING
+        assert task['model'] == 'reviews.category'
+
+        response = client.get(self.TITLES_URL)
+        assert [title['id'] for title in response.json()['results']] == [
+            second_id
+        ], 'Проверьте, что произведения удаляемой категории скрыты.'
+        assert client.get(
+            f'{self.TITLES_URL}{first_id}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            f'{self.TITLES_URL}{first_id}/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert [
+            title['id'] for title in
+            client.get(f'{self.TITLES_URL}top/').json()['results']
+        ] == [second_id]
+        assert [
+            category['slug'] for category in
+            client.get('/api/v1/categories/').json()['results']
+        ] == ['books']
+        assert Title.objects.filter(pk=first_id).exists()
+
+        call_command('process_deletions', chunk_size=1)
+        assert not Title.objects.filter(pk=first_id).exists()
+        assert not Review.objects.filter(title_id=first_id).exists()
+        assert not Comments.objects.exists(), (
+            'Проверьте, что фоновое удаление удаляет все зависимые записи.'
+        )
+        assert Review.objects.filter(title_id=second_id).count() == 1
+
+        response = admin_client.get(f'{self.DELETIONS_URL}{task["id"]}/')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['status'] == DeletionTask.DONE
+        assert data['finished_at']
+        assert data['deleted_count'] >= 6, (
+            'Проверьте, что задача удаления показывает количество '
+            'удалённых записей.'
+        )
+
+    def test_02_user_deletion_keeps_rating(self, admin_client, user_client,
+                                           moderator_client, user):
+        from reviews.deletion import claim_task, process_chunk
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'Отзыв', 2)
+        for _ in range(2):
+            create_single_comment(
+                moderator_client, title_id, review.json()['id'], 'Ответ'
+            )
+        create_single_review(moderator_client, title_id, 'Отзыв', 8)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert user_client.get(
+            '/api/v1/users/me/'
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удаляемый пользователь не может авторизоваться.'
+        )
+        assert admin_client.get(
+            f'/api/v1/users/{user.username}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+        task = DeletionTask.objects.get()
+        assert claim_task(task)
+        while process_chunk(task, 1):
+            title = Title.objects.get(pk=title_id)
+            reviews = list(Review.objects.filter(title_id=title_id))
+            assert title.reviews_count == len(reviews)
+            assert title.rating == (
+                sum(review.score for review in reviews) / len(reviews)
+            ), (
+                'Проверьте, что рейтинг произведения остаётся верным на '
+                'каждом шаге удаления.'
+            )
+        assert Title.objects.get(pk=title_id).rating == 8
+        assert not Comments.objects.exists()
+        assert not type(user).objects.filter(pk=user.pk).exists()
+
+    def test_03_deletions_permissions(self, client, user_client,
+                                      moderator_client, admin_client):
+        assert client.get(
+            self.DELETIONS_URL
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        for user_client_ in (user_client, moderator_client):
+            assert user_client_.get(
+                self.DELETIONS_URL
+            ).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что `{self.DELETIONS_URL}` доступен только '
+                'администратору.'
+            )
+        assert admin_client.get(
+            self.DELETIONS_URL
+        ).status_code == HTTPStatus.OK
+
+    def test_04_task_claimed_once(self, admin_client, user_client, settings):
+        from reviews.deletion import ClaimLost, claim_task, process_chunk
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        admin_client.delete('/api/v1/categories/films/')
+        task = DeletionTask.objects.get()
+        assert claim_task(task)
+        call_command('process_deletions', chunk_size=1)
+        assert Title.objects.filter(pk=titles[0]['id']).exists(), (
+            'Проверьте, что задачу, захваченную другим обработчиком, '
+            '`process_deletions` не выполняет.'
+        )
+
+        settings.DELETION_CLAIM_TIMEOUT = 0
+        call_command('process_deletions', chunk_size=1)
+        task_after = DeletionTask.objects.get()
+        assert task_after.status == DeletionTask.DONE, (
+            'Проверьте, что задача прервавшегося обработчика снова '
+            'берётся в работу.'
+        )
+        with pytest.raises(ClaimLost):
+            process_chunk(task, 1)
+        assert DeletionTask.objects.get().deleted_count == (
+            task_after.deleted_count
+        ), 'Проверьте, что удалённые записи не учитываются дважды.'
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError
+
+from reviews.models import Review
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23WriteQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_create_queries(self, admin_client, user_client,
+                                      moderator_client, moderator,
+                                      django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        create_single_review(user_client, title_id, 'Первый', 4)
+        # Пользователь, произведение, BEGIN, вставка отзыва, рейтинг,
+        # распределение оценок и таблица лучших произведений.
+        with django_assert_num_queries(7):
+            response = moderator_client.post(
+                url, data={'text': 'Второй', 'score': 8}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == moderator.username, (
+            'Проверьте, что автор отзыва берётся из запроса без обращения '
+            'к БД.'
+        )
+
+        # Пользователь, произведение, BEGIN, вставка отзыва и поиск
+        # отзыва автора после ошибки.
+        with django_assert_num_queries(5):
+            response = moderator_client.post(
+                url, data={'text': 'Повтор', 'score': 1}
+            )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв отклоняется ответом со '
+            'статусом 400.'
+        )
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставили отзыв на это произведение.'
+        ]}
+        assert Review.objects.filter(title_id=title_id).count() == 2
+
+    def test_02_comment_create_queries(self, admin_client, user_client,
+                                       user, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'Отзыв', 4)
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        # Пользователь, отзыв и вставка комментария.
+        with django_assert_num_queries(3):
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+
+    def test_03_author_read_only(self, admin_client, user_client,
+                                 moderator, user):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            data={'text': 'Отзыв', 'score': 5, 'author': moderator.username}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username, (
+            'Проверьте, что автора отзыва нельзя подменить в запросе.'
+        )
+
+    def test_04_other_integrity_errors(self, admin_client, user_client,
+                                       monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+
+        def save(*args, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(Review, 'save', save)
+        with pytest.raises(IntegrityError):
+            create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24DetailQueries:
+
+    REVIEW_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    COMMENT_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    def create_objects(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв', 5
+        ).json()['id']
+        comment_id = create_single_comment(
+            user_client, title_id, review_id, 'Комментарий'
+        ).json()['id']
+        return titles, review_id, comment_id
+
+    def test_01_detail_queries(self, client, admin_client, user_client,
+                               moderator_client, django_assert_num_queries):
+        titles, review_id, comment_id = self.create_objects(
+            admin_client, user_client
+        )
+        title_id = titles[0]['id']
+        review_url = self.REVIEW_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        comment_url = self.COMMENT_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id, comment_id=comment_id
+        )
+        for url in (review_url, comment_url):
+            with django_assert_num_queries(1):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `{url}` выбирает объект одним запросом.'
+            )
+
+        # Пользователь, комментарий с автором и обновление.
+        for author_client in (user_client, moderator_client):
+            with django_assert_num_queries(3):
+                response = author_client.patch(
+                    comment_url, data={'text': 'Изменено'}
+                )
+            assert response.status_code == HTTPStatus.OK
+        # Пользователь, отзыв с автором, BEGIN и обновление.
+        with django_assert_num_queries(4):
+            response = user_client.patch(review_url, data={'text': 'Новый'})
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(4):
+            response = user_client.delete(comment_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+
+    def test_02_detail_requires_full_path(self, client, admin_client,
+                                          user_client):
+        titles, review_id, comment_id = self.create_objects(
+            admin_client, user_client
+        )
+        other_title_id = titles[1]['id']
+        response = client.get(self.REVIEW_URL_TEMPLATE.format(
+            title_id=other_title_id, review_id=review_id
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        for url in (
+            self.COMMENT_URL_TEMPLATE.format(
+                title_id=other_title_id, review_id=review_id,
+                comment_id=comment_id
+            ),
+            f'/api/v1/titles/{other_title_id}/reviews/{review_id}/'
+            'comments/',
+        ):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{url}` учитывает произведение из URL.'
+            )
+        response = user_client.patch(
+            self.COMMENT_URL_TEMPLATE.format(
+                title_id=other_title_id, review_id=review_id,
+                comment_id=comment_id
+            ), data={'text': 'Изменено'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
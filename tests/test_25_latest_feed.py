@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25LatestFeed:
+
+    LATEST_REVIEWS_URL = '/api/v1/reviews/latest/'
+    LATEST_COMMENTS_URL = '/api/v1/comments/latest/'
+
+    def test_01_latest_reviews(self, client, admin_client, user_client,
+                               moderator_client, user, moderator,
+                               django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first = create_single_review(
+            user_client, titles[0]['id'], 'Первый', 4
+        ).json()
+        second = create_single_review(
+            moderator_client, titles[1]['id'], 'Второй', 8
+        ).json()
+
+        with django_assert_num_queries(1):
+            response = client.get(self.LATEST_REVIEWS_URL, {'limit': 1})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.LATEST_REVIEWS_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['results'] == [{
+            'id': second['id'], 'text': 'Второй',
+            'author': moderator.username, 'score': 8,
+            'pub_date': second['pub_date'], 'title': titles[1]['id'],
+            'title_name': titles[1]['name'],
+        }], (
+            f'Проверьте, что `{self.LATEST_REVIEWS_URL}` возвращает новые '
+            'отзывы первыми с названием произведения и автором.'
+        )
+        assert 'count' not in data
+        response = client.get(data['next'])
+        assert [review['id'] for review in response.json()['results']] == [
+            first['id']
+        ], f'Проверьте курсорную пагинацию `{self.LATEST_REVIEWS_URL}`.'
+
+        with django_assert_num_queries(0):
+            cached = client.get(self.LATEST_REVIEWS_URL, {'limit': 1})
+        assert cached.json() == data, (
+            f'Проверьте, что первая страница `{self.LATEST_REVIEWS_URL}` '
+            'кэшируется.'
+        )
+
+        third = create_single_review(
+            admin_client, titles[0]['id'], 'Третий', 6
+        ).json()
+        response = client.get(self.LATEST_REVIEWS_URL, {'limit': 1})
+        assert response.json()['results'][0]['id'] == third['id'], (
+            f'Проверьте, что новый отзыв сбрасывает кэш '
+            f'`{self.LATEST_REVIEWS_URL}`.'
+        )
+
+    def test_02_latest_comments(self, client, admin_client, user_client,
+                                user, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[0]['id'], 'Отзыв', 4
+        ).json()
+        comments = [
+            create_single_comment(
+                user_client, titles[0]['id'], review['id'], text
+            ).json()
+            for text in ('Первый', 'Второй')
+        ]
+        with django_assert_num_queries(1):
+            response = client.get(self.LATEST_COMMENTS_URL)
+        results = response.json()['results']
+        assert [comment['id'] for comment in results] == [
+            comments[1]['id'], comments[0]['id']
+        ], (
+            f'Проверьте, что `{self.LATEST_COMMENTS_URL}` возвращает новые '
+            'комментарии первыми.'
+        )
+        assert results[0]['author'] == user.username
+        assert results[0]['review'] == review['id']
+        assert results[0]['title'] == titles[0]['id']
+        assert results[0]['title_name'] == titles[0]['name']
+
+    def test_03_latest_uses_pub_date_index(self):
+        from api.views import LatestCommentsViewSet, LatestReviewViewSet
+
+        for viewset, index in (
+            (LatestReviewViewSet, 'reviews_review_pub_date'),
+            (LatestCommentsViewSet, 'reviews_comments_pub_date'),
+        ):
+            queryset = viewset.queryset.order_by(*viewset.cursor_ordering)
+            sql, params = queryset[:10].query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = ' '.join(str(row) for row in cursor.fetchall())
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что лента {viewset.__name__} использует '
+                'индекс pub_date без сортировки.'
+            )
@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Comments, Review
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26UserActivity:
+
+    USER_REVIEWS_URL_TEMPLATE = '/api/v1/users/{username}/reviews/'
+    USER_COMMENTS_URL_TEMPLATE = '/api/v1/users/{username}/comments/'
+
+    def create_activity(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews = [
+            create_single_review(
+                user_client, title['id'], 'Отзыв', score
+            ).json()
+            for title, score in zip(titles, (4, 9))
+        ]
+        create_single_review(moderator_client, titles[0]['id'], 'Чужой', 1)
+        comments = [
+            create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'], text
+            ).json()
+            for text in ('Первый', 'Второй')
+        ]
+        return titles, reviews, comments
+
+    def test_01_user_reviews(self, client, admin_client, user_client,
+                             moderator_client, user,
+                             django_assert_num_queries):
+        titles, reviews, _ = self.create_activity(
+            admin_client, user_client, moderator_client
+        )
+        url = self.USER_REVIEWS_URL_TEMPLATE.format(username=user.username)
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что `{url}` недоступен анонимным пользователям.'
+        )
+        with django_assert_num_queries(3):
+            response = moderator_client.get(url, {'limit': 1})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data
+        assert data['results'] == [{
+            'id': reviews[1]['id'], 'text': 'Отзыв', 'score': 9,
+            'pub_date': reviews[1]['pub_date'],
+            'title': {
+                'id': titles[1]['id'], 'name': titles[1]['name'],
+                'year': titles[1]['year'], 'rating': 9.0,
+            },
+        }], (
+            f'Проверьте, что `{url}` возвращает новые отзывы пользователя '
+            'первыми с кратким описанием произведения.'
+        )
+        response = moderator_client.get(data['next'])
+        assert [review['id'] for review in response.json()['results']] == [
+            reviews[0]['id']
+        ], f'Проверьте курсорную пагинацию `{url}`.'
+
+        response = moderator_client.get(
+            self.USER_REVIEWS_URL_TEMPLATE.format(username='unknown')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(
+            self.USER_REVIEWS_URL_TEMPLATE.format(username='unknown')
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что анонимный пользователь не может узнать, '
+            'существует ли пользователь с таким именем.'
+        )
+
+    def test_02_user_comments(self, client, admin_client, user_client,
+                              moderator_client, user):
+        titles, reviews, comments = self.create_activity(
+            admin_client, user_client, moderator_client
+        )
+        url = self.USER_COMMENTS_URL_TEMPLATE.format(username=user.username)
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        results = moderator_client.get(url).json()['results']
+        assert [comment['id'] for comment in results] == [
+            comments[1]['id'], comments[0]['id']
+        ], f'Проверьте, что `{url}` возвращает комментарии пользователя.'
+        assert results[0]['review'] == reviews[0]['id']
+        assert results[0]['title']['name'] == titles[0]['name']
+
+    def test_03_me_activity(self, client, admin_client, user_client,
+                            moderator_client, django_assert_num_queries):
+        titles, reviews, comments = self.create_activity(
+            admin_client, user_client, moderator_client
+        )
+        for url, expected in (
+            ('/api/v1/users/me/reviews/', reviews),
+            ('/api/v1/users/me/comments/', comments),
+        ):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            with django_assert_num_queries(2):
+                response = user_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert [item['id'] for item in response.json()['results']] == [
+                item['id'] for item in reversed(expected)
+            ], f'Проверьте, что `{url}` возвращает записи пользователя.'
+
+    def test_04_activity_uses_author_index(self, user):
+        for model, index in (
+            (Review, 'review_author_pub_date_idx'),
+            (Comments, 'comment_author_pub_date_idx'),
+        ):
+            queryset = model.objects.filter(author=user).order_by(
+                '-pub_date', '-id'
+            )
+            sql, params = queryset[:10].query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = ' '.join(str(row) for row in cursor.fetchall())
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что записи пользователя выбираются по индексу '
+                f'{index}.'
+            )
@@ -0,0 +1,213 @@
+import sqlite3
+from contextlib import closing
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews import writebehind
+from reviews.models import Comments, Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def write_behind(settings, tmp_path):
+    settings.WRITE_BEHIND_ENABLED = True
+    settings.WRITE_BEHIND_QUEUE_PATH = tmp_path / 'write_queue.sqlite3'
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('write_behind')
+class Test27WriteBehind:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    QUEUE_URL = '/api/v1/write-queue/'
+    DRAIN_URL = '/api/v1/write-queue/drain/'
+
+    def test_01_review_is_queued(self, admin_client, user_client,
+                                 moderator_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 8})
+        assert response.status_code == HTTPStatus.ACCEPTED, (
+            'Проверьте, что при включённой отложенной записи POST-запрос к '
+            f'`{url}` возвращает ответ со статусом 202.'
+        )
+        entry_id = response.json()['id']
+        assert response.json()['status'] == 'pending'
+        assert not Review.objects.exists(), (
+            'Проверьте, что отзыв сохраняется в БД только при переносе '
+            'очереди.'
+        )
+        response = user_client.post(url, data={'text': 'Повтор', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв на произведение отклоняется до '
+            'постановки в очередь.'
+        )
+
+        response = moderator_client.post(self.DRAIN_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.post(self.DRAIN_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'saved': 1, 'failed': 0}
+        response = user_client.post(url, data={'text': 'Повтор', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отзыв на произведение, у которого уже есть '
+            'отзыв автора, не ставится в очередь.'
+        )
+        review = Review.objects.get()
+        assert (review.author, review.text, review.score) == (
+            user, 'Отзыв', 8
+        )
+        assert Title.objects.get(pk=title_id).rating == 8, (
+            'Проверьте, что перенос отзыва из очереди обновляет рейтинг.'
+        )
+
+        entry = user_client.get(f'{self.QUEUE_URL}{entry_id}/').json()
+        assert entry['status'] == 'done'
+        assert entry['object_id'] == review.pk
+        response = moderator_client.get(f'{self.QUEUE_URL}{entry_id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что элемент очереди виден только его автору и '
+            'администратору.'
+        )
+        assert admin_client.get(self.QUEUE_URL).json() == {
+            'pending': 0, 'processing': 0, 'failed': 0, 'done': 1
+        }
+
+    def test_02_comment_is_queued(self, admin_client, user_client,
+                                  settings):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        settings.WRITE_BEHIND_ENABLED = False
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв', 5
+        ).json()['id']
+        settings.WRITE_BEHIND_ENABLED = True
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        for text in ('Первый', 'Второй'):
+            response = user_client.post(url, data={'text': text})
+            assert response.status_code == HTTPStatus.ACCEPTED
+        assert admin_client.get(self.QUEUE_URL).json()['pending'] == 2
+
+        call_command('drain_write_queue', batch_size=1)
+        assert list(
+            Comments.objects.order_by('id').values_list('text', 'review_id')
+        ) == [('Первый', review_id), ('Второй', review_id)], (
+            'Проверьте, что команда `drain_write_queue` переносит '
+            'комментарии из очереди.'
+        )
+
+    def test_03_validation_is_synchronous(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 11})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректные данные отклоняются до постановки '
+            'в очередь.'
+        )
+        assert user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=999),
+            data={'text': 'Отзыв', 'score': 5}
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert admin_client.get(self.QUEUE_URL).json()['pending'] == 0
+
+    def test_04_deleted_title_fails(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            data={'text': 'Отзыв', 'score': 3}
+        )
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        call_command('process_deletions')
+        response = admin_client.post(self.DRAIN_URL)
+        assert response.json() == {'saved': 0, 'failed': 1}, (
+            'Проверьте, что отзыв на удалённое произведение помечается '
+            'ошибкой при переносе очереди.'
+        )
+        assert not Review.objects.exists()
+
+    def create_review(self, admin_client, user_client, settings):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        settings.WRITE_BEHIND_ENABLED = False
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв', 5
+        ).json()['id']
+        settings.WRITE_BEHIND_ENABLED = True
+        return self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+
+    def test_05_concurrent_drains(self, admin_client, user_client,
+                                  settings, monkeypatch):
+        url = self.create_review(admin_client, user_client, settings)
+        for text in ('Первый', 'Второй'):
+            user_client.post(url, data={'text': text})
+        save_batch = writebehind.save_batch
+        nested = []
+
+        def save_batch_with_drain(rows):
+            # Второй перенос запускается, пока первый сохраняет пачку.
+            if not nested:
+                nested.append(writebehind.drain(10))
+            return save_batch(rows)
+
+        monkeypatch.setattr(writebehind, 'save_batch', save_batch_with_drain)
+        assert writebehind.drain(10) == (2, 0)
+        assert nested == [(0, 0)], (
+            'Проверьте, что одновременный перенос не берёт элементы, '
+            'захваченные другим переносом.'
+        )
+        assert Comments.objects.count() == 2
+
+    def test_06_api_drains_one_batch(self, admin_client, user_client,
+                                     settings):
+        url = self.create_review(admin_client, user_client, settings)
+        settings.WRITE_BEHIND_BATCH_SIZE = 2
+        for number in range(3):
+            user_client.post(url, data={'text': f'Комментарий {number}'})
+        response = admin_client.post(self.DRAIN_URL)
+        assert response.json() == {'saved': 2, 'failed': 0}, (
+            f'Проверьте, что `{self.DRAIN_URL}` переносит одну пачку за '
+            'вызов.'
+        )
+        assert admin_client.get(self.QUEUE_URL).json()['pending'] == 1
+        assert admin_client.post(self.DRAIN_URL).json()['saved'] == 1
+
+    def test_07_stale_claim_is_retried(self, admin_client, user_client,
+                                       settings):
+        url = self.create_review(admin_client, user_client, settings)
+        user_client.post(url, data={'text': 'Комментарий'})
+        writebehind.claim_batch(writebehind.connect(), 10)
+        assert writebehind.drain(10) == (0, 0)
+        settings.WRITE_BEHIND_CLAIM_TIMEOUT = 0
+        assert writebehind.drain(10) == (1, 0), (
+            'Проверьте, что элементы прервавшегося переноса переносятся '
+            'после WRITE_BEHIND_CLAIM_TIMEOUT.'
+        )
+
+    def test_08_failed_claim_releases_lock(self, admin_client, user_client,
+                                           settings):
+        url = self.create_review(admin_client, user_client, settings)
+        user_client.post(url, data={'text': 'Комментарий'})
+        settings.WRITE_BEHIND_CLAIM_TIMEOUT = 'сбой'
+        with pytest.raises(TypeError):
+            writebehind.drain(10)
+        with closing(sqlite3.connect(
+            settings.WRITE_BEHIND_QUEUE_PATH, timeout=0
+        )) as other:
+            other.execute('BEGIN IMMEDIATE')
+            other.execute('ROLLBACK')
+        settings.WRITE_BEHIND_CLAIM_TIMEOUT = 300
+        assert writebehind.drain(10) == (1, 0), (
+            'Проверьте, что ошибка при захвате пачки не оставляет '
+            'блокировку записи в файле очереди.'
+        )
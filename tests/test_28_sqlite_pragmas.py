@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SqlitePragmas:
+
+    def get_pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_pragmas_applied(self, tmp_path):
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+            alias='pragmas'
+        )
+        try:
+            assert self.get_pragma(wrapper, 'journal_mode') == 'wal', (
+                'Проверьте, что новое соединение с SQLite переводится в '
+                'режим WAL.'
+            )
+            assert self.get_pragma(wrapper, 'synchronous') == 1
+            assert self.get_pragma(wrapper, 'busy_timeout') == 5000, (
+                'Проверьте, что соединение ждёт блокировку записи, а не '
+                'падает с ошибкой.'
+            )
+            assert self.get_pragma(wrapper, 'cache_size') == -65536
+            assert self.get_pragma(wrapper, 'mmap_size') == 268435456
+            assert self.get_pragma(wrapper, 'temp_store') == 2
+        finally:
+            wrapper.close()
+
+    def test_02_pragmas_from_settings(self, settings, tmp_path):
+        settings.SQLITE_PRAGMAS = {'busy_timeout': 100}
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+            alias='pragmas'
+        )
+        try:
+            assert self.get_pragma(wrapper, 'busy_timeout') == 100
+            assert self.get_pragma(wrapper, 'journal_mode') == 'delete', (
+                'Проверьте, что параметры SQLite берутся из настройки '
+                'SQLITE_PRAGMAS.'
+            )
+        finally:
+            wrapper.close()
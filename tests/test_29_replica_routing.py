@@ -0,0 +1,160 @@
+import multiprocessing
+import sqlite3
+from contextlib import closing
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import SystemCheckError
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from api import slugs
+from api.pagination import OffsetOrCursorPagination
+from api_yamdb.db import replica_alias
+from api_yamdb.middleware import ReplicaRoutingMiddleware
+from tests.utils import create_titles
+
+
+def write_in_other_process():
+    """Запрос на запись, принятый другим процессом."""
+    middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+    middleware(RequestFactory().post('/api/v1/titles/'))
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+
+
+@pytest.fixture
+def no_count_cache(monkeypatch):
+    """Без кэша количества все запросы страницы идут в выбранную БД."""
+    monkeypatch.setattr(OffsetOrCursorPagination, 'count_cache_timeout', 0)
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class Test29ReplicaRouting:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_aliases(self, client, url):
+        """Псевдонимы БД, к которым обращался запрос."""
+        with CaptureQueriesContext(connections['default']) as default, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return {
+            alias for alias, context in (
+                ('default', default), ('replica', replica)
+            ) if len(context)
+        }
+
+    @pytest.mark.usefixtures('replica', 'no_count_cache')
+    def test_01_reads_go_to_replica(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        cache.clear()
+        for url in (
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/',
+        ):
+            assert self.get_aliases(client, url) == {'replica'}, (
+                f'Проверьте, что GET-запрос к `{url}` читает из реплики.'
+            )
+        assert self.get_aliases(user_client, '/api/v1/users/me/') == {
+            'default'
+        }, 'Проверьте, что вне каталога чтение идёт в основную БД.'
+
+    @pytest.mark.usefixtures('replica', 'no_count_cache')
+    def test_02_read_your_writes(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        cache.clear()
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_aliases(user_client, url) == {'default'}, (
+            'Проверьте, что после записи клиент читает из основной БД.'
+        )
+        assert self.get_aliases(client, url) == {'replica'}, (
+            'Проверьте, что запись одного клиента не переводит остальных '
+            'на основную БД.'
+        )
+        cache.clear()
+        assert self.get_aliases(user_client, url) == {'replica'}, (
+            'Проверьте, что привязка к основной БД ограничена по времени.'
+        )
+
+    def test_03_no_replicas(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.get_aliases(client, self.TITLES_URL) == {'default'}
+
+    def test_04_sync_replicas(self, admin_client, tmp_path, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        path = tmp_path / 'replica.sqlite3'
+        monkeypatch.setitem(
+            connections['replica'].settings_dict, 'NAME', str(path)
+        )
+        call_command('sync_replicas', database=['replica'])
+        with closing(sqlite3.connect(path)) as replica:
+            count, = replica.execute(
+                'SELECT COUNT(*) FROM reviews_title'
+            ).fetchone()
+        assert count == len(titles), (
+            'Проверьте, что команда `sync_replicas` копирует основную БД в '
+            'файл реплики.'
+        )
+
+    @pytest.mark.usefixtures('replica')
+    def test_05_sticky_across_processes(self, client, admin_client):
+        create_titles(admin_client)
+        cache.clear()
+        process = multiprocessing.get_context('fork').Process(
+            target=write_in_other_process
+        )
+        process.start()
+        process.join()
+        assert self.get_aliases(client, self.TITLES_URL) == {'default'}, (
+            'Проверьте, что привязка к основной БД после записи хранится '
+            'в кэше, общем для всех процессов.'
+        )
+
+    @pytest.mark.usefixtures('replica')
+    def test_06_process_local_cache_error(self, settings):
+        call_command('check')
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        with pytest.raises(SystemCheckError, match='api.E002'):
+            call_command('check')
+
+    @pytest.mark.usefixtures('replica')
+    def test_07_caches_filled_from_default(self, client, admin_client):
+        create_titles(admin_client)
+        cache.clear()
+        for url in ('/api/v1/reviews/latest/', f'{self.TITLES_URL}facets/'):
+            assert self.get_aliases(client, url) == {'default'}, (
+                f'Проверьте, что кэш `{url}` заполняется из основной БД, '
+                'а не из отстающей реплики.'
+            )
+        with CaptureQueriesContext(connections['default']) as default:
+            client.get(self.TITLES_URL)
+        assert len(default) == 1, (
+            'Проверьте, что количество записей для кэша считается в '
+            'основной БД, а страница читается из реплики.'
+        )
+        assert self.get_aliases(client, self.TITLES_URL) == {'replica'}
+
+        token = replica_alias.set('replica')
+        try:
+            slugs.categories._state = (None, 0, {})
+            with CaptureQueriesContext(connections['default']) as default:
+                assert slugs.categories.get('films') is not None
+        finally:
+            replica_alias.reset(token)
+        assert len(default) == 1, (
+            'Проверьте, что справочник слагов загружается из основной БД.'
+        )
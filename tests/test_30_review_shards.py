@@ -0,0 +1,298 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError, SystemCheckError
+from django.db import connections
+
+from reviews import shards
+from reviews.models import Comments, Review, Title
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+SHARDS = ['shard_0', 'shard_1']
+
+
+@pytest.fixture
+def sharded(settings):
+    settings.REVIEW_SHARDS = SHARDS
+
+
+@pytest.fixture(autouse=True)
+def query_budget_log(settings):
+    # Бюджеты запросов рассчитаны на хранение отзывов в default.
+    settings.QUERY_BUDGET_MODE = 'log'
+
+
+@pytest.mark.django_db(
+    transaction=True, databases=['default', *SHARDS]
+)
+class Test30ReviewShards:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def create_objects(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews = {}
+        for title in titles:
+            reviews[title['id']] = [
+                create_single_review(
+                    client, title['id'], 'Отзыв', score
+                ).json()
+                for client, score in ((user_client, 4), (moderator_client, 8))
+            ]
+        title_id = titles[0]['id']
+        comment = create_single_comment(
+            user_client, title_id, reviews[title_id][0]['id'], 'Комментарий'
+        ).json()
+        return titles, reviews, comment
+
+    def get_shard_ids(self, model, alias):
+        return set(model.objects.using(alias).values_list('pk', flat=True))
+
+    def get_foreign_keys(self, alias, table):
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, table
+            )
+        return {
+            constraint['foreign_key'][0]
+            for constraint in constraints.values()
+            if constraint['foreign_key']
+        }
+
+    def test_01_shard_schema(self):
+        for alias in SHARDS:
+            tables = connections[alias].introspection.table_names()
+            assert {'reviews_review', 'reviews_comments'} <= set(tables)
+            assert 'reviews_title' not in tables, (
+                'Проверьте, что в шардах создаются только таблицы отзывов '
+                'и комментариев.'
+            )
+            assert self.get_foreign_keys(alias, 'reviews_review') == set(), (
+                'Проверьте, что отзывы в шардах хранятся без внешних ключей '
+                'на произведения и пользователей.'
+            )
+        assert self.get_foreign_keys('default', 'reviews_review') == {
+            'reviews_title', 'users_dbuser'
+        }, (
+            'Проверьте, что в default у отзывов остаются внешние ключи.'
+        )
+        assert self.get_foreign_keys('default', 'reviews_comments') == {
+            'reviews_review', 'users_dbuser'
+        }
+
+    @pytest.mark.usefixtures('sharded')
+    def test_02_reviews_routed_by_title(self, client, admin_client,
+                                        user_client, moderator_client, user):
+        titles, reviews, comment = self.create_objects(
+            admin_client, user_client, moderator_client
+        )
+        assert not Review.objects.using('default').exists(), (
+            'Проверьте, что при включённых шардах отзывы не сохраняются в '
+            'default.'
+        )
+        for title in titles:
+            shard = SHARDS[title['id'] % len(SHARDS)]
+            assert self.get_shard_ids(Review, shard) >= {
+                review['id'] for review in reviews[title['id']]
+            }, 'Проверьте, что отзыв сохраняется в шард его произведения.'
+            url = self.REVIEWS_URL_TEMPLATE.format(title_id=title['id'])
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert [
+                review['author'] for review in response.json()['results']
+            ] == ['TestUser', 'TestModerator']
+            assert Title.objects.get(pk=title['id']).rating == 6
+
+        all_ids = [
+            review['id'] for items in reviews.values() for review in items
+        ]
+        assert len(set(all_ids)) == len(all_ids), (
+            'Проверьте, что id отзывов не повторяются в разных шардах.'
+        )
+        title_id = titles[0]['id']
+        shard = SHARDS[title_id % len(SHARDS)]
+        assert self.get_shard_ids(Comments, shard) == {comment['id']}
+        review_id = reviews[title_id][0]['id']
+        url = (
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)}'
+            f'{review_id}/'
+        )
+        response = client.get(f'{url}comments/{comment["id"]}/')
+        assert response.json()['author'] == user.username
+        other_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        assert client.get(
+            f'{other_url}{review_id}/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв ищется в шарде произведения из URL.'
+        )
+
+        response = user_client.patch(url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert Title.objects.get(pk=title_id).rating == 9
+        response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not Comments.objects.using(shard).exists()
+        assert Title.objects.get(pk=title_id).rating == 8
+
+    @pytest.mark.usefixtures('sharded')
+    def test_03_deferred_deletion(self, admin_client, user_client,
+                                  moderator_client, moderator):
+        titles, reviews, _ = self.create_objects(
+            admin_client, user_client, moderator_client
+        )
+        title_id = titles[0]['id']
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        call_command('process_deletions')
+        shard = SHARDS[title_id % len(SHARDS)]
+        assert not Review.objects.using(shard).filter(
+            title_id=title_id
+        ).exists(), (
+            'Проверьте, что удаление произведения удаляет его отзывы из '
+            'шарда.'
+        )
+        assert not Comments.objects.using(shard).exists()
+
+        admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        call_command('process_deletions')
+        assert not any(
+            Review.objects.using(alias).filter(author=moderator).exists()
+            for alias in SHARDS
+        )
+
+    def test_04_reshard(self, admin_client, user_client, moderator_client,
+                        settings, client):
+        titles, reviews, comment = self.create_objects(
+            admin_client, user_client, moderator_client
+        )
+        ids = self.get_shard_ids(Review, 'default')
+        settings.REVIEW_SHARDS = SHARDS
+        call_command('reshard_reviews', chunk_size=1)
+        assert not Review.objects.using('default').exists()
+        assert not Comments.objects.using('default').exists()
+        assert (
+            self.get_shard_ids(Review, 'shard_0')
+            | self.get_shard_ids(Review, 'shard_1')
+        ) == ids, (
+            'Проверьте, что команда `reshard_reviews` переносит отзывы в '
+            'шарды без изменения id.'
+        )
+        for title in titles:
+            response = client.get(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title['id'])
+            )
+            assert [
+                review['id'] for review in response.json()['results']
+            ] == [review['id'] for review in reviews[title['id']]]
+        assert Title.objects.get(pk=titles[0]['id']).rating == 6, (
+            'Проверьте, что перенос отзывов не меняет рейтинг.'
+        )
+
+        settings.REVIEW_SHARDS = ['shard_1']
+        call_command('reshard_reviews')
+        assert self.get_shard_ids(Review, 'shard_1') == ids
+        assert self.get_shard_ids(Comments, 'shard_1') == {comment['id']}
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'Новый', 5
+        ).json()
+        assert review['id'] not in ids
+
+    @pytest.mark.usefixtures('sharded')
+    def test_05_rebuild_ratings(self, admin_client, user_client,
+                                moderator_client):
+        titles, _, _ = self.create_objects(
+            admin_client, user_client, moderator_client
+        )
+        Title.objects.update(score_sum=0, reviews_count=0, rating=None)
+        call_command('rebuild_ratings')
+        assert list(Title.objects.order_by('pk').values_list(
+            'reviews_count', 'rating'
+        )) == [(2, 6.0)] * len(titles), (
+            'Проверьте, что команда `rebuild_ratings` считает рейтинги по '
+            'отзывам во всех шардах.'
+        )
+
+    def test_06_reshard_conflict(self, admin_client, user_client,
+                                 moderator_client, settings):
+        self.create_objects(admin_client, user_client, moderator_client)
+        review = Review.objects.using('default').order_by('pk').first()
+        target = SHARDS[review.title_id % len(SHARDS)]
+        Review.objects.using(target).bulk_create([Review(
+            pk=review.pk, title_id=review.title_id,
+            author_id=review.author_id, text='Другой отзыв', score=1
+        )])
+        settings.REVIEW_SHARDS = SHARDS
+        with pytest.raises(CommandError, match=str(review.pk)):
+            call_command('reshard_reviews')
+        assert Review.objects.using('default').filter(
+            pk=review.pk, text=review.text
+        ).exists(), (
+            'Проверьте, что `reshard_reviews` не удаляет отзыв, если в '
+            'шарде уже есть другой отзыв с тем же id.'
+        )
+
+    def test_07_sequence_after_shards_disabled(self, admin_client,
+                                               user_client, moderator_client,
+                                               settings, monkeypatch):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        settings.REVIEW_SHARD_ID_BLOCK_SIZE = 2
+        settings.REVIEW_SHARDS = SHARDS
+        create_single_review(user_client, title_id, 'Отзыв', 5)
+
+        settings.REVIEW_SHARDS = []
+        call_command('reshard_reviews')
+        ids = {
+            create_single_review(
+                admin_client, title['id'], 'Отзыв', 5
+            ).json()['id']
+            for title in titles
+        }
+        settings.REVIEW_SHARDS = SHARDS
+        call_command('reshard_reviews')
+        # Новый процесс начинает без зарезервированного блока id.
+        monkeypatch.setattr(shards, 'id_blocks', {})
+        response = create_single_review(
+            moderator_client, title_id, 'Отзыв', 5
+        )
+        assert response.json()['id'] > max(ids), (
+            'Проверьте, что после повторного включения шардов новые id не '
+            'совпадают с id, выданными default.'
+        )
+
+    @pytest.mark.usefixtures('sharded')
+    def test_08_unsharded_paths_refused(self, admin_client, user_client,
+                                        moderator_client, user, settings):
+        self.create_objects(admin_client, user_client, moderator_client)
+        for url in (
+            '/api/v1/reviews/latest/',
+            '/api/v1/comments/latest/',
+            f'/api/v1/users/{user.username}/reviews/',
+            '/api/v1/users/me/comments/',
+            '/api/v1/export/reviews/',
+        ):
+            assert admin_client.get(url).status_code == (
+                HTTPStatus.NOT_IMPLEMENTED
+            ), (
+                f'Проверьте, что при включённых шардах `{url}` отвечает '
+                '501, а не возвращает неполные данные.'
+            )
+        assert admin_client.post(
+            '/api/v1/write-queue/drain/'
+        ).status_code == HTTPStatus.NOT_IMPLEMENTED
+        assert admin_client.get(
+            '/api/v1/export/titles/'
+        ).status_code == HTTPStatus.OK
+        for command in ('add_database', 'drain_write_queue'):
+            with pytest.raises(CommandError):
+                call_command(command)
+        with pytest.raises(shards.ShardRoutingError):
+            Review.objects.count()
+
+        settings.WRITE_BEHIND_ENABLED = True
+        with pytest.raises(SystemCheckError, match='api.E003'):
+            call_command('check')
@@ -0,0 +1,253 @@
+import json
+import os
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from api.views import TitleViewSet
+from api_yamdb.middleware import QueryBudgetExceeded
+from reviews import writebehind
+from reviews.models import DeletionTask
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+SNAPSHOTS_PATH = Path(__file__).with_name('query_snapshots.json')
+IGNORED_METHODS = ('head', 'options')
+
+
+def get_route_keys(patterns=None):
+    """Пары «МЕТОД имя маршрута» всех представлений DRF проекта."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    keys = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            keys |= get_route_keys(pattern.url_patterns)
+            continue
+        view_class = getattr(pattern.callback, 'cls', None)
+        if view_class is None:
+            continue
+        actions = getattr(pattern.callback, 'actions', None)
+        methods = actions.keys() if actions else [
+            method for method in view_class.http_method_names
+            if hasattr(view_class, method)
+        ]
+        keys |= {
+            f'{method.upper()} {pattern.name}' for method in methods
+            if method in view_class.http_method_names
+            and method not in IGNORED_METHODS
+        }
+    return keys
+
+
+@pytest.fixture
+def write_queue(settings, tmp_path):
+    settings.WRITE_BEHIND_QUEUE_PATH = tmp_path / 'write_queue.sqlite3'
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('write_queue')
+class Test31QuerySnapshots:
+
+    def create_objects(self, admin_client, user_client, user):
+        titles, categories, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв', 5
+        ).json()['id']
+        comment_id = create_single_comment(
+            user_client, title_id, review_id, 'Комментарий'
+        ).json()['id']
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Прочее', 'slug': 'misc'}
+        )
+        admin_client.delete('/api/v1/categories/misc/')
+        entry_id = writebehind.enqueue('comment', user.pk, {
+            'text': 'Из очереди', 'review_id': review_id,
+            'author_id': user.pk,
+        })
+        return {
+            'title': title_id,
+            'other_title': titles[1]['id'],
+            'review': review_id,
+            'comment': comment_id,
+            'category': categories[0]['slug'],
+            'genre': genres[0]['slug'],
+            'task': DeletionTask.objects.get().pk,
+            'entry': entry_id,
+            'username': user.username,
+            'code': default_token_generator.make_token(user),
+        }
+
+    def get_scenarios(self, objects):
+        """Запросы (метод, имя маршрута, URL, клиент, данные).
+
+        Изменяющие и удаляющие запросы идут в конце, чтобы не влиять на
+        данные остальных.
+        """
+        title = f'/api/v1/titles/{objects["title"]}/'
+        reviews = f'{title}reviews/'
+        review = f'{reviews}{objects["review"]}/'
+        comments = f'{review}comments/'
+        comment = f'{comments}{objects["comment"]}/'
+        category = f'/api/v1/categories/{objects["category"]}/'
+        genre = f'/api/v1/genres/{objects["genre"]}/'
+        user = f'/api/v1/users/{objects["username"]}/'
+        ids = f'{objects["title"]},{objects["other_title"]}'
+        return [
+            ('GET', 'api-root', '/api/v1/', 'client', None),
+            ('GET', 'categories-list', '/api/v1/categories/', 'client',
+             None),
+            ('GET', 'genres-list', '/api/v1/genres/', 'client', None),
+            ('GET', 'titles-list', '/api/v1/titles/', 'client', None),
+            ('GET', 'titles-detail', title, 'client', None),
+            ('GET', 'titles-top', '/api/v1/titles/top/', 'client', None),
+            ('GET', 'titles-facets', '/api/v1/titles/facets/', 'client',
+             None),
+            ('GET', 'titles-histograms', '/api/v1/titles/histograms/',
+             'client', {'ids': ids}),
+            ('GET', 'reviews-list', reviews, 'client', None),
+            ('GET', 'reviews-detail', review, 'client', None),
+            ('GET', 'comments-list', comments, 'client', None),
+            ('GET', 'comments-detail', comment, 'client', None),
+            ('GET', 'latest-reviews-list', '/api/v1/reviews/latest/',
+             'client', None),
+            ('GET', 'latest-comments-list', '/api/v1/comments/latest/',
+             'client', None),
+            ('GET', 'deletions-list', '/api/v1/deletions/', 'admin', None),
+            ('GET', 'deletions-detail',
+             f'/api/v1/deletions/{objects["task"]}/', 'admin', None),
+            ('GET', 'write-queue-list', '/api/v1/write-queue/', 'admin',
+             None),
+            ('GET', 'write-queue-detail',
+             f'/api/v1/write-queue/{objects["entry"]}/', 'user', None),
+            ('GET', 'users-list', '/api/v1/users/', 'admin', None),
+            ('GET', 'users-detail', user, 'admin', None),
+            ('GET', 'users-me', '/api/v1/users/me/', 'user', None),
+            ('GET', 'users-me-reviews', '/api/v1/users/me/reviews/', 'user',
+             None),
+            ('GET', 'users-me-comments', '/api/v1/users/me/comments/',
+             'user', None),
+            ('GET', 'users-reviews', f'{user}reviews/', 'moderator', None),
+            ('GET', 'users-comments', f'{user}comments/', 'moderator',
+             None),
+            ('GET', 'export', '/api/v1/export/titles/', 'admin', None),
+            ('POST', 'signup', '/api/v1/auth/signup/', 'client',
+             {'username': 'NewUser', 'email': 'newuser@yamdb.fake'}),
+            ('POST', 'token', '/api/v1/auth/token/', 'client',
+             {'username': objects['username'],
+              'confirmation_code': objects['code']}),
+            ('POST', 'categories-list', '/api/v1/categories/', 'admin',
+             {'name': 'Игры', 'slug': 'games'}),
+            ('POST', 'genres-list', '/api/v1/genres/', 'admin',
+             {'name': 'Триллер', 'slug': 'thriller'}),
+            ('POST', 'titles-list', '/api/v1/titles/', 'admin',
+             {'name': 'Чужой', 'year': 1979, 'genre': ['horror', 'drama'],
+              'category': 'films'}),
+            ('POST', 'titles-bulk', '/api/v1/titles/bulk/', 'admin',
+             [{'name': f'Произведение {number}', 'year': 1990 + number,
+               'genre': ['comedy'], 'category': 'books'}
+              for number in range(3)]),
+            ('POST', 'reviews-list', reviews, 'moderator',
+             {'text': 'Второй отзыв', 'score': 9}),
+            ('POST', 'comments-list', comments, 'moderator',
+             {'text': 'Ответ'}),
+            ('POST', 'users-list', '/api/v1/users/', 'admin',
+             {'username': 'Created', 'email': 'created@yamdb.fake'}),
+            ('POST', 'write-queue-drain', '/api/v1/write-queue/drain/',
+             'admin', None),
+            ('PATCH', 'titles-detail', title, 'admin',
+             {'name': 'Терминатор 2', 'genre': ['comedy']}),
+            ('PATCH', 'reviews-detail', review, 'user', {'score': 7}),
+            ('PATCH', 'comments-detail', comment, 'user',
+             {'text': 'Исправлено'}),
+            ('PATCH', 'users-detail', user, 'admin', {'bio': 'Новое'}),
+            ('PATCH', 'users-me', '/api/v1/users/me/', 'user',
+             {'first_name': 'Тест'}),
+            ('DELETE', 'comments-detail', comment, 'user', None),
+            ('DELETE', 'reviews-detail', review, 'user', None),
+            ('DELETE', 'titles-detail', title, 'admin', None),
+            ('DELETE', 'categories-detail', category, 'admin', None),
+            ('DELETE', 'genres-detail', genre, 'admin', None),
+            ('DELETE', 'users-detail', '/api/v1/users/Created/', 'admin',
+             None),
+        ]
+
+    def count_queries(self, client, method, url, data):
+        """Число запросов к БД вместе с потоковым телом ответа."""
+        if method == 'GET':
+            request_kwargs = {'data': data}
+        else:
+            request_kwargs = {'data': data, 'format': 'json'}
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method.lower())(url, **request_kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        assert response.status_code < HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что {method}-запрос к `{url}` выполняется успешно.'
+        )
+        return len(context)
+
+    def test_01_query_counts(self, admin_client, moderator_client,
+                             user_client, user):
+        objects = self.create_objects(admin_client, user_client, user)
+        clients = {
+            'client': APIClient(),
+            'admin': admin_client,
+            'moderator': moderator_client,
+            'user': user_client,
+        }
+        counts = {}
+        for method, name, url, client, data in self.get_scenarios(objects):
+            counts[f'{method} {name}'] = self.count_queries(
+                clients[client], method, url, data
+            )
+        assert set(counts) == get_route_keys(), (
+            'Проверьте, что снимок числа запросов покрывает все маршруты '
+            'API.'
+        )
+
+        if os.environ.get('QUERY_SNAPSHOT_UPDATE'):
+            SNAPSHOTS_PATH.write_text(
+                json.dumps(counts, indent=4, sort_keys=True) + '\n'
+            )
+        snapshots = json.loads(SNAPSHOTS_PATH.read_text())
+        grown = {
+            key: (snapshots.get(key), count)
+            for key, count in counts.items()
+            if key not in snapshots or count > snapshots[key]
+        }
+        assert not grown, (
+            'Число SQL-запросов выросло по сравнению со снимком '
+            f'`{SNAPSHOTS_PATH.name}` (было, стало): {grown}. Если рост '
+            'ожидаем, обновите снимок с переменной окружения '
+            'QUERY_SNAPSHOT_UPDATE=1.'
+        )
+
+    def test_02_no_stale_snapshots(self):
+        snapshots = json.loads(SNAPSHOTS_PATH.read_text())
+        assert set(snapshots) == get_route_keys(), (
+            f'Проверьте, что в `{SNAPSHOTS_PATH.name}` нет маршрутов, '
+            'которых больше нет в API.'
+        )
+
+    def test_03_budget_exceeded(self, client, admin_client, settings,
+                                monkeypatch, caplog):
+        create_titles(admin_client)
+        monkeypatch.setattr(TitleViewSet, 'query_budgets', {'list': 1})
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/api/v1/titles/')
+
+        settings.QUERY_BUDGET_MODE = 'log'
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'TitleViewSet.list' in caplog.text, (
+            'Проверьте, что в режиме QUERY_BUDGET_MODE = "log" превышение '
+            'бюджета запросов пишется в лог, а ответ не меняется.'
+        )
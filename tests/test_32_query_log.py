@@ -0,0 +1,95 @@
+import logging
+from io import StringIO
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import call_command
+
+from api_yamdb import querylog
+from tests.utils import create_titles
+
+
+@pytest.fixture
+def query_log(settings, tmp_path, monkeypatch):
+    settings.QUERY_LOG_ENABLED = True
+    settings.QUERY_LOG_PATH = tmp_path / 'query_log.sqlite3'
+    monkeypatch.setattr(
+        logging.getLogger('api_yamdb.querylog'), 'handlers', []
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32QueryLog:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_fingerprint(self):
+        first = querylog.get_fingerprint(
+            'SELECT "id" FROM "reviews_title" WHERE "name" = \'Чужой\' '
+            'AND "id" IN (%s, %s, %s) LIMIT 21'
+        )
+        second = querylog.get_fingerprint(
+            'SELECT "id"  FROM "reviews_title"\nWHERE "name" = \'It\'\'s\' '
+            'AND "id" IN (%s) LIMIT 5'
+        )
+        assert first == second == (
+            'SELECT "id" FROM "reviews_title" WHERE "name" = ? '
+            'AND "id" IN (...) LIMIT ?'
+        ), (
+            'Проверьте, что отпечаток запроса не зависит от литералов, '
+            'числа параметров и пробелов.'
+        )
+        assert querylog.get_fingerprint(
+            'INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'
+        ) == 'INSERT INTO "t" ("a", "b") VALUES (...)'
+
+    @pytest.mark.usefixtures('query_log')
+    def test_02_stats_by_fingerprint_and_route(self, client, admin_client):
+        create_titles(admin_client)
+        for year in (1984, 1988):
+            client.get(self.TITLES_URL, {'year': year})
+        routes = {item['route']: item for item in querylog.get_top('route')}
+        assert routes['GET titles-list']['count'] == 6, (
+            'Проверьте, что замеры SQL-запросов сохраняются с маршрутом '
+            'запроса к API.'
+        )
+        assert 'POST titles-list' in routes
+        stats = querylog.get_top(route='GET titles-list', order='count')
+        assert [item['count'] for item in stats] == [2, 2, 2], (
+            'Проверьте, что одинаковые запросы с разными данными '
+            'группируются по отпечатку.'
+        )
+        for item in stats:
+            assert item['p50'] <= item['p95'] <= item['p99'] <= item['total']
+
+        output = StringIO()
+        call_command('top_queries', group='route', limit=1, stdout=output)
+        assert 'titles-list' in output.getvalue(), (
+            'Проверьте, что команда `top_queries` выводит самые затратные '
+            'маршруты.'
+        )
+        call_command('top_queries', reset=True, stdout=StringIO())
+        assert querylog.get_top() == []
+
+    @pytest.mark.usefixtures('query_log')
+    def test_03_slow_queries_logged(self, client, admin_client, settings,
+                                    caplog):
+        create_titles(admin_client)
+        settings.QUERY_LOG_SLOW_MS = 0
+        with caplog.at_level(logging.WARNING, logger='api_yamdb.querylog'):
+            client.get(self.TITLES_URL)
+        assert caplog.records, (
+            'Проверьте, что запросы дольше QUERY_LOG_SLOW_MS пишутся в '
+            'журнал медленных запросов.'
+        )
+        message = caplog.records[0].getMessage()
+        assert message.startswith('GET titles-list')
+        assert f'Вызов: {django_settings.BASE_DIR}' in message, (
+            'Проверьте, что в журнал медленных запросов пишется место '
+            'вызова запроса в коде проекта.'
+        )
+
+    def test_04_disabled_by_default(self, client, settings, tmp_path):
+        settings.QUERY_LOG_PATH = tmp_path / 'query_log.sqlite3'
+        client.get(self.TITLES_URL)
+        assert not settings.QUERY_LOG_PATH.exists()